@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from app.db.database import get_session_runner, SessionRunner
+from app.core.config import settings
+from app.core.deps import RoleChecker
+from app.schemas.auth import Principal
+from app.schemas.analytics import DepartmentStatsResponse, TagStatsResponse
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+allow_analytics = RoleChecker(["admin", "manager"], require_role=True)
+
+
+@router.get("/departments", response_model=DepartmentStatsResponse)
+async def get_department_stats(
+    days: int = Query(30, ge=1, le=settings.ANALYTICS_MAX_DAYS),
+    current_user: Principal = Depends(allow_analytics),
+    db: SessionRunner = Depends(get_session_runner)
+):
+    return await db.run(AnalyticsService.get_department_stats, current_user, days)
+
+
+@router.get("/tags", response_model=TagStatsResponse)
+async def get_tag_stats(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Principal = Depends(allow_analytics),
+    db: SessionRunner = Depends(get_session_runner)
+):
+    return await db.run(AnalyticsService.get_tag_stats, limit)
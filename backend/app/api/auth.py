@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_session_runner, SessionRunner
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.schemas.auth import Principal
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import LoginResponse, RefreshTokenRequest
 from app.schemas.user import UserLogin
@@ -13,24 +12,24 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    user = AuthService.register_user(db, user_data)
+async def register(user_data: UserCreate, db: SessionRunner = Depends(get_session_runner)):
+    user = await AuthService.register_user(db, user_data)
     return user
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    return AuthService.login(db, credentials.email, credentials.password)
+async def login(credentials: UserLogin, db: SessionRunner = Depends(get_session_runner)):
+    return await AuthService.login(db, credentials.email, credentials.password)
 
 
 @router.post("/refresh")
-def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
-    return AuthService.refresh_access_token(db, request.refresh_token)
+async def refresh_token(request: RefreshTokenRequest, db: SessionRunner = Depends(get_session_runner)):
+    return await db.run(AuthService.refresh_access_token, request.refresh_token)
 
 
 @router.post("/logout")
-def logout(request: RefreshTokenRequest, db: Session = Depends(get_db)):
-    success = AuthService.revoke_refresh_token(db, request.refresh_token)
+async def logout(request: RefreshTokenRequest, db: SessionRunner = Depends(get_session_runner)):
+    success = await db.run(AuthService.revoke_refresh_token, request.refresh_token)
     if success:
         return {"message": "Successfully logged out"}
     raise HTTPException(
@@ -40,9 +39,8 @@ def logout(request: RefreshTokenRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/users", response_model=List[UserResponse])
-def get_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_users(
+    current_user: Principal = Depends(get_current_user),
+    db: SessionRunner = Depends(get_session_runner)
 ):
-    users = db.query(User).filter(User.is_active == True).all()
-    return users
+    return await db.run(AuthService.get_active_users)
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.orm import Session
+from uuid import UUID
+from app.db.database import get_db
+from app.core.deps import get_current_user
+from app.schemas.auth import Principal
+from app.schemas.upload import (
+    UploadSessionCreate,
+    UploadSessionResponse,
+    UploadSessionCompleteResponse
+)
+from app.services.document_service import DocumentService
+from app.services.upload_session_service import UploadSessionService
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+
+async def read_chunk_body(request: Request) -> bytes:
+    return await request.body()
+
+
+@router.post("", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    data: UploadSessionCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    session = UploadSessionService.create_session(db, current_user, data)
+    return UploadSessionService.describe(db, session)
+
+
+@router.get("/{session_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    session_id: UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    session = UploadSessionService.get_session(db, current_user, session_id)
+    return UploadSessionService.describe(db, session)
+
+
+@router.put("/{session_id}/chunks/{chunk_index}", response_model=UploadSessionResponse)
+def upload_chunk(
+    session_id: UUID,
+    chunk_index: int,
+    current_user: Principal = Depends(get_current_user),
+    data: bytes = Depends(read_chunk_body),
+    db: Session = Depends(get_db)
+):
+    return UploadSessionService.write_chunk(db, current_user, session_id, chunk_index, data)
+
+
+@router.post("/{session_id}/complete", response_model=UploadSessionCompleteResponse)
+def complete_upload_session(
+    session_id: UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    version = UploadSessionService.complete_session(db, current_user, session_id)
+    return {
+        "document_id": version.document_id,
+        "version": DocumentService.serialize_version(version)
+    }
+
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(
+    session_id: UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    UploadSessionService.abort_session(db, current_user, session_id)
+    return None
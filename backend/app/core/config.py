@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -9,6 +9,17 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
     TEST_DATABASE_URL: str = ""
+    DATABASE_ASYNC: bool = False
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_CONNECT_TIMEOUT: int = 10
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 30000
+    DATABASE_KEEPALIVE_IDLE: int = 30
+    DATABASE_KEEPALIVE_INTERVAL: int = 10
+    DATABASE_KEEPALIVE_COUNT: int = 3
 
     REDIS_URL: str
 
@@ -16,16 +27,68 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 900
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    PRINCIPAL_LOCAL_CACHE_TTL_SECONDS: int = 5
+    PRINCIPAL_LOCAL_CACHE_MAX_SIZE: int = 10000
 
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 52428800
     ALLOWED_EXTENSIONS: str = ".pdf,.doc,.docx,.txt,.xlsx,.xls,.ppt,.pptx,.csv,.zip"
+    MAX_REQUEST_OVERHEAD: int = 1048576
+    UPLOAD_CHUNK_SIZE: int = 1048576
+    UPLOAD_SESSION_CHUNK_SIZE: int = 8388608
+    UPLOAD_SESSION_TTL_SECONDS: int = 86400
+    UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS: int = 3600
+    BLOB_GC_INTERVAL_SECONDS: int = 3600
+    BLOB_GC_GRACE_SECONDS: int = 3600
+    BULK_INGEST_MAX_FILES: int = 500
+    BULK_INGEST_MAX_REQUEST_SIZE: int = 1073741824
+    BULK_INGEST_WORKERS: int = 8
+    DELTA_STORAGE_ENABLED: bool = False
+    DELTA_STORAGE_EXTENSIONS: str = ".xlsx,.docx,.csv,.txt"
+    DELTA_MAX_CHAIN_LENGTH: int = 10
+    DELTA_MAX_SIZE_RATIO: float = 0.5
+    DELTA_MAX_FILE_SIZE: int = 67108864
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_CODECS: str = "text/*:gzip,application/msword:gzip,application/vnd.ms-excel:gzip,application/vnd.ms-powerpoint:gzip"
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_MIN_RATIO: float = 0.9
+    COMPRESSION_SAMPLE_SIZE: int = 1048576
+
+    STORAGE_BACKEND: str = "local"
+    STORAGE_LOCAL_ROOT: str = ""
+    S3_BUCKET: str = ""
+    S3_PREFIX: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = ""
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+
+    TAG_CACHE_TTL_SECONDS: int = 300
+    TAG_CACHE_MAX_SIZE: int = 10000
+    SEARCH_FACET_LIMIT: int = 50
+
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS: int = 300
+    ANALYTICS_ROLLUP_OVERLAP_SECONDS: int = 900
+    ANALYTICS_MAX_DAYS: int = 365
+
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    SQL_PROFILING: bool = False
+    SQL_PROFILING_N_PLUS_ONE_THRESHOLD: int = 5
 
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
 
     DEFAULT_PAGE_SIZE: int = 10
     MAX_PAGE_SIZE: int = 100
 
+    @property
+    def async_database_url(self) -> str:
+        scheme, _, rest = self.DATABASE_URL.partition("://")
+        return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else self.DATABASE_URL
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
@@ -34,6 +97,18 @@ class Settings(BaseSettings):
     def allowed_extensions_list(self) -> List[str]:
         return [ext.strip() for ext in self.ALLOWED_EXTENSIONS.split(",")]
 
+    @property
+    def delta_storage_extensions_list(self) -> List[str]:
+        return [ext.strip() for ext in self.DELTA_STORAGE_EXTENSIONS.split(",")]
+
+    @property
+    def compression_codecs_map(self) -> Dict[str, str]:
+        codecs = {}
+        for entry in self.COMPRESSION_CODECS.split(","):
+            content_type, _, codec = entry.rpartition(":")
+            codecs[content_type.strip()] = codec.strip()
+        return codecs
+
     class Config:
         env_file = ".env"
         case_sensitive = True
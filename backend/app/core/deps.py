@@ -1,19 +1,19 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 from typing import Optional
-from app.db.database import get_db
+from uuid import UUID
+from app.db.database import get_session_runner, SessionRunner
 from app.core.security import decode_token
-from app.models.user import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import Principal, TokenData
+from app.services.principal_service import PrincipalService
 
 security = HTTPBearer()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: SessionRunner = Depends(get_session_runner)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -30,7 +30,14 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    try:
+        user_id = UUID(user_id)
+    except ValueError:
+        raise credentials_exception
+
+    user = PrincipalService.get_cached(user_id)
+    if user is None:
+        user = await db.run(PrincipalService.load, user_id)
     if user is None:
         raise credentials_exception
 
@@ -44,19 +51,25 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
 class RoleChecker:
-    def __init__(self, allowed_roles: list):
+    def __init__(self, allowed_roles: list, require_role: bool = False):
         self.allowed_roles = allowed_roles
+        self.require_role = require_role
 
-    def __call__(self, current_user: User = Depends(get_current_user)):
-        if current_user.role and current_user.role.name not in self.allowed_roles:
+    def __call__(self, current_user: Principal = Depends(get_current_user)):
+        if current_user.role_name is None and self.require_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        if current_user.role_name and current_user.role_name not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
@@ -0,0 +1,192 @@
+import uuid
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from fastapi import HTTPException, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from app.storage import StorageReader
+
+MAX_RANGES = 16
+
+
+def content_disposition(file_name: str) -> str:
+    quoted = quote(file_name)
+    if quoted != file_name:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{file_name}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def accepts_encoding(header: Optional[str], encoding: str) -> bool:
+    if not header:
+        return False
+    accepted = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+
+def parse_range_header(header: str, file_size: int) -> Optional[List[Tuple[int, int]]]:
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs:
+        return None
+
+    ranges = []
+    for spec in specs.split(","):
+        start_text, sep, end_text = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else file_size - 1
+            else:
+                suffix = int(end_text)
+                if suffix == 0:
+                    continue
+                start, end = max(file_size - suffix, 0), file_size - 1
+        except ValueError:
+            return None
+        if start > end and end_text:
+            return None
+        if start < file_size:
+            ranges.append((start, min(end, file_size - 1)))
+
+    if not ranges:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    if len(merged) > MAX_RANGES:
+        return None
+    return merged
+
+
+def read_multipart_ranges(
+    storage: StorageReader,
+    key: str,
+    ranges: List[Tuple[int, int]],
+    boundary: str,
+    media_type: str,
+    file_size: int
+) -> Iterator[bytes]:
+    for start, end in ranges:
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+        ).encode("latin-1")
+        yield from storage.open_range(key, start, end)
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("latin-1")
+
+
+def multipart_length(ranges: List[Tuple[int, int]], boundary: str, media_type: str, file_size: int) -> int:
+    length = len(f"--{boundary}--\r\n")
+    for start, end in ranges:
+        length += len(
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+        )
+        length += end - start + 1 + 2
+    return length
+
+
+def file_download_response(
+    request: Request,
+    storage: StorageReader,
+    key: str,
+    file_name: str,
+    media_type: Optional[str],
+    etag: str,
+    immutable: bool
+) -> Response:
+    media_type = media_type or "application/octet-stream"
+    range_header = request.headers.get("range")
+
+    # Blobs stored compressed go out as-is to clients that accept the encoding;
+    # range requests and other clients get the decoded bytes.
+    encoding = storage.content_encoding(key)
+    passthrough = bool(encoding) and not range_header and accepts_encoding(request.headers.get("accept-encoding"), encoding)
+    if passthrough:
+        storage = storage.raw_backend()
+        etag = f'{etag[:-1]}-{encoding}"'
+
+    file_size = storage.size(key)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable" if immutable else "private, no-cache",
+    }
+    if encoding:
+        headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if passthrough:
+        headers["Content-Encoding"] = encoding
+
+    if_range = request.headers.get("if-range")
+    ranges = None
+    if range_header and (not if_range or if_range.strip() == etag):
+        ranges = parse_range_header(range_header, file_size)
+
+    headers["Content-Disposition"] = content_disposition(file_name)
+
+    if not ranges:
+        local_path = storage.local_path(key)
+        if local_path:
+            return FileResponse(path=local_path, media_type=media_type, headers=headers)
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(
+            storage.open_range(key, 0, file_size - 1),
+            media_type=media_type,
+            headers=headers
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            storage.open_range(key, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers
+        )
+
+    boundary = uuid.uuid4().hex
+    headers["Content-Length"] = str(multipart_length(ranges, boundary, media_type, file_size))
+    return StreamingResponse(
+        read_multipart_ranges(storage, key, ranges, boundary, media_type, file_size),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers
+    )
@@ -0,0 +1,144 @@
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextvars import ContextVar
+from typing import Optional
+import asyncio
+import os
+import time
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+CACHE_OPERATIONS = Counter(
+    "cache_operations_total",
+    "Redis cache operations by result",
+    ["operation", "result"]
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total",
+    "Bytes received in document uploads"
+)
+UPLOAD_THROUGHPUT = Histogram(
+    "upload_throughput_bytes_per_second",
+    "Per-upload receive throughput",
+    buckets=(1e5, 5e5, 1e6, 5e6, 1e7, 2.5e7, 5e7, 1e8, 2.5e8, 5e8, 1e9)
+)
+UPLOAD_HASH_SECONDS = Histogram(
+    "upload_hash_seconds",
+    "Time spent hashing an uploaded file",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled wake-up and the event loop running it",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds",
+    "Most recent event loop lag sample",
+    multiprocess_mode="max"
+)
+
+request_queries: ContextVar[Optional[dict]] = ContextVar("request_queries", default=None)
+
+
+class RuntimeCollector:
+    def collect(self):
+        from app.core.security import password_hash_queue_depth
+        from app.db.database import pool_status
+
+        yield GaugeMetricFamily(
+            "password_hash_queue_depth",
+            "Password hash jobs queued or running",
+            value=password_hash_queue_depth()
+        )
+
+        gauges = {
+            name: GaugeMetricFamily(f"db_pool_{name}", f"Connection pool {name.replace('_', ' ')}", labels=["engine"])
+            for name in ("size", "checked_out", "checked_in", "overflow")
+        }
+        counters = {
+            name: CounterMetricFamily(f"db_pool_{name}", f"Connection pool {name.replace('_', ' ')}", labels=["engine"])
+            for name in ("checkouts", "timeouts", "wait_seconds")
+        }
+        for engine_name, status in pool_status().items():
+            for name, family in gauges.items():
+                family.add_metric([engine_name], status[name])
+            counters["checkouts"].add_metric([engine_name], status["checkouts"])
+            counters["timeouts"].add_metric([engine_name], status["timeouts"])
+            counters["wait_seconds"].add_metric([engine_name], status["wait_seconds_total"])
+
+        yield from gauges.values()
+        yield from counters.values()
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+def render_metrics() -> bytes:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        registry.register(RuntimeCollector())
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def start_request_tracking() -> dict:
+    stats = {"queries": 0, "seconds": 0.0}
+    request_queries.set(stats)
+    return stats
+
+
+async def monitor_event_loop_lag(interval_seconds: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval_seconds
+        await asyncio.sleep(interval_seconds)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "query_started_at", None)
+    if started_at is None:
+        return
+
+    elapsed = time.perf_counter() - started_at
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    stats = request_queries.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["seconds"] += elapsed
@@ -0,0 +1,118 @@
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from typing import Dict, Optional
+import json
+import logging
+import time
+from app.core.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_QUERY_SECONDS, start_request_tracking
+from app.core.profiling import QueryProfile, active_profile
+
+logger = logging.getLogger(__name__)
+
+
+class RequestSizeLimitMiddleware:
+    def __init__(self, app, max_body_size: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.path_limits.get(scope["path"], self.max_body_size)
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_body_size:
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": "Request body too large"}
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request body too large"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_tracking()
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def tracking_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status_code)).observe(
+                time.perf_counter() - started_at
+            )
+            REQUEST_QUERIES.labels(route_path).observe(stats["queries"])
+            REQUEST_QUERY_SECONDS.labels(route_path).observe(stats["seconds"])
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = active_profile.set(profile)
+
+        async def profiling_send(message):
+            if message["type"] == "http.response.start":
+                repeated = profile.n_plus_one()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-sql-queries", str(profile.query_count).encode()),
+                    (b"x-sql-time-ms", f"{profile.total_seconds * 1000:.3f}".encode()),
+                    (b"x-sql-repeated-shapes", str(len(repeated)).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, profiling_send)
+        finally:
+            active_profile.reset(token)
+            summary = profile.summary()
+            route = scope.get("route")
+            record = {
+                "method": scope["method"],
+                "route": route.path if route is not None else scope["path"],
+                **summary
+            }
+            if summary["n_plus_one"]:
+                logger.warning("SQL profile (possible N+1): %s", json.dumps(record))
+            else:
+                logger.info("SQL profile: %s", json.dumps(record))
@@ -0,0 +1,134 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+import re
+import threading
+import time
+from app.core.config import settings
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|__\[POSTCOMPILE_\w+\]")
+PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+active_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("active_profile", default=None)
+global_profiles: List["QueryProfile"] = []
+global_profiles_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    shape = STRING_LITERAL.sub("?", statement)
+    shape = BIND_PARAMETER.sub("?", shape)
+    shape = NUMBER_LITERAL.sub("?", shape)
+    shape = PARAMETER_LIST.sub("(?)", shape)
+    return WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    def __init__(self, n_plus_one_threshold: Optional[int] = None):
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.SQL_PROFILING_N_PLUS_ONE_THRESHOLD
+        self.lock = threading.Lock()
+        self.statements: List[tuple] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self.lock:
+            self.statements.append((statement, seconds))
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.statements)
+
+    def shapes(self) -> List[Dict]:
+        grouped: Dict[str, Dict] = {}
+        with self.lock:
+            statements = list(self.statements)
+        for statement, seconds in statements:
+            entry = grouped.setdefault(statement_shape(statement), {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+        return sorted(
+            ({"statement": shape, **entry} for shape, entry in grouped.items()),
+            key=lambda entry: (-entry["count"], -entry["seconds"])
+        )
+
+    def n_plus_one(self) -> List[Dict]:
+        return [shape for shape in self.shapes() if shape["count"] >= self.n_plus_one_threshold]
+
+    def summary(self, limit: int = 10) -> Dict:
+        shapes = self.shapes()
+        return {
+            "queries": self.query_count,
+            "time_ms": round(self.total_seconds * 1000, 3),
+            "shapes": [
+                {"statement": shape["statement"], "count": shape["count"], "time_ms": round(shape["seconds"] * 1000, 3)}
+                for shape in shapes[:limit]
+            ],
+            "n_plus_one": [
+                {"statement": shape["statement"], "count": shape["count"]}
+                for shape in shapes if shape["count"] >= self.n_plus_one_threshold
+            ],
+        }
+
+
+@contextmanager
+def profile_queries(n_plus_one_threshold: Optional[int] = None) -> Iterator[QueryProfile]:
+    profile = QueryProfile(n_plus_one_threshold)
+    with global_profiles_lock:
+        global_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        with global_profiles_lock:
+            global_profiles.remove(profile)
+
+
+@contextmanager
+def query_budget(
+    max_queries: int,
+    allow_n_plus_one: bool = False,
+    n_plus_one_threshold: Optional[int] = None
+) -> Iterator[QueryProfile]:
+    with profile_queries(n_plus_one_threshold) as profile:
+        yield profile
+
+    if profile.query_count > max_queries:
+        raise QueryBudgetExceeded(
+            f"Executed {profile.query_count} queries, budget is {max_queries}: {profile.summary()['shapes']}"
+        )
+
+    repeated = profile.n_plus_one()
+    if repeated and not allow_n_plus_one:
+        raise QueryBudgetExceeded(f"Repeated statement shapes look like N+1 queries: {repeated}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_profile_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.profile_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_profiled_statement(conn, cursor, statement, parameters, context, executemany):
+    profile = active_profile.get()
+    if profile is None and not global_profiles:
+        return
+
+    started_at = getattr(context, "profile_started_at", None)
+    seconds = time.perf_counter() - started_at if started_at is not None else 0.0
+
+    if profile is not None:
+        profile.record(statement, seconds)
+    with global_profiles_lock:
+        for global_profile in global_profiles:
+            global_profile.record(statement, seconds)
@@ -1,9 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import uuid
 import bcrypt
 from app.core.config import settings
 
+password_hash_executor: Optional[ProcessPoolExecutor] = None
+password_hash_pending = 0
+password_hash_lock = threading.Lock()
+
 
 def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
@@ -14,6 +26,66 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+
+def get_password_hash_executor() -> ProcessPoolExecutor:
+    global password_hash_executor
+    with password_hash_lock:
+        if password_hash_executor is None:
+            password_hash_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return password_hash_executor
+
+
+def shutdown_password_hash_executor() -> None:
+    global password_hash_executor
+    with password_hash_lock:
+        executor, password_hash_executor = password_hash_executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+
+
+def password_hash_queue_depth() -> int:
+    return password_hash_pending
+
+
+async def run_password_hash_job(job, *args):
+    global password_hash_executor, password_hash_pending
+    with password_hash_lock:
+        if password_hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests",
+                headers={"Retry-After": "1"}
+            )
+        password_hash_pending += 1
+
+    executor = get_password_hash_executor()
+    try:
+        return await asyncio.wrap_future(executor.submit(job, *args))
+    except BrokenProcessPool:
+        with password_hash_lock:
+            if password_hash_executor is executor:
+                password_hash_executor = None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service temporarily unavailable",
+            headers={"Retry-After": "1"}
+        )
+    finally:
+        with password_hash_lock:
+            password_hash_pending -= 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_hash_job(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_hash_job(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -33,11 +105,15 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     else:
         expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
 def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,12 @@
+import asyncio
+from typing import Callable
+from starlette.concurrency import run_in_threadpool
+
+
+async def run_periodically(interval_seconds: int, job: Callable) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(job)
+        except Exception as e:
+            print(f"Background job {job.__name__} error: {e}")
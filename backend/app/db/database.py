@@ -1,23 +1,93 @@
+from contextvars import ContextVar
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    connect_args={
+        "connect_timeout": settings.DATABASE_CONNECT_TIMEOUT,
+        "options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}",
+        "keepalives": 1,
+        "keepalives_idle": settings.DATABASE_KEEPALIVE_IDLE,
+        "keepalives_interval": settings.DATABASE_KEEPALIVE_INTERVAL,
+        "keepalives_count": settings.DATABASE_KEEPALIVE_COUNT,
+    }
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+in_session_greenlet: ContextVar[bool] = ContextVar("in_session_greenlet", default=False)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        connect_args={
+            "timeout": settings.DATABASE_CONNECT_TIMEOUT,
+            "server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)},
+        }
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
+def pool_status() -> dict:
+    status = {"sync": engine.pool.status_dict()}
+    if async_engine is not None:
+        status["async"] = async_engine.pool.status_dict()
+    return status
+
 Base = declarative_base()
 
 
+class SessionRunner:
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn, *args):
+        if isinstance(self.session, AsyncSession):
+            token = in_session_greenlet.set(True)
+            try:
+                return await self.session.run_sync(fn, *args)
+            finally:
+                in_session_greenlet.reset(token)
+        return await run_in_threadpool(fn, self.session, *args)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_session_runner():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield SessionRunner(session)
+        return
+
+    db = SessionLocal()
+    try:
+        yield SessionRunner(db)
+    finally:
+        await run_in_threadpool(db.close)
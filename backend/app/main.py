@@ -1,7 +1,18 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from app.core.config import settings
-from app.api import auth, documents
+from app.core.middleware import RequestSizeLimitMiddleware, MetricsMiddleware, QueryProfilerMiddleware
+from app.core.metrics import render_metrics, monitor_event_loop_lag
+from app.core.security import password_hash_queue_depth, shutdown_password_hash_executor
+from app.core.tasks import run_periodically
+from app.db.database import pool_status
+from app.api import auth, documents, uploads, analytics
+from app.services.analytics_service import AnalyticsService
+from app.services.auth_service import AuthService
+from app.services.blob_service import BlobService
+from app.services.upload_session_service import UploadSessionService
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -17,10 +28,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range", "Accept-Ranges", "Content-Disposition"],
 )
 
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE + settings.MAX_REQUEST_OVERHEAD,
+    path_limits={"/api/documents/bulk": settings.BULK_INGEST_MAX_REQUEST_SIZE},
+)
+
+if settings.SQL_PROFILING:
+    app.add_middleware(QueryProfilerMiddleware)
+
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router, prefix="/api")
 app.include_router(documents.router, prefix="/api")
+app.include_router(uploads.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    asyncio.create_task(
+        run_periodically(settings.BLOB_GC_INTERVAL_SECONDS, BlobService.run_garbage_collection)
+    )
+    asyncio.create_task(
+        run_periodically(settings.UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS, UploadSessionService.remove_expired_sessions)
+    )
+    asyncio.create_task(
+        run_periodically(settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS, AuthService.run_refresh_token_maintenance)
+    )
+    asyncio.create_task(
+        run_periodically(settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS, AnalyticsService.run_rollup_refresh)
+    )
+    asyncio.create_task(monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS))
+
+
+@app.on_event("shutdown")
+def stop_password_hash_workers():
+    shutdown_password_hash_executor()
 
 
 @app.get("/health")
@@ -28,10 +75,17 @@ def health_check():
     return {
         "status": "healthy",
         "app": settings.APP_NAME,
-        "environment": settings.APP_ENV
+        "environment": settings.APP_ENV,
+        "password_hash_queue_depth": password_hash_queue_depth(),
+        "database_pool": pool_status()
     }
 
 
+@app.get("/metrics")
+def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/")
 def root():
     return {
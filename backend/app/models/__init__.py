@@ -6,6 +6,9 @@ from app.models.document_version import DocumentVersion
 from app.models.tag import Tag
 from app.models.document_tag import DocumentTag
 from app.models.refresh_token import RefreshToken
+from app.models.blob import Blob
+from app.models.upload_session import UploadSession, UploadSessionChunk
+from app.models.analytics_rollup import DepartmentUploadRollup, TagUsageRollup, AnalyticsRollupState
 
 __all__ = [
     "User",
@@ -15,5 +18,11 @@ __all__ = [
     "DocumentVersion",
     "Tag",
     "DocumentTag",
-    "RefreshToken"
+    "RefreshToken",
+    "Blob",
+    "UploadSession",
+    "UploadSessionChunk",
+    "DepartmentUploadRollup",
+    "TagUsageRollup",
+    "AnalyticsRollupState"
 ]
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.database import Base
+
+
+class DepartmentUploadRollup(Base):
+    __tablename__ = "department_upload_rollups"
+
+    department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    uploader_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    document_count = Column(Integer, nullable=False, default=0)
+    version_count = Column(Integer, nullable=False, default=0)
+    storage_bytes = Column(BigInteger, nullable=False, default=0)
+
+
+class TagUsageRollup(Base):
+    __tablename__ = "tag_usage_rollups"
+
+    tag_id = Column(UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    document_count = Column(Integer, nullable=False, default=0)
+    unique_uploaders = Column(Integer, nullable=False, default=0)
+    last_used_at = Column(DateTime(timezone=True))
+
+
+class AnalyticsRollupState(Base):
+    __tablename__ = "analytics_rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    refreshed_through = Column(DateTime(timezone=True))
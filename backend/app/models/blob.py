@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    checksum = Column(String(64), primary_key=True)
+    storage_path = Column(String(500), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    base_checksum = Column(String(64), ForeignKey("blobs.checksum"), index=True)
+    chain_length = Column(Integer, nullable=False, default=0)
+    encoding = Column(String(20))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
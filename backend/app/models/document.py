@@ -1,6 +1,6 @@
 from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, Enum
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import uuid
 import enum
@@ -23,9 +23,10 @@ class Document(Base):
     department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id", ondelete="SET NULL"), index=True)
     permission_level = Column(Enum(PermissionLevel, values_callable=lambda obj: [e.value for e in obj]), default=PermissionLevel.DEPARTMENT)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
     is_deleted = Column(Boolean, default=False, index=True)
     current_version = Column(Integer, default=1)
+    search_vector = deferred(Column(TSVECTOR))
 
     uploader = relationship("User", back_populates="documents", foreign_keys=[uploader_id])
     department = relationship("Department", back_populates="documents")
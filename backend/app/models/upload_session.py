@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from app.db.database import Base
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"))
+    file_name = Column(String(255), nullable=False)
+    mime_type = Column(String(100))
+    total_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    document_metadata = Column(JSONB, default={})
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    chunks = relationship("UploadSessionChunk", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+
+    @property
+    def total_chunks(self):
+        return (self.total_size + self.chunk_size - 1) // self.chunk_size
+
+
+class UploadSessionChunk(Base):
+    __tablename__ = "upload_session_chunks"
+    __table_args__ = (UniqueConstraint("session_id", "chunk_index"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("upload_sessions.id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    session = relationship("UploadSession", back_populates="chunks")
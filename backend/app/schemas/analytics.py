@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import date, datetime
+from uuid import UUID
+
+
+class DailyDepartmentStats(BaseModel):
+    day: date
+    document_count: int
+    version_count: int
+    storage_bytes: int
+    unique_uploaders: int
+
+
+class DepartmentStats(BaseModel):
+    department_id: UUID
+    department_name: str
+    document_count: int
+    version_count: int
+    storage_bytes: int
+    unique_uploaders: int
+    daily: List[DailyDepartmentStats] = Field(default_factory=list)
+
+
+class DepartmentStatsResponse(BaseModel):
+    days: int
+    refreshed_through: Optional[datetime] = None
+    departments: List[DepartmentStats]
+
+
+class TagStats(BaseModel):
+    tag_id: UUID
+    name: str
+    document_count: int
+    unique_uploaders: int
+    last_used_at: Optional[datetime] = None
+
+
+class TagStatsResponse(BaseModel):
+    refreshed_through: Optional[datetime] = None
+    tags: List[TagStats]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
+from uuid import UUID
 from app.schemas.user import UserResponse
 
 
@@ -16,6 +17,26 @@ class TokenData(BaseModel):
     department_id: Optional[str] = None
 
 
+class Principal(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    department_id: Optional[UUID] = None
+    role_name: Optional[str] = None
+    is_active: bool = True
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role_name == "admin"
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+
 class LoginResponse(BaseModel):
     access_token: str
     refresh_token: str
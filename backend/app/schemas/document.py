@@ -92,11 +92,30 @@ class DocumentSearchParams(BaseModel):
     page_size: int = Field(default=10, ge=1, le=100)
     sort_by: str = Field(default="created_at")
     sort_order: str = Field(default="desc")
+    cursor: Optional[str] = None
+    include_total: Optional[bool] = None
+    include_facets: bool = False
+
+
+class FacetCount(BaseModel):
+    value: str
+    label: str
+    count: int
+
+
+class DocumentFacetsResponse(BaseModel):
+    total: int
+    tags: List[FacetCount] = Field(default_factory=list)
+    uploaders: List[FacetCount] = Field(default_factory=list)
+    departments: List[FacetCount] = Field(default_factory=list)
+    permission_levels: List[FacetCount] = Field(default_factory=list)
 
 
 class PaginatedDocumentResponse(BaseModel):
     items: List[DocumentResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    facets: Optional[DocumentFacetsResponse] = None
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+from app.schemas.document import DocumentVersionResponse
+
+
+class UploadSessionCreate(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0)
+    mime_type: Optional[str] = None
+    document_id: Optional[UUID] = None
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    permission_level: str = "department"
+    tags: List[str] = Field(default_factory=list)
+    change_notes: Optional[str] = None
+
+
+class UploadSessionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    document_id: Optional[UUID] = None
+    file_name: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int] = Field(default_factory=list)
+    received_bytes: int = 0
+    expires_at: datetime
+
+
+class UploadSessionCompleteResponse(BaseModel):
+    document_id: UUID
+    version: DocumentVersionResponse
@@ -0,0 +1,250 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, cast, literal, union, union_all, distinct, desc, tuple_, Date
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, timedelta
+from typing import List, Optional
+from app.models.analytics_rollup import DepartmentUploadRollup, TagUsageRollup, AnalyticsRollupState
+from app.models.department import Department
+from app.models.document import Document
+from app.models.document_version import DocumentVersion
+from app.models.document_tag import DocumentTag
+from app.models.tag import Tag
+from app.schemas.auth import Principal
+from app.core.config import settings
+from app.db.database import SessionLocal
+
+ROLLUP_STATE_NAME = "document_rollups"
+
+
+class AnalyticsService:
+    @staticmethod
+    def department_activity(days: Optional[List[date]]):
+        document_day = cast(Document.created_at, Date)
+        created = select(
+            Document.department_id,
+            document_day.label("day"),
+            Document.uploader_id.label("uploader_id"),
+            literal(1).label("document_count"),
+            literal(0).label("version_count"),
+            literal(0).label("storage_bytes")
+        ).where(
+            Document.is_deleted == False,
+            Document.department_id.isnot(None),
+            Document.uploader_id.isnot(None)
+        )
+
+        version_day = cast(DocumentVersion.upload_date, Date)
+        version_uploader = func.coalesce(DocumentVersion.uploaded_by, Document.uploader_id)
+        versions = select(
+            Document.department_id,
+            version_day,
+            version_uploader,
+            literal(0),
+            literal(1),
+            DocumentVersion.file_size
+        ).join(Document, Document.id == DocumentVersion.document_id).where(
+            Document.is_deleted == False,
+            Document.department_id.isnot(None),
+            version_uploader.isnot(None)
+        )
+
+        if days is not None:
+            created = created.where(Document.created_at >= min(days), document_day.in_(days))
+            versions = versions.where(DocumentVersion.upload_date >= min(days), version_day.in_(days))
+
+        activity = union_all(created, versions).subquery()
+        return select(
+            activity.c.department_id,
+            activity.c.day,
+            activity.c.uploader_id,
+            func.sum(activity.c.document_count),
+            func.sum(activity.c.version_count),
+            func.sum(activity.c.storage_bytes)
+        ).group_by(activity.c.department_id, activity.c.day, activity.c.uploader_id)
+
+    @staticmethod
+    def tag_usage():
+        return select(
+            DocumentTag.tag_id,
+            func.count(distinct(Document.id)),
+            func.count(distinct(Document.uploader_id)),
+            func.max(Document.created_at)
+        ).join(Document, Document.id == DocumentTag.document_id).where(
+            Document.is_deleted == False
+        ).group_by(DocumentTag.tag_id)
+
+    @staticmethod
+    def changed_days(db: Session, since) -> List[date]:
+        # Tag changes, new versions, deletes and moves between departments all
+        # touch documents.updated_at, so the days to rebuild are the creation
+        # days and version days of the documents updated since the watermark.
+        changed_documents = select(
+            cast(Document.created_at, Date)
+        ).where(Document.updated_at >= since)
+        changed_versions = select(
+            cast(DocumentVersion.upload_date, Date)
+        ).join(Document, Document.id == DocumentVersion.document_id).where(Document.updated_at >= since)
+        return sorted(db.execute(union(changed_documents, changed_versions)).scalars())
+
+    @staticmethod
+    def refresh_rollups(db: Session) -> int:
+        db.execute(
+            insert(AnalyticsRollupState).values(name=ROLLUP_STATE_NAME).on_conflict_do_nothing()
+        )
+        state = db.query(AnalyticsRollupState).filter(
+            AnalyticsRollupState.name == ROLLUP_STATE_NAME
+        ).with_for_update(skip_locked=True).first()
+        if state is None:
+            db.rollback()
+            return 0
+
+        refreshed_at = db.execute(select(func.now())).scalar_one()
+
+        if state.refreshed_through is None:
+            days = None
+            db.execute(delete(DepartmentUploadRollup))
+        else:
+            # Rows are stamped with their transaction's start time, so writes that
+            # were still in flight at the last refresh can carry older timestamps.
+            since = state.refreshed_through - timedelta(seconds=settings.ANALYTICS_ROLLUP_OVERLAP_SECONDS)
+            days = AnalyticsService.changed_days(db, since)
+            if days:
+                db.execute(delete(DepartmentUploadRollup).where(DepartmentUploadRollup.day.in_(days)))
+
+        refreshed_rows = 0
+        if days is None or days:
+            result = db.execute(
+                insert(DepartmentUploadRollup).from_select(
+                    [
+                        DepartmentUploadRollup.department_id,
+                        DepartmentUploadRollup.day,
+                        DepartmentUploadRollup.uploader_id,
+                        DepartmentUploadRollup.document_count,
+                        DepartmentUploadRollup.version_count,
+                        DepartmentUploadRollup.storage_bytes
+                    ],
+                    AnalyticsService.department_activity(days)
+                )
+            )
+            refreshed_rows = result.rowcount
+
+            db.execute(delete(TagUsageRollup))
+            db.execute(
+                insert(TagUsageRollup).from_select(
+                    [
+                        TagUsageRollup.tag_id,
+                        TagUsageRollup.document_count,
+                        TagUsageRollup.unique_uploaders,
+                        TagUsageRollup.last_used_at
+                    ],
+                    AnalyticsService.tag_usage()
+                )
+            )
+
+        state.refreshed_through = refreshed_at
+        db.commit()
+        return refreshed_rows
+
+    @staticmethod
+    def run_rollup_refresh() -> int:
+        db = SessionLocal()
+        try:
+            return AnalyticsService.refresh_rollups(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def refreshed_through(db: Session):
+        return db.query(AnalyticsRollupState.refreshed_through).filter(
+            AnalyticsRollupState.name == ROLLUP_STATE_NAME
+        ).scalar()
+
+    @staticmethod
+    def get_department_stats(db: Session, user: Principal, days: int) -> dict:
+        departments = db.query(Department.id, Department.name)
+        rollups = db.query(
+            DepartmentUploadRollup.department_id,
+            DepartmentUploadRollup.day,
+            func.sum(DepartmentUploadRollup.document_count),
+            func.sum(DepartmentUploadRollup.version_count),
+            func.sum(DepartmentUploadRollup.storage_bytes),
+            func.count(distinct(DepartmentUploadRollup.uploader_id))
+        ).filter(
+            DepartmentUploadRollup.day > func.current_date() - days
+        ).group_by(
+            func.grouping_sets(
+                tuple_(DepartmentUploadRollup.department_id, DepartmentUploadRollup.day),
+                tuple_(DepartmentUploadRollup.department_id)
+            )
+        )
+
+        if not user.is_admin:
+            departments = departments.filter(Department.id == user.department_id)
+            rollups = rollups.filter(DepartmentUploadRollup.department_id == user.department_id)
+
+        stats = {
+            department_id: {
+                "department_id": department_id,
+                "department_name": name,
+                "document_count": 0,
+                "version_count": 0,
+                "storage_bytes": 0,
+                "unique_uploaders": 0,
+                "daily": []
+            }
+            for department_id, name in departments.all()
+        }
+
+        for department_id, day, document_count, version_count, storage_bytes, unique_uploaders in rollups.all():
+            department = stats.get(department_id)
+            if department is None:
+                continue
+            counts = {
+                "document_count": document_count,
+                "version_count": version_count,
+                "storage_bytes": storage_bytes,
+                "unique_uploaders": unique_uploaders
+            }
+            if day is None:
+                department.update(counts)
+            else:
+                department["daily"].append({"day": day, **counts})
+
+        for department in stats.values():
+            department["daily"].sort(key=lambda entry: entry["day"])
+
+        return {
+            "days": days,
+            "refreshed_through": AnalyticsService.refreshed_through(db),
+            "departments": sorted(
+                stats.values(),
+                key=lambda entry: (-entry["document_count"], entry["department_name"])
+            )
+        }
+
+    @staticmethod
+    def get_tag_stats(db: Session, limit: int) -> dict:
+        document_count = func.coalesce(TagUsageRollup.document_count, 0)
+        rows = db.query(
+            Tag.id,
+            Tag.name,
+            document_count,
+            func.coalesce(TagUsageRollup.unique_uploaders, 0),
+            TagUsageRollup.last_used_at
+        ).outerjoin(
+            TagUsageRollup, TagUsageRollup.tag_id == Tag.id
+        ).order_by(desc(document_count), Tag.name).limit(limit).all()
+
+        return {
+            "refreshed_through": AnalyticsService.refreshed_through(db),
+            "tags": [
+                {
+                    "tag_id": tag_id,
+                    "name": name,
+                    "document_count": count,
+                    "unique_uploaders": unique_uploaders,
+                    "last_used_at": last_used_at
+                }
+                for tag_id, name, count, unique_uploaders, last_used_at in rows
+            ]
+        }
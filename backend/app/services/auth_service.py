@@ -1,36 +1,40 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import LoginResponse
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
-    decode_token
+    decode_token,
+    hash_token
 )
 from app.core.config import settings
+from app.db.database import SessionLocal, SessionRunner
+from app.services.cache_service import CacheService
+from app.services.principal_service import PrincipalService
 import uuid
 
+REVOCATIONS_SYNCED_KEY = "refresh_revoked:synced"
+REVOCATIONS_SCOPE = "refresh_revoked"
+
 
 class AuthService:
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> User:
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+    def get_user_by_email(db: Session, email: str) -> Optional[User]:
+        return db.query(User).filter(User.email == email).first()
 
-        hashed_password = get_password_hash(user_data.password)
+    @staticmethod
+    def create_user(db: Session, user_data: UserCreate, password_hash: str) -> User:
         db_user = User(
             email=user_data.email,
-            password_hash=hashed_password,
+            password_hash=password_hash,
             first_name=user_data.first_name,
             last_name=user_data.last_name,
             department_id=user_data.department_id,
@@ -44,11 +48,30 @@ class AuthService:
         return db_user
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-        user = db.query(User).filter(User.email == email).first()
+    def get_active_users(db: Session) -> List[UserResponse]:
+        users = db.query(User).filter(User.is_active == True).all()
+        return [UserResponse.model_validate(user) for user in users]
+
+    @staticmethod
+    async def register_user(db: SessionRunner, user_data: UserCreate) -> UserResponse:
+        existing_user = await db.run(AuthService.get_user_by_email, user_data.email)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+
+        hashed_password = await get_password_hash_async(user_data.password)
+
+        user = await db.run(AuthService.create_user, user_data, hashed_password)
+        return UserResponse.model_validate(user)
+
+    @staticmethod
+    async def authenticate_user(db: SessionRunner, email: str, password: str) -> Optional[User]:
+        user = await db.run(AuthService.get_user_by_email, email)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         return user
 
@@ -70,7 +93,7 @@ class AuthService:
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         refresh_token = RefreshToken(
             user_id=user.id,
-            token=refresh_token_str,
+            token_hash=hash_token(refresh_token_str),
             expires_at=expires_at
         )
         db.add(refresh_token)
@@ -83,8 +106,19 @@ class AuthService:
         }
 
     @staticmethod
-    def login(db: Session, email: str, password: str) -> LoginResponse:
-        user = AuthService.authenticate_user(db, email, password)
+    def create_login_response(db: Session, user: User) -> LoginResponse:
+        tokens = AuthService.create_tokens(db, user)
+
+        return LoginResponse(
+            access_token=tokens["access_token"],
+            refresh_token=tokens["refresh_token"],
+            token_type=tokens["token_type"],
+            user=user
+        )
+
+    @staticmethod
+    async def login(db: SessionRunner, email: str, password: str) -> LoginResponse:
+        user = await AuthService.authenticate_user(db, email, password)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -98,14 +132,23 @@ class AuthService:
                 detail="User account is inactive"
             )
 
-        tokens = AuthService.create_tokens(db, user)
+        return await db.run(AuthService.create_login_response, user)
 
-        return LoginResponse(
-            access_token=tokens["access_token"],
-            refresh_token=tokens["refresh_token"],
-            token_type=tokens["token_type"],
-            user=user
-        )
+    @staticmethod
+    def revocation_key(token_hash: bytes) -> str:
+        return f"refresh_revoked:{token_hash.hex()}"
+
+    @staticmethod
+    def revocation_status(token_hash: bytes) -> Optional[bool]:
+        # The marker holds the revocation generation its sync started from; a
+        # revoke that failed to reach Redis bumps the generation, so a sync that
+        # raced it cannot vouch for the cache.
+        values = CacheService.get_many([
+            REVOCATIONS_SYNCED_KEY, CacheService.generation_key(REVOCATIONS_SCOPE), AuthService.revocation_key(token_hash)
+        ])
+        if values is None or values[0] is None or values[0] != (values[1] or 0):
+            return None
+        return values[2] is not None
 
     @staticmethod
     def refresh_access_token(db: Session, refresh_token_str: str) -> dict:
@@ -116,24 +159,41 @@ class AuthService:
                 detail="Invalid refresh token"
             )
 
-        refresh_token = db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token_str,
-            RefreshToken.revoked == False
-        ).first()
+        token_hash = hash_token(refresh_token_str)
+        revoked = AuthService.revocation_status(token_hash)
+
+        if revoked is None:
+            refresh_token = db.query(RefreshToken).filter(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked == False
+            ).first()
+
+            if not refresh_token:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token not found or revoked"
+                )
 
-        if not refresh_token:
+            if refresh_token.expires_at < datetime.utcnow():
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token expired"
+                )
+        elif revoked:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token not found or revoked"
             )
 
-        if refresh_token.expires_at < datetime.utcnow():
+        try:
+            user_id = uuid.UUID(payload.get("sub"))
+        except (TypeError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token expired"
+                detail="Invalid refresh token"
             )
 
-        user = db.query(User).filter(User.id == refresh_token.user_id).first()
+        user = PrincipalService.get_cached(user_id) or PrincipalService.load(db, user_id)
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -144,7 +204,7 @@ class AuthService:
             data={
                 "sub": str(user.id),
                 "email": user.email,
-                "role": user.role.name if user.role else None,
+                "role": user.role_name,
                 "department_id": str(user.department_id) if user.department_id else None
             }
         )
@@ -156,12 +216,76 @@ class AuthService:
 
     @staticmethod
     def revoke_refresh_token(db: Session, refresh_token_str: str) -> bool:
+        token_hash = hash_token(refresh_token_str)
         refresh_token = db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token_str
+            RefreshToken.token_hash == token_hash
         ).first()
 
         if refresh_token:
             refresh_token.revoked = True
             db.commit()
+
+            remaining = int((refresh_token.expires_at - datetime.utcnow()).total_seconds())
+            if remaining > 0 and not CacheService.set(AuthService.revocation_key(token_hash), 1, ttl=remaining):
+                CacheService.bump_generations([REVOCATIONS_SCOPE])
             return True
         return False
+
+    @staticmethod
+    def purge_expired_refresh_tokens(db: Session, batch_size: int = 1000) -> int:
+        removed = 0
+        while True:
+            candidates = select(RefreshToken.id).where(
+                RefreshToken.expires_at < datetime.utcnow()
+            ).limit(batch_size).with_for_update(skip_locked=True)
+
+            result = db.execute(
+                delete(RefreshToken).where(RefreshToken.id.in_(candidates)),
+                execution_options={"synchronize_session": False}
+            )
+            db.commit()
+            removed += result.rowcount
+
+            if result.rowcount < batch_size:
+                return removed
+
+    @staticmethod
+    def sync_revoked_refresh_tokens(db: Session, batch_size: int = 1000) -> bool:
+        generations = CacheService.get_generations([REVOCATIONS_SCOPE])
+        if generations is None:
+            return False
+
+        now = datetime.utcnow()
+        last_id = None
+        while True:
+            query = select(RefreshToken.id, RefreshToken.token_hash, RefreshToken.expires_at).where(
+                RefreshToken.revoked == True,
+                RefreshToken.expires_at > now
+            ).order_by(RefreshToken.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(RefreshToken.id > last_id)
+
+            rows = db.execute(query).all()
+            if rows and not CacheService.set_many([
+                (AuthService.revocation_key(row.token_hash), 1, max(1, int((row.expires_at - now).total_seconds())))
+                for row in rows
+            ]):
+                return False
+
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].id
+
+        return CacheService.set(
+            REVOCATIONS_SYNCED_KEY, generations[0], ttl=settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS * 2
+        )
+
+    @staticmethod
+    def run_refresh_token_maintenance() -> int:
+        db = SessionLocal()
+        try:
+            removed = AuthService.purge_expired_refresh_tokens(db)
+            AuthService.sync_revoked_refresh_tokens(db)
+            return removed
+        finally:
+            db.close()
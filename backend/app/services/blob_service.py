@@ -0,0 +1,287 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import event, select, delete, func, literal
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert
+from fastapi import HTTPException, status
+from datetime import timedelta
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+from app.models.blob import Blob
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.storage import get_storage, StorageBackend, StorageReader
+from app.storage.compression import CompressedStorage, compress_file, compression_ratio
+from app.storage.delta import DeltaVersionStorage, encode_delta
+
+PLACED_STORAGE_KEYS = "placed_storage_keys"
+
+
+class BlobService:
+    @staticmethod
+    def blob_key(checksum: str) -> str:
+        return f"blobs/{checksum}"
+
+    @staticmethod
+    def temp_dir() -> str:
+        path = os.path.join(settings.UPLOAD_DIR, "tmp")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def delta_key(checksum: str) -> str:
+        return f"deltas/{checksum}"
+
+    @staticmethod
+    def select_encoding(temp_path: str, encoding: Optional[str]) -> Optional[str]:
+        if not encoding:
+            return None
+        with open(temp_path, "rb") as buffer:
+            sample = buffer.read(settings.COMPRESSION_SAMPLE_SIZE)
+        if compression_ratio(sample, encoding, settings.COMPRESSION_LEVEL) > settings.COMPRESSION_MIN_RATIO:
+            return None
+        return encoding
+
+    @staticmethod
+    def track_placed(db: Session, storage_key: str) -> None:
+        db.connection().info.setdefault(PLACED_STORAGE_KEYS, []).append(storage_key)
+
+    @staticmethod
+    def place(storage: StorageBackend, checksum: str, storage_key: str, temp_path: str, encoding: Optional[str]) -> bool:
+        if storage_key != BlobService.blob_key(checksum) or storage.exists(storage_key):
+            os.remove(temp_path)
+            return False
+
+        if encoding:
+            encoded_path = f"{temp_path}.{encoding}"
+            try:
+                compress_file(temp_path, encoded_path, encoding, settings.COMPRESSION_LEVEL)
+                os.remove(temp_path)
+                storage.put_file(storage_key, encoded_path)
+            finally:
+                if os.path.exists(encoded_path):
+                    os.remove(encoded_path)
+        else:
+            storage.put_file(storage_key, temp_path)
+        return True
+
+    @staticmethod
+    def store(
+        db: Session,
+        temp_path: str,
+        checksum: str,
+        file_size: int,
+        base_checksum: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> str:
+        if base_checksum and base_checksum != checksum and settings.DELTA_STORAGE_ENABLED:
+            storage_key = BlobService.store_delta(db, temp_path, checksum, file_size, base_checksum)
+            if storage_key:
+                return storage_key
+
+        stmt = insert(Blob).values(
+            checksum=checksum,
+            storage_path=BlobService.blob_key(checksum),
+            file_size=file_size,
+            ref_count=0,
+            encoding=BlobService.select_encoding(temp_path, encoding)
+        ).on_conflict_do_update(
+            index_elements=[Blob.checksum],
+            set_={"last_referenced_at": func.now()}
+        ).returning(Blob.storage_path, Blob.encoding)
+        storage_key, stored_encoding = db.execute(stmt).one()
+
+        if BlobService.place(get_storage(), checksum, storage_key, temp_path, stored_encoding):
+            BlobService.track_placed(db, storage_key)
+
+        return storage_key
+
+    @staticmethod
+    def store_delta(db: Session, temp_path: str, checksum: str, file_size: int, base_checksum: str) -> Optional[str]:
+        if db.query(Blob.checksum).filter(Blob.checksum == checksum).scalar():
+            return None
+
+        base = db.query(Blob).filter(Blob.checksum == base_checksum).first()
+        if base is None or base.chain_length >= settings.DELTA_MAX_CHAIN_LENGTH:
+            return None
+        if max(file_size, base.file_size) > settings.DELTA_MAX_FILE_SIZE:
+            return None
+
+        base_storage = BlobService.version_storage(db, base.storage_path, base.checksum)
+        base_data = base_storage.open_range(base.storage_path, 0, base.file_size - 1) if base.file_size else []
+
+        delta_path = f"{temp_path}.delta"
+        try:
+            with open(temp_path, "rb") as buffer:
+                encode_delta(base_data, iter(lambda: buffer.read(settings.UPLOAD_CHUNK_SIZE), b""), delta_path)
+            if os.path.getsize(delta_path) > file_size * settings.DELTA_MAX_SIZE_RATIO:
+                return None
+
+            delta_key = BlobService.delta_key(checksum)
+            stmt = insert(Blob).values(
+                checksum=checksum,
+                storage_path=delta_key,
+                file_size=file_size,
+                ref_count=0,
+                base_checksum=base_checksum,
+                chain_length=base.chain_length + 1
+            ).on_conflict_do_update(
+                index_elements=[Blob.checksum],
+                set_={"last_referenced_at": func.now()}
+            ).returning(Blob.storage_path)
+            storage_key = db.execute(stmt).scalar_one()
+
+            storage = get_storage()
+            if storage_key == delta_key and not storage.exists(delta_key):
+                storage.put_file(delta_key, delta_path)
+                BlobService.track_placed(db, delta_key)
+            os.remove(temp_path)
+            return storage_key
+        finally:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+
+    @staticmethod
+    def version_storage(db: Session, storage_key: str, checksum: Optional[str]) -> StorageReader:
+        storage = get_storage()
+        if not checksum:
+            return storage
+
+        if storage_key == BlobService.blob_key(checksum):
+            blob = db.query(Blob.encoding, Blob.file_size).filter(Blob.checksum == checksum).first()
+            if blob and blob.encoding:
+                return CompressedStorage(storage, {storage_key: (blob.encoding, blob.file_size)})
+            return storage
+
+        if storage_key != BlobService.delta_key(checksum):
+            return storage
+
+        chain = select(
+            Blob.checksum, Blob.storage_path, Blob.file_size, Blob.encoding, Blob.base_checksum, literal(0).label("depth")
+        ).where(Blob.checksum == checksum).cte("chain", recursive=True)
+        chain = chain.union_all(
+            select(
+                Blob.checksum, Blob.storage_path, Blob.file_size, Blob.encoding, Blob.base_checksum, chain.c.depth + 1
+            ).join(chain, Blob.checksum == chain.c.base_checksum)
+        )
+        rows = db.execute(
+            select(chain.c.storage_path, chain.c.file_size, chain.c.encoding).order_by(chain.c.depth.desc())
+        ).all()
+
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found on server"
+            )
+
+        snapshot_key, snapshot_size, snapshot_encoding = rows[0]
+        if snapshot_encoding:
+            storage = CompressedStorage(storage, {snapshot_key: (snapshot_encoding, snapshot_size)}, retain=True)
+        return DeltaVersionStorage(
+            storage, storage_key, snapshot_key, snapshot_size, [delta_key for delta_key, _, _ in rows[1:]]
+        )
+
+    @staticmethod
+    def store_many(
+        db: Session,
+        staged_files: List[Tuple[str, str, int]],
+        encodings: Optional[List[Optional[str]]] = None
+    ) -> List[str]:
+        pending = {}
+        for (temp_path, checksum, file_size), encoding in zip(staged_files, encodings or [None] * len(staged_files)):
+            if checksum in pending:
+                os.remove(temp_path)
+            else:
+                pending[checksum] = (temp_path, file_size, BlobService.select_encoding(temp_path, encoding))
+
+        stored = {}
+        if pending:
+            stmt = insert(Blob).values([
+                {
+                    "checksum": checksum,
+                    "storage_path": BlobService.blob_key(checksum),
+                    "file_size": file_size,
+                    "ref_count": 0,
+                    "encoding": encoding
+                }
+                for checksum, (_, file_size, encoding) in sorted(pending.items())
+            ])
+            stored = {
+                checksum: (storage_path, encoding)
+                for checksum, storage_path, encoding in db.execute(stmt.on_conflict_do_update(
+                    index_elements=[Blob.checksum],
+                    set_={"last_referenced_at": func.now()}
+                ).returning(Blob.checksum, Blob.storage_path, Blob.encoding))
+            }
+
+        storage = get_storage()
+
+        def place(checksum: str) -> bool:
+            temp_path, _, _ = pending[checksum]
+            storage_key, encoding = stored[checksum]
+            return BlobService.place(storage, checksum, storage_key, temp_path, encoding)
+
+        with ThreadPoolExecutor(max_workers=settings.BULK_INGEST_WORKERS) as executor:
+            futures = {checksum: executor.submit(place, checksum) for checksum in pending}
+            wait(futures.values())
+
+        for checksum, future in futures.items():
+            if future.exception() is None and future.result():
+                BlobService.track_placed(db, stored[checksum][0])
+        for future in futures.values():
+            if future.exception() is not None:
+                raise future.exception()
+
+        return [stored[checksum][0] for _, checksum, _ in staged_files]
+
+    @staticmethod
+    def collect_garbage(db: Session, grace_seconds: int, batch_size: int = 500) -> int:
+        removed = 0
+        while True:
+            candidates = select(Blob.checksum).where(
+                Blob.ref_count <= 0,
+                Blob.last_referenced_at < func.now() - timedelta(seconds=grace_seconds)
+            ).limit(batch_size).with_for_update(skip_locked=True)
+
+            storage_keys = db.execute(
+                delete(Blob).where(Blob.checksum.in_(candidates)).returning(Blob.storage_path)
+            ).scalars().all()
+
+            storage = get_storage()
+            for storage_key in storage_keys:
+                storage.delete(storage_key)
+
+            db.commit()
+            removed += len(storage_keys)
+
+            if len(storage_keys) < batch_size:
+                return removed
+
+    @staticmethod
+    def run_garbage_collection() -> int:
+        db = SessionLocal()
+        try:
+            return BlobService.collect_garbage(db, settings.BLOB_GC_GRACE_SECONDS)
+        finally:
+            db.close()
+
+
+@event.listens_for(Engine, "commit")
+def keep_placed_objects(conn):
+    conn.info.pop(PLACED_STORAGE_KEYS, None)
+
+
+@event.listens_for(Engine, "rollback")
+def remove_placed_objects(conn):
+    # Runs before ROLLBACK is sent, while the transaction's uncommitted blob rows
+    # still hold back concurrent uploads of the same checksums, so no other
+    # transaction can have adopted these objects yet.
+    storage_keys = conn.info.pop(PLACED_STORAGE_KEYS, None)
+    if not storage_keys:
+        return
+    storage = get_storage()
+    for storage_key in storage_keys:
+        try:
+            storage.delete(storage_key)
+        except Exception as e:
+            print(f"Error removing {storage_key} after rollback: {e}")
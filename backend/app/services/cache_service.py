@@ -1,9 +1,32 @@
 import redis
+import redis.asyncio
 import json
-from typing import Optional, Any
+from sqlalchemy.util import await_only
+from typing import Callable, Optional, Any, List, Tuple
 from app.core.config import settings
+from app.core.metrics import CACHE_OPERATIONS
+from app.db.database import in_session_greenlet
 
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+async_redis_client = redis.asyncio.from_url(settings.REDIS_URL, decode_responses=True) if settings.DATABASE_ASYNC else None
+
+
+def run_redis(command: Callable) -> Any:
+    # Under DATABASE_ASYNC, service functions run in the session's greenlet on the
+    # event loop, so commands go through the asyncio client and yield to the loop
+    # the same way the database driver does instead of blocking it.
+    if async_redis_client is not None and in_session_greenlet.get():
+        return await_only(command(async_redis_client))
+    return command(redis_client)
+
+
+def run_pipeline(commands: List[Tuple]) -> Any:
+    def execute(client):
+        pipe = client.pipeline(transaction=False)
+        for name, *args in commands:
+            getattr(pipe, name)(*args)
+        return pipe.execute()
+    return run_redis(execute)
 
 
 class CacheService:
@@ -11,43 +34,101 @@ class CacheService:
     @staticmethod
     def get(key: str) -> Optional[Any]:
         try:
-            value = redis_client.get(key)
+            value = run_redis(lambda client: client.get(key))
             if value:
+                CACHE_OPERATIONS.labels("get", "hit").inc()
                 return json.loads(value)
+            CACHE_OPERATIONS.labels("get", "miss").inc()
             return None
         except Exception as e:
+            CACHE_OPERATIONS.labels("get", "error").inc()
             print(f"Cache get error: {e}")
             return None
 
     @staticmethod
     def set(key: str, value: Any, ttl: int = 300) -> bool:
         try:
-            redis_client.setex(key, ttl, json.dumps(value, default=str))
+            run_redis(lambda client: client.setex(key, ttl, json.dumps(value, default=str)))
             return True
         except Exception as e:
+            CACHE_OPERATIONS.labels("set", "error").inc()
             print(f"Cache set error: {e}")
             return False
 
+    @staticmethod
+    def get_many(keys: List[str]) -> Optional[List[Any]]:
+        try:
+            values = run_redis(lambda client: client.mget(keys))
+            hits = sum(1 for value in values if value)
+            CACHE_OPERATIONS.labels("get_many", "hit").inc(hits)
+            CACHE_OPERATIONS.labels("get_many", "miss").inc(len(values) - hits)
+            return [json.loads(value) if value else None for value in values]
+        except Exception as e:
+            CACHE_OPERATIONS.labels("get_many", "error").inc()
+            print(f"Cache get many error: {e}")
+            return None
+
+    @staticmethod
+    def set_many(items: List[Tuple[str, Any, int]]) -> bool:
+        try:
+            run_pipeline([("setex", key, ttl, json.dumps(value, default=str)) for key, value, ttl in items])
+            return True
+        except Exception as e:
+            CACHE_OPERATIONS.labels("set_many", "error").inc()
+            print(f"Cache set many error: {e}")
+            return False
+
     @staticmethod
     def delete(key: str) -> bool:
         try:
-            redis_client.delete(key)
+            run_redis(lambda client: client.delete(key))
             return True
         except Exception as e:
+            CACHE_OPERATIONS.labels("delete", "error").inc()
             print(f"Cache delete error: {e}")
             return False
 
     @staticmethod
     def delete_pattern(pattern: str) -> bool:
         try:
-            keys = redis_client.keys(pattern)
+            keys, cursor = [], 0
+            while True:
+                cursor, batch = run_redis(lambda client: client.scan(cursor, match=pattern, count=1000))
+                keys.extend(batch)
+                if not cursor:
+                    break
             if keys:
-                redis_client.delete(*keys)
+                run_redis(lambda client: client.unlink(*keys))
             return True
         except Exception as e:
+            CACHE_OPERATIONS.labels("delete_pattern", "error").inc()
             print(f"Cache delete pattern error: {e}")
             return False
 
+    @staticmethod
+    def generation_key(scope: str) -> str:
+        return f"gen:{scope}"
+
+    @staticmethod
+    def get_generations(scopes: List[str]) -> Optional[List[int]]:
+        try:
+            values = run_redis(lambda client: client.mget([CacheService.generation_key(scope) for scope in scopes]))
+            return [int(value) if value else 0 for value in values]
+        except Exception as e:
+            CACHE_OPERATIONS.labels("get_generations", "error").inc()
+            print(f"Cache get generations error: {e}")
+            return None
+
+    @staticmethod
+    def bump_generations(scopes: List[str]) -> bool:
+        try:
+            run_pipeline([("incr", CacheService.generation_key(scope)) for scope in scopes])
+            return True
+        except Exception as e:
+            CACHE_OPERATIONS.labels("bump_generations", "error").inc()
+            print(f"Cache bump generations error: {e}")
+            return False
+
     @staticmethod
     def generate_search_key(query: str, tags: list, page: int, page_size: int) -> str:
         tags_str = ",".join(sorted(tags)) if tags else ""
@@ -1,26 +1,74 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, desc, asc
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import event, inspect
+from sqlalchemy import or_, and_, not_, func, desc, asc, select, insert, tuple_, literal, distinct, true, cast, String, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException, status, UploadFile
-from typing import List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
 from uuid import UUID
 import os
+import re
+import mimetypes
 import hashlib
 import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 from app.models.document import Document, PermissionLevel
 from app.models.document_version import DocumentVersion
 from app.models.document_tag import DocumentTag
 from app.models.tag import Tag
 from app.models.user import User
-from app.schemas.document import DocumentCreate, DocumentUpdate, DocumentSearchParams
+from app.schemas.auth import Principal
+from app.models.department import Department
+from app.schemas.document import DocumentCreate, DocumentUpdate, DocumentSearchParams, DocumentResponse
 from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.metrics import UPLOAD_BYTES, UPLOAD_HASH_SECONDS, UPLOAD_THROUGHPUT
 from app.services.cache_service import CacheService
+from app.services.blob_service import BlobService
+
+SEARCH_CONFIG = "english"
+
+DOCUMENT_LOAD_OPTIONS = (
+    joinedload(Document.uploader),
+    joinedload(Document.department),
+    selectinload(Document.document_tags).joinedload(DocumentTag.tag),
+)
+
+tag_ids_cache = OrderedDict()
+tag_ids_cache_lock = threading.Lock()
+
+# Only these columns appear in rendered search pages, so other updates (logins,
+# password changes) leave cached pages valid.
+RENDERED_COLUMNS = {
+    User: ("first_name", "last_name", "department_id"),
+    Department: ("name",),
+    Tag: ("name",),
+}
+
+# Shared and personal windows are merged in Python, so titles are ordered by
+# code point ("C" collation) to agree with str comparison.
+SORT_COLUMNS = {
+    "created_at": Document.created_at,
+    "updated_at": Document.updated_at,
+    "title": Document.title.collate("C"),
+}
 
 
 class DocumentService:
     @staticmethod
-    def check_access(user: User, document: Document) -> bool:
-        if user.role and user.role.name == "admin":
+    def build_search_query(text: str):
+        terms = re.findall(r"[^\W_]+", text.lower())
+        if not terms:
+            return None
+        return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+
+    @staticmethod
+    def check_access(user: Principal, document: Document) -> bool:
+        if user.is_admin:
             return True
 
         if document.uploader_id == user.id:
@@ -35,54 +83,292 @@ class DocumentService:
         return False
 
     @staticmethod
-    def get_or_create_tags(db: Session, tag_names: List[str]) -> List[Tag]:
-        tags = []
-        for tag_name in tag_names:
-            tag_name = tag_name.strip().lower()
-            tag = db.query(Tag).filter(func.lower(Tag.name) == tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.add(tag)
-                db.flush()
-            tags.append(tag)
-        return tags
+    def serialize_document(document: Document) -> dict:
+        return {
+            "id": document.id,
+            "title": document.title,
+            "description": document.description,
+            "permission_level": document.permission_level.value,
+            "uploader_id": document.uploader_id,
+            "department_id": document.department_id,
+            "created_at": document.created_at,
+            "updated_at": document.updated_at,
+            "current_version": document.current_version,
+            "is_deleted": document.is_deleted,
+            "uploader_name": document.uploader.full_name if document.uploader else None,
+            "department_name": document.department.name if document.department else None,
+            "tags": [dt.tag.name for dt in document.document_tags]
+        }
 
     @staticmethod
-    def save_uploaded_file(file: UploadFile, document_id: UUID, version: int) -> Tuple[str, str, int]:
-        upload_dir = settings.UPLOAD_DIR
-        os.makedirs(upload_dir, exist_ok=True)
+    def serialize_version(version: DocumentVersion) -> dict:
+        return {
+            "id": version.id,
+            "document_id": version.document_id,
+            "version_number": version.version_number,
+            "file_name": version.file_name,
+            "file_path": version.file_path,
+            "file_size": version.file_size,
+            "mime_type": version.mime_type,
+            "checksum": version.checksum,
+            "uploaded_by": version.uploaded_by,
+            "upload_date": version.upload_date,
+            "change_notes": version.change_notes,
+            "uploaded_by_name": version.uploaded_by_user.full_name if version.uploaded_by_user else None
+        }
+
+    @staticmethod
+    def shared_search_scope(user: Principal) -> Tuple[str, List[str]]:
+        if user.is_admin:
+            return "admin", ["search:render", "search:all"]
+        return f"department:{user.department_id}", [
+            "search:render",
+            "search:public",
+            f"search:department:{user.department_id}",
+        ]
+
+    @staticmethod
+    def personal_search_scope(user: Principal) -> Tuple[str, List[str]]:
+        return f"user:{user.id}", ["search:render", f"search:user:{user.id}"]
+
+    @staticmethod
+    def shared_visibility(user: Principal):
+        if user.is_admin:
+            return None
+        visible = Document.permission_level == PermissionLevel.PUBLIC
+        if user.department_id:
+            visible = or_(
+                visible,
+                and_(
+                    Document.permission_level == PermissionLevel.DEPARTMENT,
+                    Document.department_id == user.department_id
+                )
+            )
+        return visible
+
+    @staticmethod
+    def personal_visibility(user: Principal):
+        if user.is_admin:
+            return None
+        return and_(
+            Document.uploader_id == user.id,
+            not_(func.coalesce(DocumentService.shared_visibility(user), False))
+        )
+
+    @staticmethod
+    def document_cache_scopes(document: Document) -> List[str]:
+        scopes = ["search:all", f"search:user:{document.uploader_id}"]
+        if document.permission_level == PermissionLevel.PUBLIC:
+            scopes.append("search:public")
+        elif document.permission_level == PermissionLevel.DEPARTMENT:
+            scopes.append(f"search:department:{document.department_id}")
+        return scopes
+
+    @staticmethod
+    def cached_tag_ids(tag_names: List[str]) -> Dict[str, UUID]:
+        now = time.monotonic()
+        tag_ids = {}
+        with tag_ids_cache_lock:
+            for tag_name in tag_names:
+                entry = tag_ids_cache.get(tag_name)
+                if entry is None:
+                    continue
+                tag_id, expires_at = entry
+                if expires_at <= now:
+                    del tag_ids_cache[tag_name]
+                    continue
+                tag_ids_cache.move_to_end(tag_name)
+                tag_ids[tag_name] = tag_id
+        return tag_ids
+
+    @staticmethod
+    def cache_tag_ids(tag_ids: Dict[str, UUID]) -> None:
+        expires_at = time.monotonic() + settings.TAG_CACHE_TTL_SECONDS
+        with tag_ids_cache_lock:
+            for tag_name, tag_id in tag_ids.items():
+                tag_ids_cache[tag_name] = (tag_id, expires_at)
+                tag_ids_cache.move_to_end(tag_name)
+            while len(tag_ids_cache) > settings.TAG_CACHE_MAX_SIZE:
+                tag_ids_cache.popitem(last=False)
+
+    @staticmethod
+    def get_or_create_tags(db: Session, tag_names: List[str]) -> Dict[str, UUID]:
+        tag_names = sorted({tag_name.strip().lower() for tag_name in tag_names if tag_name.strip()})
+        tag_ids = DocumentService.cached_tag_ids(tag_names)
+
+        missing = [tag_name for tag_name in tag_names if tag_name not in tag_ids]
+        if not missing:
+            return tag_ids
+
+        existing = dict(db.execute(
+            select(func.lower(Tag.name), Tag.id).where(func.lower(Tag.name).in_(missing))
+        ).all())
+        DocumentService.cache_tag_ids(existing)
+        tag_ids.update(existing)
+
+        missing = [tag_name for tag_name in missing if tag_name not in tag_ids]
+        if not missing:
+            return tag_ids
+
+        created = dict(db.execute(
+            pg_insert(Tag).values([{"name": tag_name} for tag_name in missing])
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+            .returning(Tag.name, Tag.id)
+        ).all())
+        tag_ids.update(created)
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        file_extension = os.path.splitext(file.filename)[1]
-        file_name = f"{document_id}_v{version}_{timestamp}{file_extension}"
-        file_path = os.path.join(upload_dir, file_name)
+        missing = [tag_name for tag_name in missing if tag_name not in tag_ids]
+        if missing:
+            concurrent = dict(db.execute(
+                select(Tag.name, Tag.id).where(Tag.name.in_(missing))
+            ).all())
+            DocumentService.cache_tag_ids(concurrent)
+            tag_ids.update(concurrent)
+
+        return tag_ids
+
+    @staticmethod
+    def stage_uploaded_file(file: BinaryIO) -> Tuple[str, str, int]:
+        file_path = os.path.join(BlobService.temp_dir(), f"{uuid.uuid4()}.part")
 
         hasher = hashlib.sha256()
         file_size = 0
+        hash_seconds = 0.0
+        started_at = time.perf_counter()
 
-        with open(file_path, "wb") as buffer:
-            while chunk := file.file.read(8192):
-                buffer.write(chunk)
-                hasher.update(chunk)
-                file_size += len(chunk)
+        try:
+            with open(file_path, "wb") as buffer:
+                while chunk := file.read(settings.UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > settings.MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File exceeds the maximum upload size of {settings.MAX_UPLOAD_SIZE} bytes"
+                        )
+                    buffer.write(chunk)
+                    hash_started_at = time.perf_counter()
+                    hasher.update(chunk)
+                    hash_seconds += time.perf_counter() - hash_started_at
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
 
-        checksum = hasher.hexdigest()
-        return file_path, checksum, file_size
+        elapsed = time.perf_counter() - started_at
+        UPLOAD_BYTES.inc(file_size)
+        UPLOAD_HASH_SECONDS.observe(hash_seconds)
+        if elapsed > 0:
+            UPLOAD_THROUGHPUT.observe(file_size / elapsed)
+
+        return file_path, hasher.hexdigest(), file_size
 
     @staticmethod
-    def create_document(
-        db: Session,
-        user: User,
-        document_data: DocumentCreate,
-        file: UploadFile
-    ) -> Document:
-        file_extension = os.path.splitext(file.filename)[1].lower()
+    def save_uploaded_file(db: Session, file: UploadFile, base_checksum: Optional[str] = None) -> Tuple[str, str, int]:
+        file_path, checksum, file_size = DocumentService.stage_uploaded_file(file.file)
+
+        try:
+            storage_path = BlobService.store(
+                db, file_path, checksum, file_size, base_checksum, DocumentService.compression_encoding(file.filename)
+            )
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+
+        return storage_path, checksum, file_size
+
+    @staticmethod
+    def save_uploaded_files(db: Session, files: List[UploadFile]) -> List[Tuple[str, str, int]]:
+        with ThreadPoolExecutor(max_workers=settings.BULK_INGEST_WORKERS) as executor:
+            futures = [executor.submit(DocumentService.stage_uploaded_file, file.file) for file in files]
+            wait(futures)
+
+        staged_files = [future.result() for future in futures if future.exception() is None]
+        try:
+            for future in futures:
+                if future.exception() is not None:
+                    raise future.exception()
+            storage_paths = BlobService.store_many(
+                db, staged_files, [DocumentService.compression_encoding(file.filename) for file in files]
+            )
+        except BaseException:
+            for file_path, _, _ in staged_files:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            raise
+
+        return [
+            (storage_path, checksum, file_size)
+            for storage_path, (_, checksum, file_size) in zip(storage_paths, staged_files)
+        ]
+
+    @staticmethod
+    def validate_file_extension(file_name: str) -> None:
+        file_extension = os.path.splitext(file_name)[1].lower()
         if file_extension not in settings.allowed_extensions_list:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File type {file_extension} not allowed"
             )
 
+    @staticmethod
+    def validate_document_data(document_data: DocumentCreate, entry: str = "") -> None:
+        if document_data.permission_level.lower() not in [level.value for level in PermissionLevel]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{entry}Invalid permission level {document_data.permission_level}"
+            )
+
+        for tag_name in document_data.tags:
+            if len(tag_name.strip()) > Tag.name.type.length:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{entry}Tag names must be at most {Tag.name.type.length} characters"
+                )
+
+    @staticmethod
+    def get_document_for_update(db: Session, user: Principal, document_id: UUID) -> Document:
+        document = db.query(Document).filter(Document.id == document_id).with_for_update().first()
+
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+
+        if not DocumentService.check_access(user, document):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+        return document
+
+    @staticmethod
+    def create_document(
+        db: Session,
+        user: Principal,
+        document_data: DocumentCreate,
+        file: UploadFile
+    ) -> Document:
+        DocumentService.validate_file_extension(file.filename)
+        DocumentService.validate_document_data(document_data)
+
+        stored_file = DocumentService.save_uploaded_file(db, file)
+
+        return DocumentService.create_document_from_file(
+            db, user, document_data, file.filename, file.content_type, stored_file
+        )
+
+    @staticmethod
+    def create_document_from_file(
+        db: Session,
+        user: Principal,
+        document_data: DocumentCreate,
+        file_name: str,
+        mime_type: Optional[str],
+        stored_file: Tuple[str, str, int]
+    ) -> Document:
         document = Document(
             title=document_data.title,
             description=document_data.description,
@@ -95,19 +381,17 @@ class DocumentService:
         db.add(document)
         db.flush()
 
-        CacheService.delete_pattern(f"search:*")
+        cache_scopes = DocumentService.document_cache_scopes(document)
 
-        file_path, checksum, file_size = DocumentService.save_uploaded_file(
-            file, document.id, 1
-        )
+        file_path, checksum, file_size = stored_file
 
         version = DocumentVersion(
             document_id=document.id,
             version_number=1,
             file_path=file_path,
-            file_name=file.filename,
+            file_name=file_name,
             file_size=file_size,
-            mime_type=file.content_type,
+            mime_type=mime_type,
             checksum=checksum,
             uploaded_by=user.id,
             change_notes="Initial version"
@@ -116,51 +400,173 @@ class DocumentService:
         db.add(version)
 
         if document_data.tags:
-            tags = DocumentService.get_or_create_tags(db, document_data.tags)
-            for tag in tags:
-                doc_tag = DocumentTag(document_id=document.id, tag_id=tag.id)
+            tag_ids = DocumentService.get_or_create_tags(db, document_data.tags)
+            for tag_id in tag_ids.values():
+                doc_tag = DocumentTag(document_id=document.id, tag_id=tag_id)
                 db.add(doc_tag)
 
         db.commit()
-        db.refresh(document)
+        CacheService.bump_generations(cache_scopes)
 
-        return document
+        return db.query(Document).options(*DOCUMENT_LOAD_OPTIONS).populate_existing().filter(
+            Document.id == document.id
+        ).one()
+
+    @staticmethod
+    def create_documents(
+        db: Session,
+        user: Principal,
+        documents_data: List[DocumentCreate],
+        files: List[UploadFile]
+    ) -> List[Document]:
+        for file in files:
+            DocumentService.validate_file_extension(file.filename)
+        for index, document_data in enumerate(documents_data):
+            DocumentService.validate_document_data(document_data, f"Entry {index}: ")
+
+        stored_files = DocumentService.save_uploaded_files(db, files)
+
+        return DocumentService.create_documents_from_files(db, user, [
+            (document_data, file.filename, file.content_type, stored_file)
+            for document_data, file, stored_file in zip(documents_data, files, stored_files)
+        ])
+
+    @staticmethod
+    def create_documents_from_files(
+        db: Session,
+        user: Principal,
+        entries: List[Tuple[DocumentCreate, str, Optional[str], Tuple[str, str, int]]]
+    ) -> List[Document]:
+        entry_tags = [
+            sorted({tag.strip().lower() for tag in document_data.tags if tag.strip()})
+            for document_data, _, _, _ in entries
+        ]
+        tag_ids = DocumentService.get_or_create_tags(
+            db, [tag_name for tag_names in entry_tags for tag_name in tag_names]
+        )
+
+        document_rows = []
+        version_rows = []
+        tag_rows = []
+        cache_scopes = set()
+
+        for (document_data, file_name, mime_type, stored_file), tag_names in zip(entries, entry_tags):
+            document = Document(
+                id=uuid.uuid4(),
+                title=document_data.title,
+                description=document_data.description,
+                uploader_id=user.id,
+                department_id=user.department_id,
+                permission_level=PermissionLevel(document_data.permission_level.lower()),
+                current_version=1
+            )
+            cache_scopes.update(DocumentService.document_cache_scopes(document))
+
+            file_path, checksum, file_size = stored_file
+
+            document_rows.append({
+                "id": document.id,
+                "title": document.title,
+                "description": document.description,
+                "uploader_id": document.uploader_id,
+                "department_id": document.department_id,
+                "permission_level": document.permission_level,
+                "current_version": 1,
+                "is_deleted": False
+            })
+            version_rows.append({
+                "id": uuid.uuid4(),
+                "document_id": document.id,
+                "version_number": 1,
+                "file_path": file_path,
+                "file_name": file_name,
+                "file_size": file_size,
+                "mime_type": mime_type,
+                "checksum": checksum,
+                "uploaded_by": user.id,
+                "change_notes": "Initial version"
+            })
+            tag_rows.extend(
+                {"id": uuid.uuid4(), "document_id": document.id, "tag_id": tag_ids[tag_name]}
+                for tag_name in tag_names
+            )
+
+        if document_rows:
+            db.execute(insert(Document), document_rows)
+            db.execute(insert(DocumentVersion), version_rows)
+        if tag_rows:
+            db.execute(insert(DocumentTag), tag_rows)
+
+        db.commit()
+        CacheService.bump_generations(sorted(cache_scopes))
+
+        document_ids = [row["id"] for row in document_rows]
+        documents = db.query(Document).options(*DOCUMENT_LOAD_OPTIONS).filter(
+            Document.id.in_(document_ids)
+        ).all()
+        documents_by_id = {document.id: document for document in documents}
+        return [documents_by_id[document_id] for document_id in document_ids]
 
     @staticmethod
     def upload_new_version(
         db: Session,
-        user: User,
+        user: Principal,
         document_id: UUID,
         file: UploadFile,
         change_notes: Optional[str] = None
     ) -> DocumentVersion:
-        document = db.query(Document).filter(Document.id == document_id).first()
+        document = DocumentService.get_document_for_update(db, user, document_id)
 
-        if not document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Document not found"
-            )
+        stored_file = DocumentService.save_uploaded_file(
+            db, file, DocumentService.delta_base_checksum(db, document, file.filename)
+        )
 
-        if not DocumentService.check_access(user, document):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions"
-            )
+        return DocumentService.add_document_version(
+            db, user, document, file.filename, file.content_type, stored_file, change_notes
+        )
+
+    @staticmethod
+    def compression_encoding(file_name: Optional[str]) -> Optional[str]:
+        if not settings.COMPRESSION_ENABLED or not file_name:
+            return None
+        content_type = mimetypes.guess_type(file_name)[0]
+        if not content_type:
+            return None
+        codecs = settings.compression_codecs_map
+        return codecs.get(content_type) or codecs.get(f"{content_type.split('/')[0]}/*")
+
+    @staticmethod
+    def delta_base_checksum(db: Session, document: Document, file_name: str) -> Optional[str]:
+        if not settings.DELTA_STORAGE_ENABLED:
+            return None
+        if os.path.splitext(file_name)[1].lower() not in settings.delta_storage_extensions_list:
+            return None
+        return db.query(DocumentVersion.checksum).filter(
+            DocumentVersion.document_id == document.id,
+            DocumentVersion.version_number == document.current_version
+        ).scalar()
 
+    @staticmethod
+    def add_document_version(
+        db: Session,
+        user: Principal,
+        document: Document,
+        file_name: str,
+        mime_type: Optional[str],
+        stored_file: Tuple[str, str, int],
+        change_notes: Optional[str] = None
+    ) -> DocumentVersion:
         new_version_number = document.current_version + 1
 
-        file_path, checksum, file_size = DocumentService.save_uploaded_file(
-            file, document.id, new_version_number
-        )
+        file_path, checksum, file_size = stored_file
 
         version = DocumentVersion(
             document_id=document.id,
             version_number=new_version_number,
             file_path=file_path,
-            file_name=file.filename,
+            file_name=file_name,
             file_size=file_size,
-            mime_type=file.content_type,
+            mime_type=mime_type,
             checksum=checksum,
             uploaded_by=user.id,
             change_notes=change_notes or f"Version {new_version_number}"
@@ -171,48 +577,19 @@ class DocumentService:
         document.current_version = new_version_number
         document.updated_at = datetime.utcnow()
 
-        CacheService.delete_pattern(f"search:*")
+        cache_scopes = DocumentService.document_cache_scopes(document)
 
         db.commit()
+        CacheService.bump_generations(cache_scopes)
         db.refresh(version)
 
         return version
 
     @staticmethod
-    def search_documents(
-        db: Session,
-        user: User,
-        params: DocumentSearchParams
-    ) -> Tuple[List[Document], int]:
-        cache_key = f"search:{user.id}:{params.query or 'all'}:{','.join(sorted(params.tags or []))}:{params.uploader_id or ''}:{params.department_id or ''}:{params.page}:{params.page_size}:{params.sort_by}:{params.sort_order}"
-
-        cached_result = CacheService.get(cache_key)
-        if cached_result:
-            document_ids = [doc['id'] for doc in cached_result['documents']]
-            documents = db.query(Document).filter(Document.id.in_(document_ids)).all()
-            doc_map = {str(doc.id): doc for doc in documents}
-            ordered_documents = [doc_map[doc_id] for doc_id in document_ids if doc_id in doc_map]
-            return ordered_documents, cached_result['total']
-
-        query = db.query(Document).filter(Document.is_deleted == False)
-
-        if not user.role or user.role.name != "admin":
-            query = query.filter(
-                or_(
-                    Document.permission_level == PermissionLevel.PUBLIC,
-                    and_(
-                        Document.permission_level == PermissionLevel.DEPARTMENT,
-                        Document.department_id == user.department_id
-                    ),
-                    and_(
-                        Document.permission_level == PermissionLevel.RESTRICTED,
-                        Document.uploader_id == user.id
-                    ),
-                    Document.uploader_id == user.id
-                )
-            )
-
-        if params.query:
+    def apply_search_filters(query, params: DocumentSearchParams, ts_query):
+        if ts_query is not None:
+            query = query.filter(Document.search_vector.op("@@")(ts_query))
+        elif params.query:
             query = query.filter(
                 or_(
                     Document.title.ilike(f"%{params.query}%"),
@@ -221,9 +598,10 @@ class DocumentService:
             )
 
         if params.tags:
-            query = query.join(DocumentTag).join(Tag).filter(
+            tagged_documents = select(DocumentTag.document_id).join(Tag).where(
                 func.lower(Tag.name).in_([tag.lower() for tag in params.tags])
             )
+            query = query.filter(Document.id.in_(tagged_documents))
 
         if params.uploader_id:
             import logging
@@ -236,31 +614,282 @@ class DocumentService:
         if params.permission_level:
             query = query.filter(Document.permission_level == params.permission_level)
 
-        total = query.count()
+        return query
+
+    @staticmethod
+    def fetch_search_window(
+        db: Session,
+        cache_key: Optional[str],
+        visibility,
+        params: DocumentSearchParams,
+        ts_query,
+        sort_by: str,
+        sort_order: str,
+        after: Optional[tuple],
+        offset: int,
+        limit: int,
+        include_total: bool
+    ) -> dict:
+        if cache_key:
+            cached_window = CacheService.get(cache_key)
+            if cached_window:
+                return cached_window
+
+        query = db.query(Document).options(*DOCUMENT_LOAD_OPTIONS).filter(Document.is_deleted == False)
+        if visibility is not None:
+            query = query.filter(visibility)
+        query = DocumentService.apply_search_filters(query, params, ts_query)
+
+        total = query.count() if include_total else None
+
+        if sort_by == "relevance":
+            sort_column = func.ts_rank_cd(Document.search_vector, ts_query)
+        else:
+            sort_column = SORT_COLUMNS[sort_by]
+
+        if after:
+            position = tuple_(sort_column, Document.id)
+            boundary = tuple_(literal(after[0], sort_column.type), literal(after[1], Document.id.type))
+            query = query.filter(position > boundary if sort_order == "asc" else position < boundary)
+
+        if sort_order == "asc":
+            query = query.order_by(asc(sort_column), asc(Document.id))
+        else:
+            query = query.order_by(desc(sort_column), desc(Document.id))
+
+        rows = query.add_columns(sort_column).offset(offset).limit(limit).all()
+
+        window = {
+            "items": [
+                DocumentResponse(**DocumentService.serialize_document(document)).model_dump(mode="json")
+                for document, _ in rows
+            ],
+            "keys": [key.isoformat() if isinstance(key, datetime) else key for _, key in rows],
+            "total": total
+        }
+
+        if cache_key:
+            CacheService.set(cache_key, window, ttl=300)
+
+        return window
+
+    @staticmethod
+    def search_documents(
+        db: Session,
+        user: Principal,
+        params: DocumentSearchParams
+    ) -> dict:
+        include_total = params.include_total if params.include_total is not None else params.cursor is None
+        ts_query = DocumentService.build_search_query(params.query) if params.query else None
+
+        sort_by = params.sort_by if params.sort_by in SORT_COLUMNS else "created_at"
+        if params.sort_by == "relevance" and ts_query is not None:
+            sort_by = "relevance"
+        sort_order = "asc" if params.sort_order == "asc" else "desc"
+
+        after = None
+        if params.cursor:
+            cursor = decode_cursor(params.cursor, "sort_by", "sort_order", "key", "id")
+            if cursor["sort_by"] != sort_by or cursor["sort_order"] != sort_order:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor does not match the requested sort"
+                )
+            try:
+                after = (DocumentService.parse_sort_key(sort_by, cursor["key"]), UUID(cursor["id"]))
+            except (TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
+        shared_namespace, shared_scopes = DocumentService.shared_search_scope(user)
+        personal_namespace, personal_scopes = DocumentService.personal_search_scope(user)
+        generations = CacheService.get_generations(shared_scopes + personal_scopes)
 
-        sort_column = getattr(Document, params.sort_by, Document.created_at)
-        if params.sort_order == "asc":
-            query = query.order_by(asc(sort_column))
+        def window_cache_key(namespace: str, scopes: List[str], offset: int, limit: int) -> Optional[str]:
+            if generations is None:
+                return None
+            scope_generations = dict(zip(shared_scopes + personal_scopes, generations))
+            generation_key = ".".join(str(scope_generations[scope]) for scope in scopes)
+            return f"search:{namespace}:{generation_key}:{params.query or 'all'}:{','.join(sorted(params.tags or []))}:{params.uploader_id or ''}:{params.department_id or ''}:{params.permission_level or ''}:{sort_by}:{sort_order}:{params.cursor or ''}:{offset}:{limit}:{int(include_total)}"
+
+        def fetch_window(namespace: str, scopes: List[str], visibility, offset: int, limit: int) -> dict:
+            return DocumentService.fetch_search_window(
+                db, window_cache_key(namespace, scopes, offset, limit), visibility, params,
+                ts_query, sort_by, sort_order, after, offset, limit, include_total
+            )
+
+        page_offset = 0 if after else (params.page - 1) * params.page_size
+        page_limit = params.page_size + 1
+
+        personal_visibility = DocumentService.personal_visibility(user)
+        if personal_visibility is not None:
+            personal = fetch_window(personal_namespace, personal_scopes, personal_visibility, 0, page_offset + page_limit)
         else:
-            query = query.order_by(desc(sort_column))
+            personal = {"items": [], "keys": [], "total": 0}
+        personal_entries = DocumentService.window_entries(personal, sort_by)
 
-        offset = (params.page - 1) * params.page_size
-        documents = query.offset(offset).limit(params.page_size).all()
+        # Personal documents interleave with the shared ones, so the shared window
+        # has to start early enough to cover every personal document that may
+        # precede the requested page.
+        shared_offset = max(0, page_offset - len(personal_entries))
+        shared = fetch_window(
+            shared_namespace, shared_scopes, DocumentService.shared_visibility(user),
+            shared_offset, page_offset + page_limit - shared_offset
+        )
+        shared_entries = DocumentService.window_entries(shared, sort_by)
 
-        cache_data = {
-            'documents': [{'id': str(doc.id)} for doc in documents],
-            'total': total
+        reverse = sort_order == "desc"
+        if shared_offset and not shared_entries:
+            merged, start = [], page_offset
+        elif shared_offset:
+            first_shared = shared_entries[0][0]
+            preceding = sum(1 for position, _ in personal_entries if (position > first_shared if reverse else position < first_shared))
+            merged = sorted(shared_entries + personal_entries[preceding:], key=lambda entry: entry[0], reverse=reverse)
+            start = shared_offset + preceding
+        else:
+            merged = sorted(shared_entries + personal_entries, key=lambda entry: entry[0], reverse=reverse)
+            start = 0
+
+        page_entries = merged[page_offset - start:page_offset - start + page_limit]
+
+        next_cursor = None
+        if len(page_entries) > params.page_size:
+            page_entries = page_entries[:params.page_size]
+            (last_key, last_id), _ = page_entries[-1]
+            next_cursor = encode_cursor({
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+                "key": last_key.isoformat() if isinstance(last_key, datetime) else last_key,
+                "id": str(last_id)
+            })
+
+        total = shared["total"] + personal["total"] if include_total else None
+
+        return {
+            "items": [item for _, item in page_entries],
+            "total": total,
+            "page": params.page,
+            "page_size": params.page_size,
+            "total_pages": (total + params.page_size - 1) // params.page_size if total is not None else None,
+            "next_cursor": next_cursor,
+            "facets": DocumentService.get_search_facets(db, user, params) if params.include_facets else None
         }
-        CacheService.set(cache_key, cache_data, ttl=300)
 
-        return documents, total
+    @staticmethod
+    def get_search_facets(db: Session, user: Principal, params: DocumentSearchParams) -> dict:
+        shared_namespace, shared_scopes = DocumentService.shared_search_scope(user)
+        personal_namespace, personal_scopes = DocumentService.personal_search_scope(user)
+        generations = CacheService.get_generations(shared_scopes + personal_scopes)
+
+        cache_key = None
+        if generations is not None:
+            generation_key = ".".join(str(generation) for generation in generations)
+            cache_key = f"search:facets:{shared_namespace}:{personal_namespace}:{generation_key}:{params.query or 'all'}:{','.join(sorted(params.tags or []))}:{params.uploader_id or ''}:{params.department_id or ''}:{params.permission_level or ''}:{settings.SEARCH_FACET_LIMIT}"
+            cached_facets = CacheService.get(cache_key)
+            if cached_facets:
+                return cached_facets
+
+        ts_query = DocumentService.build_search_query(params.query) if params.query else None
+
+        if params.tags:
+            tag_match = Document.id.in_(
+                select(DocumentTag.document_id).join(Tag).where(
+                    func.lower(Tag.name).in_([tag.lower() for tag in params.tags])
+                )
+            )
+        else:
+            tag_match = true()
+
+        # Facet filters are left out of the CTE and applied per branch, so each
+        # facet counts against every filter except its own and the documents
+        # table is only scanned once.
+        matched_query = db.query(
+            Document.id,
+            Document.uploader_id,
+            Document.department_id,
+            Document.permission_level,
+            tag_match.label("tag_match")
+        ).filter(Document.is_deleted == False)
+        if not user.is_admin:
+            matched_query = matched_query.filter(DocumentService.filter_visibility(user))
+        text_params = params.model_copy(update={
+            "tags": None, "uploader_id": None, "department_id": None, "permission_level": None
+        })
+        matched = DocumentService.apply_search_filters(matched_query, text_params, ts_query).cte("matched")
+
+        conditions = {
+            "tags": matched.c.tag_match,
+            "uploaders": matched.c.uploader_id == params.uploader_id if params.uploader_id else true(),
+            "departments": matched.c.department_id == params.department_id if params.department_id else true(),
+            "permission_levels": matched.c.permission_level == params.permission_level if params.permission_level else true()
+        }
+
+        def other_filters(facet: Optional[str]):
+            return and_(*[condition for name, condition in conditions.items() if name != facet])
+
+        facet_query = union_all(
+            select(
+                literal("total").label("facet"), literal("").label("value"), literal("").label("label"), func.count().label("count")
+            ).select_from(matched).where(other_filters(None)),
+            select(
+                literal("tags"), Tag.name, Tag.name, func.count()
+            ).select_from(matched).join(DocumentTag, DocumentTag.document_id == matched.c.id).join(
+                Tag, Tag.id == DocumentTag.tag_id
+            ).where(other_filters("tags")).group_by(Tag.name),
+            select(
+                literal("uploaders"), cast(User.id, String), func.concat(User.first_name, " ", User.last_name), func.count()
+            ).select_from(matched).join(User, User.id == matched.c.uploader_id).where(
+                other_filters("uploaders")
+            ).group_by(User.id, User.first_name, User.last_name),
+            select(
+                literal("departments"), cast(Department.id, String), Department.name, func.count()
+            ).select_from(matched).join(Department, Department.id == matched.c.department_id).where(
+                other_filters("departments")
+            ).group_by(Department.id, Department.name),
+            select(
+                literal("permission_levels"), cast(matched.c.permission_level, String), cast(matched.c.permission_level, String), func.count()
+            ).select_from(matched).where(other_filters("permission_levels")).group_by(matched.c.permission_level)
+        )
+
+        facets = {"total": 0, "tags": [], "uploaders": [], "departments": [], "permission_levels": []}
+        for facet, value, label, count in db.execute(facet_query).all():
+            if facet == "total":
+                facets["total"] = count
+            else:
+                facets[facet].append({"value": value, "label": label, "count": count})
+
+        for facet in ("tags", "uploaders", "departments", "permission_levels"):
+            facets[facet].sort(key=lambda entry: (-entry["count"], entry["label"].lower()))
+            del facets[facet][settings.SEARCH_FACET_LIMIT:]
+
+        if cache_key:
+            CacheService.set(cache_key, facets, ttl=300)
+
+        return facets
+
+    @staticmethod
+    def parse_sort_key(sort_by: str, key):
+        if sort_by in ("created_at", "updated_at"):
+            return datetime.fromisoformat(key)
+        return key
+
+    @staticmethod
+    def window_entries(window: dict, sort_by: str) -> List[tuple]:
+        return [
+            ((DocumentService.parse_sort_key(sort_by, key), UUID(item["id"])), item)
+            for item, key in zip(window["items"], window["keys"])
+        ]
 
     @staticmethod
     def get_document_versions(
         db: Session,
-        user: User,
-        document_id: UUID
-    ) -> List[DocumentVersion]:
+        user: Principal,
+        document_id: UUID,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[DocumentVersion], Optional[str]]:
         document = db.query(Document).filter(Document.id == document_id).first()
 
         if not document:
@@ -275,16 +904,49 @@ class DocumentService:
                 detail="Not enough permissions"
             )
 
-        versions = db.query(DocumentVersion).filter(
+        query = db.query(DocumentVersion).options(
+            joinedload(DocumentVersion.uploaded_by_user)
+        ).filter(
             DocumentVersion.document_id == document_id
-        ).order_by(desc(DocumentVersion.version_number)).all()
+        )
+
+        if cursor:
+            before_version = decode_cursor(cursor, "version_number")["version_number"]
+            if not isinstance(before_version, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            query = query.filter(DocumentVersion.version_number < before_version)
+
+        query = query.order_by(desc(DocumentVersion.version_number))
+
+        if not limit:
+            return query.all(), None
 
-        return versions
+        versions = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(versions) > limit:
+            versions = versions[:limit]
+            next_cursor = encode_cursor({"version_number": versions[-1].version_number})
+
+        return versions, next_cursor
+
+    @staticmethod
+    def get_document_versions_response(
+        db: Session,
+        user: Principal,
+        document_id: UUID,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        versions, next_cursor = DocumentService.get_document_versions(db, user, document_id, limit, cursor)
+        return [DocumentService.serialize_version(version) for version in versions], next_cursor
 
     @staticmethod
     def get_document_by_id(
         db: Session,
-        user: User,
+        user: Principal,
         document_id: UUID
     ) -> Document:
         document = db.query(Document).filter(
@@ -306,10 +968,58 @@ class DocumentService:
 
         return document
 
+    @staticmethod
+    def get_document_detail(
+        db: Session,
+        user: Principal,
+        document_id: UUID
+    ) -> Tuple[Document, Optional[DocumentVersion], int]:
+        version_count = select(func.count(DocumentVersion.id)).where(
+            DocumentVersion.document_id == Document.id
+        ).scalar_subquery()
+
+        row = db.query(Document, version_count).options(*DOCUMENT_LOAD_OPTIONS).filter(
+            Document.id == document_id,
+            Document.is_deleted == False
+        ).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+
+        document, count = row
+
+        if not DocumentService.check_access(user, document):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+        latest_version = db.query(DocumentVersion).options(
+            joinedload(DocumentVersion.uploaded_by_user)
+        ).filter(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.version_number == document.current_version
+        ).first()
+
+        return document, latest_version, count
+
+    @staticmethod
+    def get_document_detail_response(db: Session, user: Principal, document_id: UUID) -> dict:
+        document, latest_version, version_count = DocumentService.get_document_detail(db, user, document_id)
+
+        return {
+            **DocumentService.serialize_document(document),
+            "latest_version": DocumentService.serialize_version(latest_version) if latest_version else None,
+            "version_count": version_count
+        }
+
     @staticmethod
     def delete_document(
         db: Session,
-        user: User,
+        user: Principal,
         document_id: UUID
     ) -> bool:
         document = db.query(Document).filter(Document.id == document_id).first()
@@ -320,7 +1030,7 @@ class DocumentService:
                 detail="Document not found"
             )
 
-        if document.uploader_id != user.id and (not user.role or user.role.name != "admin"):
+        if document.uploader_id != user.id and not user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
@@ -328,8 +1038,87 @@ class DocumentService:
 
         document.is_deleted = True
 
-        CacheService.delete_pattern(f"search:*")
+        cache_scopes = DocumentService.document_cache_scopes(document)
 
         db.commit()
+        CacheService.bump_generations(cache_scopes)
+
+        return True
+
+    @staticmethod
+    def filter_visibility(user: Principal):
+        return or_(
+            Document.permission_level == PermissionLevel.PUBLIC,
+            and_(
+                Document.permission_level == PermissionLevel.DEPARTMENT,
+                Document.department_id == user.department_id
+            ),
+            and_(
+                Document.permission_level == PermissionLevel.RESTRICTED,
+                Document.uploader_id == user.id
+            ),
+            Document.uploader_id == user.id
+        )
+
+    @staticmethod
+    def get_available_tags(db: Session, user: Principal) -> List[str]:
+        query = db.query(distinct(Tag.name)).join(DocumentTag).join(Document).filter(
+            Document.is_deleted == False
+        )
+
+        if not user.is_admin:
+            query = query.filter(DocumentService.filter_visibility(user))
+
+        return sorted(tag[0] for tag in query.all())
+
+    @staticmethod
+    def get_available_uploaders(db: Session, user: Principal) -> List[dict]:
+        query = db.query(distinct(User.id), User.first_name, User.last_name, User.email).join(
+            Document, User.id == Document.uploader_id
+        ).filter(
+            Document.is_deleted == False
+        )
+
+        if not user.is_admin:
+            query = query.filter(DocumentService.filter_visibility(user))
 
+        return [
+            {
+                "id": str(user_id),
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email
+            }
+            for user_id, first_name, last_name, email in query.all()
+        ]
+
+
+def render_columns_changed(obj) -> bool:
+    state = inspect(obj)
+    if state.deleted or state.was_deleted:
         return True
+    return any(state.attrs[column].history.has_changes() for column in RENDERED_COLUMNS[type(obj)])
+
+
+@event.listens_for(Session, "after_flush")
+def track_search_render_changes(session, flush_context):
+    changed = [
+        obj for obj in session.dirty | session.deleted
+        if type(obj) in RENDERED_COLUMNS and render_columns_changed(obj)
+    ]
+    if changed:
+        session.info["search_render_stale"] = True
+    if any(isinstance(obj, Tag) for obj in changed):
+        with tag_ids_cache_lock:
+            tag_ids_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_search_render_cache(session):
+    if session.info.pop("search_render_stale", False):
+        CacheService.bump_generations(["search:render"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_search_render_changes(session, previous_transaction):
+    session.info.pop("search_render_stale", None)
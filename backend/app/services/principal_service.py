@@ -0,0 +1,130 @@
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import event
+from typing import List, Optional
+from uuid import UUID
+from collections import OrderedDict
+import threading
+import time
+from app.models.user import User
+from app.models.role import Role
+from app.schemas.auth import Principal
+from app.core.config import settings
+from app.services.cache_service import CacheService
+
+principals = OrderedDict()
+principals_lock = threading.Lock()
+principals_epoch = {"value": 0}
+
+
+class PrincipalService:
+    @staticmethod
+    def generation_scopes(user_id: UUID) -> List[str]:
+        return ["principals", f"principal:{user_id}"]
+
+    @staticmethod
+    def cache_key(user_id: UUID, generations: List[int]) -> str:
+        return f"principal:{user_id}:{'.'.join(str(generation) for generation in generations)}"
+
+    @staticmethod
+    def from_user(user: User) -> Principal:
+        return Principal(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            department_id=user.department_id,
+            role_name=user.role.name if user.role else None,
+            is_active=bool(user.is_active)
+        )
+
+    @staticmethod
+    def get_cached(user_id: UUID) -> Optional[Principal]:
+        with principals_lock:
+            entry = principals.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                del principals[user_id]
+                return None
+            principals.move_to_end(user_id)
+            return principal
+
+    @staticmethod
+    def remember(principal: Principal, epoch: int) -> None:
+        expires_at = time.monotonic() + settings.PRINCIPAL_LOCAL_CACHE_TTL_SECONDS
+        with principals_lock:
+            if principals_epoch["value"] != epoch:
+                return
+            principals[principal.id] = (principal, expires_at)
+            principals.move_to_end(principal.id)
+            while len(principals) > settings.PRINCIPAL_LOCAL_CACHE_MAX_SIZE:
+                principals.popitem(last=False)
+
+    @staticmethod
+    def load(db: Session, user_id: UUID) -> Optional[Principal]:
+        # The epoch and generations are read before the user row, so a load that
+        # races an invalidation neither repopulates the local cache nor writes
+        # under a Redis key that later requests still read.
+        with principals_lock:
+            epoch = principals_epoch["value"]
+        generations = CacheService.get_generations(PrincipalService.generation_scopes(user_id))
+        cache_key = PrincipalService.cache_key(user_id, generations) if generations is not None else None
+
+        cached = CacheService.get(cache_key) if cache_key else None
+        if cached:
+            principal = Principal(**cached)
+        else:
+            user = db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
+            if user is None:
+                return None
+            principal = PrincipalService.from_user(user)
+            if cache_key:
+                CacheService.set(
+                    cache_key,
+                    principal.model_dump(mode="json"),
+                    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+                )
+
+        PrincipalService.remember(principal, epoch)
+        return principal
+
+    @staticmethod
+    def invalidate(user_id: UUID) -> None:
+        with principals_lock:
+            principals_epoch["value"] += 1
+            principals.pop(user_id, None)
+        CacheService.bump_generations([f"principal:{user_id}"])
+
+    @staticmethod
+    def invalidate_all() -> None:
+        with principals_lock:
+            principals_epoch["value"] += 1
+            principals.clear()
+        CacheService.bump_generations(["principals"])
+
+
+@event.listens_for(Session, "after_flush")
+def track_principal_changes(session, flush_context):
+    changed = session.dirty | session.deleted
+    for obj in changed:
+        if isinstance(obj, User):
+            session.info.setdefault("stale_principals", set()).add(obj.id)
+        elif isinstance(obj, Role):
+            session.info["stale_all_principals"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_principal_cache(session):
+    user_ids = session.info.pop("stale_principals", set())
+    if session.info.pop("stale_all_principals", False):
+        PrincipalService.invalidate_all()
+        return
+    for user_id in user_ids:
+        PrincipalService.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_principal_changes(session, previous_transaction):
+    session.info.pop("stale_principals", None)
+    session.info.pop("stale_all_principals", None)
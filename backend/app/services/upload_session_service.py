@@ -0,0 +1,322 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from fastapi import HTTPException, status
+from typing import List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+import os
+import shutil
+import hashlib
+import threading
+import time
+from app.models.upload_session import UploadSession, UploadSessionChunk
+from app.models.document_version import DocumentVersion
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentCreate
+from app.schemas.upload import UploadSessionCreate
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.blob_service import BlobService
+from app.services.document_service import DocumentService
+
+DISCARDED_UPLOAD_SESSIONS = "discarded_upload_sessions"
+
+hash_states = {}
+hash_states_lock = threading.Lock()
+
+
+class UploadSessionService:
+    @staticmethod
+    def session_path(session_id: UUID) -> str:
+        return os.path.join(settings.UPLOAD_DIR, "sessions", f"{session_id}.part")
+
+    @staticmethod
+    def open_session_file(session_id: UUID, mode: str):
+        try:
+            return open(UploadSessionService.session_path(session_id), mode)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+
+    @staticmethod
+    def stage_session_file(session_id: UUID) -> str:
+        # The session file stays in place until the completing transaction
+        # commits, so a failed insert or commit can be retried.
+        session_path = UploadSessionService.session_path(session_id)
+        temp_path = os.path.join(BlobService.temp_dir(), str(uuid4()))
+        try:
+            os.link(session_path, temp_path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+        except OSError:
+            shutil.copyfile(session_path, temp_path)
+        return temp_path
+
+    @staticmethod
+    def create_session(db: Session, user: Principal, data: UploadSessionCreate) -> UploadSession:
+        if data.total_size > settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the maximum upload size of {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+
+        if data.document_id:
+            DocumentService.get_document_for_update(db, user, data.document_id)
+        else:
+            if not data.title:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="A title is required for a new document"
+                )
+            DocumentService.validate_file_extension(data.file_name)
+            DocumentService.validate_document_data(DocumentCreate(
+                title=data.title,
+                permission_level=data.permission_level,
+                tags=data.tags
+            ))
+
+        session = UploadSession(
+            user_id=user.id,
+            document_id=data.document_id,
+            file_name=data.file_name,
+            mime_type=data.mime_type,
+            total_size=data.total_size,
+            chunk_size=settings.UPLOAD_SESSION_CHUNK_SIZE,
+            document_metadata={
+                "title": data.title,
+                "description": data.description,
+                "permission_level": data.permission_level,
+                "tags": data.tags,
+                "change_notes": data.change_notes
+            },
+            expires_at=datetime.utcnow() + timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+        )
+        db.add(session)
+        db.flush()
+
+        session_path = UploadSessionService.session_path(session.id)
+        os.makedirs(os.path.dirname(session_path), exist_ok=True)
+        with open(session_path, "wb") as buffer:
+            buffer.truncate(data.total_size)
+
+        db.commit()
+        db.refresh(session)
+        return session
+
+    @staticmethod
+    def get_session(db: Session, user: Principal, session_id: UUID, for_update: bool = False) -> UploadSession:
+        query = db.query(UploadSession).filter(
+            UploadSession.id == session_id,
+            UploadSession.user_id == user.id,
+            UploadSession.expires_at > datetime.utcnow()
+        )
+        if for_update:
+            query = query.with_for_update()
+
+        session = query.first()
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+        return session
+
+    @staticmethod
+    def received_chunks(db: Session, session: UploadSession) -> List[Tuple[int, int]]:
+        return db.query(UploadSessionChunk.chunk_index, UploadSessionChunk.chunk_size).filter(
+            UploadSessionChunk.session_id == session.id
+        ).order_by(UploadSessionChunk.chunk_index).all()
+
+    @staticmethod
+    def describe(db: Session, session: UploadSession) -> dict:
+        received = UploadSessionService.received_chunks(db, session)
+        return {
+            "id": session.id,
+            "document_id": session.document_id,
+            "file_name": session.file_name,
+            "total_size": session.total_size,
+            "chunk_size": session.chunk_size,
+            "total_chunks": session.total_chunks,
+            "received_chunks": [chunk_index for chunk_index, _ in received],
+            "received_bytes": sum(chunk_size for _, chunk_size in received),
+            "expires_at": session.expires_at.timestamp()
+        }
+
+    @staticmethod
+    def write_chunk(db: Session, user: Principal, session_id: UUID, chunk_index: int, data: bytes) -> dict:
+        session = UploadSessionService.get_session(db, user, session_id)
+
+        if not 0 <= chunk_index < session.total_chunks:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk index must be between 0 and {session.total_chunks - 1}"
+            )
+
+        expected_size = min(session.chunk_size, session.total_size - chunk_index * session.chunk_size)
+        if len(data) != expected_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk {chunk_index} must be exactly {expected_size} bytes"
+            )
+
+        received = {index for index, _ in UploadSessionService.received_chunks(db, session)}
+        if chunk_index not in received:
+            with UploadSessionService.open_session_file(session.id, "r+b") as buffer:
+                buffer.seek(chunk_index * session.chunk_size)
+                buffer.write(data)
+
+            db.execute(
+                insert(UploadSessionChunk).values(
+                    session_id=session.id,
+                    chunk_index=chunk_index,
+                    chunk_size=len(data)
+                ).on_conflict_do_nothing(index_elements=["session_id", "chunk_index"])
+            )
+            db.commit()
+            received.add(chunk_index)
+
+        UploadSessionService.advance_hash(session, received)
+
+        return UploadSessionService.describe(db, session)
+
+    @staticmethod
+    def evict_expired_hash_states() -> None:
+        # Sessions are completed, aborted or swept by whichever worker gets the
+        # request, so every worker drops its own states once they expire.
+        now = time.time()
+        with hash_states_lock:
+            for session_id in [session_id for session_id, state in hash_states.items() if state["expires_at"] <= now]:
+                del hash_states[session_id]
+
+    @staticmethod
+    def advance_hash(session: UploadSession, received: Set[int], blocking: bool = False) -> Optional[dict]:
+        UploadSessionService.evict_expired_hash_states()
+        with hash_states_lock:
+            state = hash_states.setdefault(session.id, {
+                "hasher": hashlib.sha256(),
+                "next_chunk": 0,
+                "lock": threading.Lock(),
+                "expires_at": session.expires_at.timestamp()
+            })
+
+        if not state["lock"].acquire(blocking=blocking):
+            return None
+
+        try:
+            with UploadSessionService.open_session_file(session.id, "rb") as buffer:
+                buffer.seek(state["next_chunk"] * session.chunk_size)
+                while state["next_chunk"] in received:
+                    state["hasher"].update(buffer.read(session.chunk_size))
+                    state["next_chunk"] += 1
+        finally:
+            state["lock"].release()
+
+        return state
+
+    @staticmethod
+    def complete_session(db: Session, user: Principal, session_id: UUID) -> DocumentVersion:
+        session = UploadSessionService.get_session(db, user, session_id, for_update=True)
+
+        received = {index for index, _ in UploadSessionService.received_chunks(db, session)}
+        missing = [index for index in range(session.total_chunks) if index not in received]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Missing chunks: {missing[:100]}"
+            )
+
+        state = UploadSessionService.advance_hash(session, received, blocking=True)
+        checksum = state["hasher"].hexdigest()
+
+        document, base_checksum = None, None
+        if session.document_id:
+            document = DocumentService.get_document_for_update(db, user, session.document_id)
+            base_checksum = DocumentService.delta_base_checksum(db, document, session.file_name)
+
+        stored_file = (
+            BlobService.store(
+                db, UploadSessionService.stage_session_file(session.id), checksum, session.total_size, base_checksum,
+                DocumentService.compression_encoding(session.file_name)
+            ),
+            checksum,
+            session.total_size
+        )
+
+        metadata = session.document_metadata or {}
+        file_name, mime_type = session.file_name, session.mime_type
+        UploadSessionService.discard_on_commit(db, session.id)
+        db.delete(session)
+
+        if document:
+            return DocumentService.add_document_version(
+                db, user, document, file_name, mime_type, stored_file, metadata.get("change_notes")
+            )
+
+        document_data = DocumentCreate(
+            title=metadata["title"],
+            description=metadata.get("description"),
+            permission_level=metadata.get("permission_level") or "department",
+            tags=metadata.get("tags") or []
+        )
+        document = DocumentService.create_document_from_file(
+            db, user, document_data, file_name, mime_type, stored_file
+        )
+        return db.query(DocumentVersion).filter(
+            DocumentVersion.document_id == document.id,
+            DocumentVersion.version_number == document.current_version
+        ).one()
+
+    @staticmethod
+    def abort_session(db: Session, user: Principal, session_id: UUID) -> None:
+        session = UploadSessionService.get_session(db, user, session_id, for_update=True)
+        UploadSessionService.discard_on_commit(db, session.id)
+        db.delete(session)
+        db.commit()
+
+    @staticmethod
+    def discard_on_commit(db: Session, session_id: UUID) -> None:
+        db.info.setdefault(DISCARDED_UPLOAD_SESSIONS, []).append(session_id)
+
+    @staticmethod
+    def discard(session_id: UUID) -> None:
+        with hash_states_lock:
+            hash_states.pop(session_id, None)
+        try:
+            os.remove(UploadSessionService.session_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def remove_expired_sessions() -> int:
+        UploadSessionService.evict_expired_hash_states()
+        db = SessionLocal()
+        try:
+            expired = db.query(UploadSession).filter(
+                UploadSession.expires_at <= datetime.utcnow()
+            ).with_for_update(skip_locked=True).all()
+
+            for session in expired:
+                UploadSessionService.discard_on_commit(db, session.id)
+                db.delete(session)
+
+            db.commit()
+            return len(expired)
+        finally:
+            db.close()
+
+
+@event.listens_for(Session, "after_commit")
+def discard_completed_sessions(session):
+    for session_id in session.info.pop(DISCARDED_UPLOAD_SESSIONS, []):
+        UploadSessionService.discard(session_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def keep_uncommitted_sessions(session, previous_transaction):
+    session.info.pop(DISCARDED_UPLOAD_SESSIONS, None)
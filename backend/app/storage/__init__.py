@@ -0,0 +1,28 @@
+from functools import lru_cache
+from app.core.config import settings
+from app.storage.base import StorageBackend, StorageReader
+from app.storage.local import LocalStorageBackend
+from app.storage.s3 import S3StorageBackend
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageBackend(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY
+        )
+    return LocalStorageBackend(settings.STORAGE_LOCAL_ROOT or settings.UPLOAD_DIR)
+
+
+__all__ = [
+    "StorageBackend",
+    "StorageReader",
+    "LocalStorageBackend",
+    "S3StorageBackend",
+    "get_storage"
+]
@@ -0,0 +1,29 @@
+from typing import Iterator, Optional
+
+
+class StorageReader:
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def open_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def content_encoding(self, key: str) -> Optional[str]:
+        return None
+
+    def raw_backend(self) -> "StorageReader":
+        return self
+
+
+class StorageBackend(StorageReader):
+    def put_file(self, key: str, source_path: str) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
@@ -0,0 +1,126 @@
+import tempfile
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+from app.storage.base import StorageReader
+
+READ_CHUNK_SIZE = 1048576
+RETAIN_MEMORY_LIMIT = 8388608
+WINDOW_BITS = {"gzip": 31}
+
+
+def compress_file(source_path: str, target_path: str, encoding: str, level: int) -> int:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WINDOW_BITS[encoding])
+    written = 0
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        while chunk := source.read(READ_CHUNK_SIZE):
+            data = compressor.compress(chunk)
+            target.write(data)
+            written += len(data)
+        data = compressor.flush()
+        target.write(data)
+        written += len(data)
+    return written
+
+
+def compression_ratio(sample: bytes, encoding: str, level: int) -> float:
+    if not sample:
+        return 1.0
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WINDOW_BITS[encoding])
+    return len(compressor.compress(sample) + compressor.flush()) / len(sample)
+
+
+class DecompressionCursor:
+    def __init__(self, chunks: Iterator[bytes], encoding: str, retain: bool = False):
+        self.chunks = chunks
+        self.decompressor = zlib.decompressobj(WINDOW_BITS[encoding])
+        self.position = 0
+        self.pending = b""
+        self.retained = tempfile.SpooledTemporaryFile(max_size=RETAIN_MEMORY_LIMIT) if retain else None
+
+    def next_block(self) -> bytes:
+        while True:
+            data = self.decompressor.unconsumed_tail
+            if not data:
+                data = next(self.chunks, None)
+                if data is None:
+                    return self.decompressor.flush()
+            block = self.decompressor.decompress(data, READ_CHUNK_SIZE)
+            if block:
+                return block
+
+    def read(self, start: int, end: int) -> Iterator[bytes]:
+        if self.retained is not None and start < self.position:
+            retained_end = min(end + 1, self.position)
+            for offset in range(start, retained_end, READ_CHUNK_SIZE):
+                self.retained.seek(offset)
+                yield self.retained.read(min(READ_CHUNK_SIZE, retained_end - offset))
+            start = retained_end
+
+        while self.position <= end:
+            if not self.pending:
+                self.pending = self.next_block()
+                if not self.pending:
+                    return
+            block_end = self.position + len(self.pending)
+            if block_end <= start:
+                self.advance(len(self.pending))
+                continue
+            first = max(start - self.position, 0)
+            last = min(end + 1 - self.position, len(self.pending))
+            yield self.pending[first:last]
+            self.advance(last)
+
+    def advance(self, length: int) -> None:
+        if self.retained is not None:
+            self.retained.seek(self.position)
+            self.retained.write(self.pending[:length])
+        self.position += length
+        self.pending = self.pending[length:]
+
+
+class CompressedStorage(StorageReader):
+    def __init__(self, storage: StorageReader, encodings: Dict[str, Tuple[str, int]], retain: bool = False):
+        self.storage = storage
+        self.encodings = encodings
+        self.retain = retain
+        self.cursors: Dict[str, DecompressionCursor] = {}
+
+    def exists(self, key: str) -> bool:
+        return self.storage.exists(key)
+
+    def size(self, key: str) -> int:
+        if key in self.encodings:
+            return self.encodings[key][1]
+        return self.storage.size(key)
+
+    def content_encoding(self, key: str) -> Optional[str]:
+        if key in self.encodings:
+            return self.encodings[key][0]
+        return self.storage.content_encoding(key)
+
+    def open_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        if key not in self.encodings:
+            yield from self.storage.open_range(key, start, end)
+            return
+
+        # Compressed objects can only be read forward, so a cursor left at the
+        # end of the previous read serves the next one when offsets ascend. Delta
+        # segments can jump back into a snapshot when content moves, so snapshot
+        # views retain what they have decoded instead of starting over, spilling
+        # to a temporary file past RETAIN_MEMORY_LIMIT.
+        cursor = self.cursors.pop(key, None)
+        if cursor is None or (cursor.position > start and cursor.retained is None):
+            encoding, _ = self.encodings[key]
+            cursor = DecompressionCursor(
+                self.storage.open_range(key, 0, self.storage.size(key) - 1), encoding, self.retain
+            )
+        yield from cursor.read(start, end)
+        self.cursors[key] = cursor
+
+    def local_path(self, key: str) -> Optional[str]:
+        if key in self.encodings:
+            return None
+        return self.storage.local_path(key)
+
+    def raw_backend(self) -> StorageReader:
+        return self.storage
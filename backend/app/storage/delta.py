@@ -0,0 +1,228 @@
+import hashlib
+import re
+import shutil
+import struct
+import tempfile
+import zlib
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.storage.base import StorageReader
+
+MAGIC = b"DLT1"
+HEADER = struct.Struct(">4sQQI")
+OP = struct.Struct(">BQQ")
+COPY = 0
+LITERAL = 1
+
+READ_CHUNK_SIZE = 1048576
+MAX_CHUNK_SIZE = 65536
+LINE_GROUP = 16
+ZIP_SIGNATURE = b"PK\x03\x04"
+ZIP_RECORD = re.compile(rb"PK\x03\x04|PK\x01\x02")
+
+
+def iter_chunks(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    # Zip containers (.docx, .xlsx) are cut at member headers so unchanged
+    # members match even when earlier ones change size; everything else is cut
+    # after lines whose CRC selects them, which keeps boundaries stable across
+    # inserted or removed lines and identical between processes. Input is
+    # consumed block by block, so neither side of a delta is held in memory.
+    blocks = iter(blocks)
+    data = bytearray()
+    zip_mode = None
+    scanned = 0
+    line_crc = 0
+    final = False
+    while not final:
+        block = next(blocks, None)
+        final = block is None
+        if block:
+            data += block
+        if zip_mode is None:
+            if len(data) < len(ZIP_SIGNATURE) and not final:
+                continue
+            zip_mode = data.startswith(ZIP_SIGNATURE)
+            scanned = 1 if zip_mode else 0
+
+        anchors = []
+        if zip_mode:
+            limit = len(data) if final else len(data) - len(ZIP_SIGNATURE) + 1
+            for match in ZIP_RECORD.finditer(data, scanned):
+                if match.start() >= limit:
+                    break
+                anchors.append(match.start())
+            scanned = max(scanned, limit)
+        else:
+            with memoryview(data) as view:
+                while True:
+                    newline = data.find(b"\n", scanned)
+                    if newline < 0:
+                        line_crc = zlib.crc32(view[scanned:], line_crc)
+                        break
+                    line_crc = zlib.crc32(view[scanned:newline], line_crc)
+                    if line_crc % LINE_GROUP == 0:
+                        anchors.append(newline + 1)
+                    line_crc = 0
+                    scanned = newline + 1
+            scanned = len(data)
+
+        # A boundary further than MAX_CHUNK_SIZE past the last one is only cut
+        # once no anchor can still appear before it.
+        ends = []
+        start = 0
+        for anchor in anchors + ([len(data)] if final else []):
+            while anchor - start > MAX_CHUNK_SIZE:
+                start += MAX_CHUNK_SIZE
+                ends.append(start)
+            if anchor > start:
+                ends.append(anchor)
+                start = anchor
+        while not final and len(data) - start > MAX_CHUNK_SIZE + len(ZIP_SIGNATURE):
+            start += MAX_CHUNK_SIZE
+            ends.append(start)
+
+        previous = 0
+        for end in ends:
+            yield bytes(data[previous:end])
+            previous = end
+        del data[:start]
+        scanned -= start
+
+
+def chunk_ends(data: bytes) -> List[int]:
+    ends = []
+    position = 0
+    for chunk in iter_chunks([data]):
+        position += len(chunk)
+        ends.append(position)
+    return ends
+
+
+def encode_delta(base: Iterable[bytes], target: Iterable[bytes], delta_path: str) -> int:
+    base_offsets = {}
+    base_size = 0
+    for chunk in iter_chunks(base):
+        base_offsets.setdefault(hashlib.sha256(chunk).digest(), base_size)
+        base_size += len(chunk)
+
+    ops = []
+    literal_size = 0
+    target_size = 0
+    with tempfile.TemporaryFile() as literals:
+        for chunk in iter_chunks(target):
+            offset = base_offsets.get(hashlib.sha256(chunk).digest())
+            if offset is None:
+                if ops and ops[-1][0] == LITERAL:
+                    ops[-1][2] += len(chunk)
+                else:
+                    ops.append([LITERAL, literal_size, len(chunk)])
+                literals.write(chunk)
+                literal_size += len(chunk)
+            elif ops and ops[-1][0] == COPY and ops[-1][1] + ops[-1][2] == offset:
+                ops[-1][2] += len(chunk)
+            else:
+                ops.append([COPY, offset, len(chunk)])
+            target_size += len(chunk)
+
+        literals.seek(0)
+        with open(delta_path, "wb") as delta:
+            delta.write(HEADER.pack(MAGIC, base_size, target_size, len(ops)))
+            for kind, offset, length in ops:
+                delta.write(OP.pack(kind, offset, length))
+            shutil.copyfileobj(literals, delta, READ_CHUNK_SIZE)
+
+    return literal_size
+
+
+def read_delta_ops(storage: StorageReader, key: str) -> Tuple[int, int, List[Tuple[int, int, int]]]:
+    header = b"".join(storage.open_range(key, 0, HEADER.size - 1))
+    magic, _, target_size, op_count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{key} is not a delta object")
+
+    data_offset = HEADER.size + op_count * OP.size
+    table = b"".join(storage.open_range(key, HEADER.size, data_offset - 1)) if op_count else b""
+    ops = [OP.unpack_from(table, index * OP.size) for index in range(op_count)]
+    return data_offset, target_size, ops
+
+
+class DeltaVersionStorage(StorageReader):
+    def __init__(self, storage: StorageReader, key: str, snapshot_key: str, snapshot_size: int, delta_keys: List[str]):
+        self.storage = storage
+        self.key = key
+        self.snapshot_key = snapshot_key
+        self.snapshot_size = snapshot_size
+        self.delta_keys = delta_keys
+        self.starts: Optional[List[int]] = None
+        self.segments: List[Tuple[str, int, int]] = []
+        self.total_size = snapshot_size
+
+    def resolve(self) -> None:
+        if self.starts is not None:
+            return
+
+        starts = [0] if self.snapshot_size else []
+        segments = [(self.snapshot_key, 0, self.snapshot_size)] if self.snapshot_size else []
+        total_size = self.snapshot_size
+
+        # Each delta copies ranges of the version before it; mapping those ranges
+        # through the previous segment list flattens the chain into reads of the
+        # snapshot and of literal sections only.
+        for delta_key in self.delta_keys:
+            data_offset, total_size, ops = read_delta_ops(self.storage, delta_key)
+            new_starts, new_segments = [], []
+            position = 0
+
+            def append(key: str, offset: int, length: int) -> None:
+                if new_segments:
+                    last_key, last_offset, last_length = new_segments[-1]
+                    if last_key == key and last_offset + last_length == offset:
+                        new_segments[-1] = (key, last_offset, last_length + length)
+                        return
+                new_starts.append(position)
+                new_segments.append((key, offset, length))
+
+            for kind, offset, length in ops:
+                if kind == LITERAL:
+                    append(delta_key, data_offset + offset, length)
+                    position += length
+                    continue
+                index = bisect_right(starts, offset) - 1
+                while length > 0:
+                    segment_key, segment_offset, segment_length = segments[index]
+                    skip = offset - starts[index]
+                    take = min(length, segment_length - skip)
+                    append(segment_key, segment_offset + skip, take)
+                    position += take
+                    offset += take
+                    length -= take
+                    index += 1
+
+            starts, segments = new_starts, new_segments
+
+        self.starts, self.segments, self.total_size = starts, segments, total_size
+
+    def exists(self, key: str) -> bool:
+        return all(self.storage.exists(part) for part in [self.snapshot_key] + self.delta_keys)
+
+    def size(self, key: str) -> int:
+        self.resolve()
+        return self.total_size
+
+    def open_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        self.resolve()
+        buffer = bytearray()
+        index = max(bisect_right(self.starts, start) - 1, 0)
+        while index < len(self.segments) and self.starts[index] <= end:
+            segment_key, segment_offset, segment_length = self.segments[index]
+            segment_start = self.starts[index]
+            first = max(start, segment_start) - segment_start
+            last = min(end, segment_start + segment_length - 1) - segment_start
+            for chunk in self.storage.open_range(segment_key, segment_offset + first, segment_offset + last):
+                buffer += chunk
+                if len(buffer) >= READ_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+            index += 1
+        if buffer:
+            yield bytes(buffer)
@@ -0,0 +1,70 @@
+import os
+from typing import Iterator, Optional
+from app.storage.base import StorageBackend
+
+READ_CHUNK_SIZE = 1048576
+
+
+class S3StorageBackend(StorageBackend):
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None
+    ):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("The s3 storage backend requires boto3") from e
+
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region_name or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None
+        )
+        self.client_error = ClientError
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, key: str, source_path: str) -> None:
+        self.client.upload_file(source_path, self.bucket, self.object_key(key))
+        os.remove(source_path)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except self.client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))["ContentLength"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def open_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        # Empty objects are read as (0, -1), which S3 rejects as a Range header.
+        if end < start:
+            return
+        response = self.client.get_object(
+            Bucket=self.bucket,
+            Key=self.object_key(key),
+            Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size=READ_CHUNK_SIZE)
+        finally:
+            body.close()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+os.environ.setdefault("REDIS_URL", "redis://localhost")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_EMAIL = "bench-user-{}@example.com"
+
+VOCABULARY = (
+    "report quarterly annual budget forecast revenue expense audit compliance policy "
+    "contract agreement amendment invoice payroll benefits onboarding training handbook "
+    "security incident review architecture design specification roadmap release migration "
+    "database network infrastructure deployment monitoring performance capacity planning "
+    "marketing campaign brand launch customer survey feedback analysis strategy proposal "
+    "legal litigation settlement trademark patent license vendor procurement tender "
+    "hiring interview evaluation promotion retention diversity wellness safety "
+    "finance treasury tax ledger reconciliation statement balance cash flow investment "
+    "engineering prototype testing quality defect backlog sprint retrospective summary "
+    "minutes meeting board committee charter governance risk register assessment "
+    "regional global europe asia america north south east west internal external draft final"
+).split()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(samples):
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+def zipf_weights(count, exponent):
+    weights = []
+    total = 0.0
+    for rank in range(1, count + 1):
+        total += 1.0 / rank ** exponent
+        weights.append(total)
+    return weights
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,229 @@
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+
+from benchmarks.common import VOCABULARY, git_commit, latency_summary
+
+from app.core.config import settings
+from app.storage.delta import DeltaVersionStorage, encode_delta
+from app.storage.local import LocalStorageBackend
+
+EXTENSIONS = (".xlsx", ".docx", ".csv", ".txt")
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def csv_row(rng, index):
+    return f"{index},{rng.choice(VOCABULARY)},{sentence(rng, 4)},{rng.randint(0, 10 ** 6)},{rng.random():.4f}"
+
+
+def sheet_xml(rows):
+    cells = "".join(
+        f'<row r="{index + 1}">' + "".join(f'<c t="inlineStr"><is><t>{value}</t></is></c>' for value in row.split(",")) + "</row>"
+        for index, row in enumerate(rows)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><worksheet><sheetData>{cells}</sheetData></worksheet>'
+
+
+def zip_archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class Workload:
+    def __init__(self, extension, target_size, edit_fraction, rng):
+        self.extension = extension
+        self.edit_fraction = edit_fraction
+        self.rng = rng
+        if extension in (".csv", ".txt"):
+            self.lines = []
+            size = 0
+            while size < target_size:
+                self.lines.append(self.new_line(len(self.lines)))
+                size += len(self.lines[-1]) + 1
+        else:
+            self.parts = []
+            self.part_lines = max(1, target_size // (8 * 120))
+            for _ in range(8):
+                self.parts.append([self.new_line(index) for index in range(self.part_lines)])
+
+    def new_line(self, index):
+        if self.extension in (".csv", ".xlsx"):
+            return csv_row(self.rng, index)
+        return sentence(self.rng, self.rng.randint(6, 20))
+
+    def edit_lines(self, lines):
+        for _ in range(max(1, int(len(lines) * self.edit_fraction))):
+            lines[self.rng.randrange(len(lines))] = self.new_line(len(lines))
+        lines.insert(self.rng.randrange(len(lines)), self.new_line(len(lines)))
+        del lines[self.rng.randrange(len(lines))]
+
+    def edit(self):
+        if self.extension in (".csv", ".txt"):
+            self.edit_lines(self.lines)
+        else:
+            self.edit_lines(self.rng.choice(self.parts))
+
+    def render(self, version):
+        if self.extension in (".csv", ".txt"):
+            return ("\n".join(self.lines) + "\n").encode()
+
+        core = f"<coreProperties><revision>{version}</revision><modified>{datetime.now(timezone.utc).isoformat()}</modified></coreProperties>"
+        if self.extension == ".xlsx":
+            members = {
+                "[Content_Types].xml": "<Types/>",
+                "docProps/core.xml": core,
+                "xl/workbook.xml": "<workbook><sheets>" + "".join(f'<sheet name="Sheet{i + 1}"/>' for i in range(len(self.parts))) + "</sheets></workbook>",
+                "xl/styles.xml": "<styleSheet>" + "<xf/>" * 2000 + "</styleSheet>",
+            }
+            for index, rows in enumerate(self.parts):
+                members[f"xl/worksheets/sheet{index + 1}.xml"] = sheet_xml(rows)
+            return zip_archive(members)
+
+        body = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for rows in self.parts for line in rows)
+        return zip_archive({
+            "[Content_Types].xml": "<Types/>",
+            "docProps/core.xml": core,
+            "word/styles.xml": "<w:styles>" + "<w:style/>" * 2000 + "</w:styles>",
+            "word/document.xml": f"<w:document><w:body>{body}</w:body></w:document>",
+        })
+
+
+def read_all(storage, key):
+    return b"".join(storage.open_range(key, 0, storage.size(key) - 1))
+
+
+def run_extension(extension, args, root):
+    rng = random.Random(f"{args.seed}-{extension}")
+    workload = Workload(extension, args.size, args.edit_fraction, rng)
+    backend = LocalStorageBackend(os.path.join(root, extension.lstrip(".")))
+
+    staged = os.path.join(root, "staged")
+    chain = None
+    versions = []
+    encode_seconds = []
+    full_bytes = 0
+    stored_bytes = 0
+    snapshots = 0
+
+    for version in range(1, args.versions + 1):
+        if version > 1:
+            workload.edit()
+        content = workload.render(version)
+        full_bytes += len(content)
+        key = f"v{version}"
+
+        stored_as_delta = False
+        if chain is not None and len(chain["deltas"]) < settings.DELTA_MAX_CHAIN_LENGTH:
+            started = time.perf_counter()
+            previous = versions[-1]
+            encode_delta([read_all(previous, previous.key)], [content], staged)
+            encode_seconds.append(time.perf_counter() - started)
+            if os.path.getsize(staged) <= len(content) * settings.DELTA_MAX_SIZE_RATIO:
+                stored_bytes += os.path.getsize(staged)
+                backend.put_file(key, staged)
+                chain = {"snapshot": chain["snapshot"], "size": chain["size"], "deltas": chain["deltas"] + [key]}
+                stored_as_delta = True
+
+        if not stored_as_delta:
+            with open(staged, "wb") as buffer:
+                buffer.write(content)
+            stored_bytes += len(content)
+            backend.put_file(key, staged)
+            chain = {"snapshot": key, "size": len(content), "deltas": []}
+            snapshots += 1
+
+        versions.append(DeltaVersionStorage(backend, key, chain["snapshot"], chain["size"], chain["deltas"]))
+        if read_all(versions[-1], key) != content:
+            raise RuntimeError(f"{extension} version {version} did not reconstruct")
+
+    reconstruct_seconds = []
+    chain_reconstruct_seconds = {}
+    for _ in range(args.reads):
+        for version, storage in enumerate(versions, start=1):
+            view = DeltaVersionStorage(storage.storage, storage.key, storage.snapshot_key, storage.snapshot_size, storage.delta_keys)
+            started = time.perf_counter()
+            for _ in view.open_range(view.key, 0, view.size(view.key) - 1):
+                pass
+            elapsed = time.perf_counter() - started
+            reconstruct_seconds.append(elapsed)
+            chain_reconstruct_seconds.setdefault(len(view.delta_keys), []).append(elapsed)
+
+    full_read_seconds = []
+    for version in range(1, min(args.versions, 5) + 1):
+        path = os.path.join(root, "full")
+        with open(path, "wb") as buffer:
+            buffer.write(read_all(versions[version - 1], versions[version - 1].key))
+        started = time.perf_counter()
+        with open(path, "rb") as buffer:
+            while buffer.read(1048576):
+                pass
+        full_read_seconds.append(time.perf_counter() - started)
+
+    return {
+        "extension": extension,
+        "versions": args.versions,
+        "average_file_bytes": full_bytes // args.versions,
+        "full_copy_bytes": full_bytes,
+        "stored_bytes": stored_bytes,
+        "saved_pct": round((1 - stored_bytes / full_bytes) * 100, 2),
+        "snapshots": snapshots,
+        "encode": latency_summary(encode_seconds),
+        "reconstruct": latency_summary(reconstruct_seconds),
+        "reconstruct_by_chain_length": {
+            length: latency_summary(samples)["p50_ms"] for length, samples in sorted(chain_reconstruct_seconds.items())
+        },
+        "full_copy_read": latency_summary(full_read_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare storage saved by delta-encoded versions against reconstruction latency"
+    )
+    parser.add_argument("--extensions", default=",".join(EXTENSIONS))
+    parser.add_argument("--size", type=int, default=4 * 1024 * 1024, help="Approximate bytes per version")
+    parser.add_argument("--versions", type=int, default=24)
+    parser.add_argument("--edit-fraction", type=float, default=0.01, help="Fraction of rows or lines changed per version")
+    parser.add_argument("--reads", type=int, default=3)
+    parser.add_argument("--chain-length", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    if args.chain_length:
+        settings.DELTA_MAX_CHAIN_LENGTH = args.chain_length
+
+    root = tempfile.mkdtemp(prefix="delta-bench-")
+    try:
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "max_chain_length": settings.DELTA_MAX_CHAIN_LENGTH,
+            "max_size_ratio": settings.DELTA_MAX_SIZE_RATIO,
+            "results": [run_extension(extension.strip(), args, root) for extension in args.extensions.split(",")],
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
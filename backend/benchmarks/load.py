@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import BENCH_EMAIL, BENCH_PASSWORD, VOCABULARY, git_commit, latency_summary, zipf_weights
+
+import httpx
+
+SCENARIOS = ("search", "upload", "download", "filters")
+SIZE_SUFFIXES = {"KB": 1024, "MB": 1024 * 1024}
+SORT_FIELDS = ("created_at", "updated_at", "title")
+
+
+def parse_size(value):
+    value = value.strip().upper()
+    for suffix, multiplier in SIZE_SUFFIXES.items():
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * multiplier)
+    return int(value)
+
+
+class LoadContext:
+    def __init__(self, args, rng):
+        self.args = args
+        self.rng = rng
+        self.word_weights = zipf_weights(len(VOCABULARY), 1.0)
+        self.tokens = []
+        self.tags = []
+        self.uploader_ids = []
+        self.document_ids = []
+        self.upload_sizes = [parse_size(size) for size in args.upload_sizes.split(",")]
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def search_request(self):
+        params = {
+            "page_size": self.rng.choice((10, 20, 50)),
+            "sort_by": self.rng.choice(SORT_FIELDS),
+            "sort_order": self.rng.choice(("asc", "desc")),
+        }
+        roll = self.rng.random()
+        if roll < 0.6:
+            params["query"] = " ".join(self.rng.choices(VOCABULARY, cum_weights=self.word_weights, k=self.rng.randint(1, 3)))
+        if self.tags and self.rng.random() < 0.3:
+            params["tags"] = self.rng.sample(self.tags, k=min(len(self.tags), self.rng.randint(1, 2)))
+        if self.uploader_ids and self.rng.random() < 0.15:
+            params["uploader_id"] = self.rng.choice(self.uploader_ids)
+        if self.rng.random() < 0.2:
+            params["page"] = self.rng.randint(2, 5)
+        return "GET", "/api/documents/search", {"params": params}
+
+    def upload_request(self):
+        size = self.rng.choice(self.upload_sizes)
+        title = " ".join(self.rng.choices(VOCABULARY, cum_weights=self.word_weights, k=4)).capitalize()
+        data = {"title": title, "permission_level": self.rng.choice(("department", "public", "restricted"))}
+        if self.tags:
+            data["tags"] = ",".join(self.rng.sample(self.tags, k=min(len(self.tags), 2)))
+        files = {"file": (f"bench-{size}.txt", self.rng.randbytes(size), "text/plain")}
+        return "POST", "/api/documents", {"data": data, "files": files}
+
+    def download_request(self):
+        document_id = self.rng.choice(self.document_ids)
+        headers = {}
+        if self.rng.random() < 0.3:
+            headers["Range"] = "bytes=0-65535"
+        return "GET", f"/api/documents/{document_id}/download", {"headers": headers}
+
+    def filters_request(self):
+        return "GET", self.rng.choice(("/api/documents/filters/tags", "/api/documents/filters/uploaders")), {}
+
+
+async def prepare(client, context):
+    args = context.args
+    for i in range(args.users):
+        response = await client.post(
+            "/api/auth/login", json={"email": BENCH_EMAIL.format(i), "password": BENCH_PASSWORD}
+        )
+        if response.status_code == 200:
+            context.tokens.append(response.json()["access_token"])
+    if not context.tokens:
+        raise SystemExit("No benchmark user could log in; run benchmarks.seed first")
+
+    admin_headers = {"Authorization": f"Bearer {context.tokens[0]}"}
+    tags = await client.get("/api/documents/filters/tags", headers=admin_headers)
+    context.tags = tags.json().get("tags", [])[:200]
+    uploaders = await client.get("/api/documents/filters/uploaders", headers=admin_headers)
+    context.uploader_ids = [uploader["id"] for uploader in uploaders.json().get("uploaders", [])][:200]
+
+    cursor = None
+    while len(context.document_ids) < args.download_pool:
+        params = {"page_size": 100}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/api/documents/search", params=params, headers=admin_headers)).json()
+        context.document_ids.extend(item["id"] for item in page.get("items", []))
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+
+
+async def run_scenario(client, context, name):
+    build_request = getattr(context, f"{name}_request")
+    latencies = []
+    statuses = {}
+    errors = 0
+    deadline = time.perf_counter() + context.args.duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, url, kwargs = build_request()
+            headers = {**context.headers(), **kwargs.pop("headers", {})}
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(method, url, headers=headers, **kwargs)
+                await response.aread()
+                status_code = response.status_code
+            except httpx.HTTPError:
+                status_code = "error"
+            latencies.append(time.perf_counter() - started_at)
+            statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+            if status_code == "error" or status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(context.args.concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency": latency_summary(latencies),
+    }
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    context = LoadContext(args, rng)
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        await prepare(client, context)
+
+        report = {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "config": {
+                "base_url": args.base_url,
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "users": len(context.tokens),
+                "upload_sizes": context.upload_sizes,
+                "seed": args.seed,
+            },
+            "scenarios": {},
+        }
+
+        for name in args.scenarios.split(","):
+            if name == "download" and not context.document_ids:
+                continue
+            report["scenarios"][name] = await run_scenario(client, context, name)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run load scenarios against a running API and report latency percentiles")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--upload-sizes", default="10KB,1MB,10MB")
+    parser.add_argument("--download-pool", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    for name in args.scenarios.split(","):
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
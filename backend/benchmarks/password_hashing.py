@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import latency_summary
+
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.security import (
+    get_password_hash,
+    verify_password,
+    verify_password_async,
+    get_password_hash_executor,
+    shutdown_password_hash_executor
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+def single_core(password_hash, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        verify_password(PASSWORD, password_hash)
+    elapsed = time.perf_counter() - started
+    return {
+        "verify_ms": round(elapsed / rounds * 1000, 2),
+        "logins_per_second_per_core": round(rounds / elapsed, 2),
+    }
+
+
+async def login_storm(mode, password_hash, logins, probe_interval):
+    if mode == "pool":
+        async def login():
+            return await verify_password_async(PASSWORD, password_hash)
+    else:
+        async def login():
+            return await run_in_threadpool(verify_password, PASSWORD, password_hash)
+
+    probe_latencies = []
+    storm_done = asyncio.Event()
+
+    async def probe():
+        while not storm_done.is_set():
+            started = time.perf_counter()
+            await run_in_threadpool(lambda: None)
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(probe_interval)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    storm_done.set()
+    await probe_task
+
+    completed = sum(1 for result in results if result is True)
+    return {
+        "mode": mode,
+        "logins": logins,
+        "completed": completed,
+        "rejected": logins - completed,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_second": round(completed / elapsed, 2),
+        "other_endpoint_latency": latency_summary(probe_latencies),
+    }
+
+
+async def run(args):
+    password_hash = get_password_hash(PASSWORD)
+
+    report = {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "cpu_count": os.cpu_count(),
+        "single_core": single_core(password_hash, args.rounds),
+    }
+
+    await asyncio.wrap_future(get_password_hash_executor().submit(verify_password, PASSWORD, password_hash))
+
+    report["storms"] = [
+        await login_storm(mode, password_hash, args.logins, args.probe_interval)
+        for mode in ("threadpool", "pool")
+    ]
+    report["storms"][1]["logins_per_second_per_worker"] = round(
+        report["storms"][1]["logins_per_second"] / settings.PASSWORD_HASH_WORKERS, 2
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure login throughput and the latency impact of bcrypt on other endpoints"
+    )
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.workers:
+        settings.PASSWORD_HASH_WORKERS = args.workers
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        shutdown_password_hash_executor()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import io
+import json
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import BENCH_EMAIL, BENCH_PASSWORD, VOCABULARY, zipf_weights
+
+from sqlalchemy import insert, select, text
+from app.core.security import get_password_hash
+from app.db.database import SessionLocal
+from app.models.department import Department
+from app.models.document import Document, PermissionLevel
+from app.models.document_tag import DocumentTag
+from app.models.document_version import DocumentVersion
+from app.models.role import Role
+from app.models.tag import Tag
+from app.models.user import User
+from app.services.blob_service import BlobService
+from app.services.document_service import DocumentService
+
+PERMISSION_LEVELS = (PermissionLevel.DEPARTMENT, PermissionLevel.PUBLIC, PermissionLevel.RESTRICTED)
+PERMISSION_WEIGHTS = (0.50, 0.85, 1.0)
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".txt": "text/plain",
+    ".csv": "text/csv",
+}
+
+
+def random_uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def words(rng, word_weights, low, high):
+    return " ".join(rng.choices(VOCABULARY, cum_weights=word_weights, k=rng.randint(low, high)))
+
+
+def insert_batches(db, table, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(table), rows[start:start + batch_size])
+        db.commit()
+
+
+def seed_blobs(db, rng, count, min_size, max_size):
+    staged = []
+    for _ in range(count):
+        size = int(math.exp(rng.uniform(math.log(min_size), math.log(max_size))))
+        staged.append(DocumentService.stage_uploaded_file(io.BytesIO(rng.randbytes(size))))
+    keys = BlobService.store_many(db, staged)
+    db.commit()
+    return [(key, checksum, size) for key, (_, checksum, size) in zip(keys, staged)]
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    word_weights = zipf_weights(len(VOCABULARY), 1.0)
+    db = SessionLocal()
+    report = {"seed": args.seed}
+    started_at = time.perf_counter()
+
+    try:
+        if args.truncate:
+            db.execute(text(
+                "TRUNCATE document_tags, document_versions, documents, upload_session_chunks, upload_sessions, "
+                "refresh_tokens, blobs CASCADE"
+            ))
+            db.execute(text("DELETE FROM users WHERE email LIKE 'bench-user-%'"))
+            db.execute(text("DELETE FROM tags WHERE name LIKE 'bench-%'"))
+            db.execute(text("DELETE FROM departments WHERE name LIKE 'Bench Department %'"))
+            db.commit()
+
+        roles = dict(db.execute(select(Role.name, Role.id)).all())
+
+        department_rows = [
+            {"id": random_uuid(rng), "name": f"Bench Department {i}", "description": words(rng, word_weights, 3, 8)}
+            for i in range(args.departments)
+        ]
+        insert_batches(db, Department.__table__, department_rows, args.batch_size)
+        department_weights = zipf_weights(len(department_rows), 0.8)
+
+        password_hash = get_password_hash(BENCH_PASSWORD)
+        user_rows = []
+        for i in range(args.users):
+            role_roll = rng.random()
+            role_name = "admin" if i == 0 or role_roll < 0.02 else "manager" if role_roll < 0.12 else "employee"
+            department = rng.choices(department_rows, cum_weights=department_weights)[0]
+            user_rows.append({
+                "id": random_uuid(rng),
+                "email": BENCH_EMAIL.format(i),
+                "password_hash": password_hash,
+                "first_name": rng.choice(VOCABULARY).title(),
+                "last_name": rng.choice(VOCABULARY).title(),
+                "department_id": department["id"],
+                "role_id": roles.get(role_name),
+                "is_active": True,
+            })
+        insert_batches(db, User.__table__, user_rows, args.batch_size)
+        uploader_weights = zipf_weights(len(user_rows), 1.1)
+
+        tag_rows = [
+            {"id": random_uuid(rng), "name": f"bench-{VOCABULARY[i % len(VOCABULARY)]}-{i}"[:50]}
+            for i in range(args.tags)
+        ]
+        insert_batches(db, Tag.__table__, tag_rows, args.batch_size)
+        tag_weights = zipf_weights(len(tag_rows), 1.2)
+
+        blobs = seed_blobs(db, rng, args.blobs, args.min_file_size, args.max_file_size)
+
+        now = datetime.utcnow()
+        document_rows, version_rows, document_tag_rows = [], [], []
+        for _ in range(args.documents):
+            uploader = rng.choices(user_rows, cum_weights=uploader_weights)[0]
+            created_at = now - timedelta(seconds=rng.randint(0, args.history_days * 86400))
+            version_count = min(args.max_versions, 1 + int(rng.expovariate(1.5)))
+            document_id = random_uuid(rng)
+            extension = rng.choice(list(MIME_TYPES))
+
+            document_rows.append({
+                "id": document_id,
+                "title": words(rng, word_weights, 3, 8).capitalize()[:255],
+                "description": words(rng, word_weights, 10, 40),
+                "uploader_id": uploader["id"],
+                "department_id": uploader["department_id"],
+                "permission_level": rng.choices(PERMISSION_LEVELS, cum_weights=PERMISSION_WEIGHTS)[0],
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(days=rng.randint(0, 60)),
+                "is_deleted": rng.random() < 0.02,
+                "current_version": version_count,
+            })
+
+            for version_number in range(1, version_count + 1):
+                storage_key, checksum, file_size = rng.choice(blobs)
+                version_rows.append({
+                    "id": random_uuid(rng),
+                    "document_id": document_id,
+                    "version_number": version_number,
+                    "file_path": storage_key,
+                    "file_name": f"{words(rng, word_weights, 1, 3).replace(' ', '_')}{extension}",
+                    "file_size": file_size,
+                    "mime_type": MIME_TYPES[extension],
+                    "checksum": checksum,
+                    "uploaded_by": uploader["id"],
+                    "upload_date": created_at + timedelta(days=version_number - 1),
+                    "change_notes": "Initial version" if version_number == 1 else words(rng, word_weights, 2, 6),
+                })
+
+            tag_ids = {tag["id"] for tag in rng.choices(tag_rows, cum_weights=tag_weights, k=rng.randint(0, 5))}
+            document_tag_rows.extend(
+                {"id": random_uuid(rng), "document_id": document_id, "tag_id": tag_id} for tag_id in tag_ids
+            )
+
+            if len(document_rows) >= args.batch_size:
+                insert_batches(db, Document.__table__, document_rows, args.batch_size)
+                insert_batches(db, DocumentVersion.__table__, version_rows, args.batch_size)
+                insert_batches(db, DocumentTag.__table__, document_tag_rows, args.batch_size)
+                report["documents"] = report.get("documents", 0) + len(document_rows)
+                document_rows, version_rows, document_tag_rows = [], [], []
+
+        insert_batches(db, Document.__table__, document_rows, args.batch_size)
+        insert_batches(db, DocumentVersion.__table__, version_rows, args.batch_size)
+        insert_batches(db, DocumentTag.__table__, document_tag_rows, args.batch_size)
+        report["documents"] = report.get("documents", 0) + len(document_rows)
+
+        db.execute(text("ANALYZE"))
+        db.commit()
+    finally:
+        db.close()
+
+    report.update({
+        "departments": args.departments,
+        "users": args.users,
+        "tags": args.tags,
+        "blobs": args.blobs,
+        "elapsed_s": round(time.perf_counter() - started_at, 2),
+    })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed PostgreSQL with a skewed synthetic document corpus")
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--max-versions", type=int, default=10)
+    parser.add_argument("--blobs", type=int, default=200)
+    parser.add_argument("--min-file-size", type=int, default=1024)
+    parser.add_argument("--max-file-size", type=int, default=1048576)
+    parser.add_argument("--history-days", type=int, default=1095)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Remove existing documents and benchmark rows first")
+    args = parser.parse_args()
+
+    print(json.dumps(seed(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
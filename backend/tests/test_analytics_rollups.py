@@ -0,0 +1,98 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.db.database import get_session_runner
+from app.main import app
+from app.models import Department, Document, User
+from app.models.analytics_rollup import DepartmentUploadRollup
+from app.schemas.auth import Principal
+from app.services.analytics_service import AnalyticsService
+
+
+class RecordingRunner:
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, fn, *args):
+        self.calls.append(fn)
+        return {"days": 30, "departments": [], "tags": []}
+
+
+@pytest.fixture
+def as_role():
+    runner = RecordingRunner()
+
+    async def session_runner():
+        yield runner
+
+    def use(role_name):
+        principal = Principal(
+            id=uuid.uuid4(), email="viewer@example.com", first_name="View", last_name="Er", role_name=role_name
+        )
+        app.dependency_overrides[get_current_user] = lambda: principal
+        return TestClient(app)
+
+    app.dependency_overrides[get_session_runner] = session_runner
+    try:
+        yield use, runner
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("role_name", [None, "employee"])
+@pytest.mark.parametrize("path", ["/api/analytics/departments", "/api/analytics/tags"])
+def test_analytics_denied_without_analytics_role(as_role, role_name, path):
+    use, runner = as_role
+
+    assert use(role_name).get(path).status_code == 403
+    assert runner.calls == []
+
+
+@pytest.mark.parametrize("role_name", ["admin", "manager"])
+def test_analytics_allowed_for_admins_and_managers(as_role, role_name):
+    use, runner = as_role
+
+    assert use(role_name).get("/api/analytics/departments").status_code == 200
+    assert runner.calls == [AnalyticsService.get_department_stats]
+
+
+def rolled_up_documents(db):
+    return db.query(func.coalesce(func.sum(DepartmentUploadRollup.document_count), 0)).scalar()
+
+
+def test_refresh_picks_up_writes_inside_overlap_window(pg_db):
+    department = Department(id=uuid.uuid4(), name="Engineering")
+    user = User(
+        id=uuid.uuid4(), email="roller@example.com", password_hash="x",
+        first_name="Roll", last_name="Up", department_id=department.id
+    )
+    pg_db.add_all([department, user])
+    pg_db.add(Document(id=uuid.uuid4(), title="Current", uploader_id=user.id, department_id=department.id))
+    pg_db.commit()
+
+    AnalyticsService.refresh_rollups(pg_db)
+    watermark = AnalyticsService.refreshed_through(pg_db)
+    assert rolled_up_documents(pg_db) == 1
+
+    # Committed after the refresh, but stamped when its transaction started.
+    late = watermark - timedelta(seconds=60)
+    # Outside the overlap window, so an incremental refresh does not rescan it.
+    stale = watermark - timedelta(seconds=settings.ANALYTICS_ROLLUP_OVERLAP_SECONDS * 2, days=10)
+    for title, stamped_at in [("Late", late), ("Stale", stale)]:
+        pg_db.add(Document(
+            id=uuid.uuid4(), title=title, uploader_id=user.id, department_id=department.id,
+            created_at=stamped_at, updated_at=stamped_at
+        ))
+    pg_db.commit()
+
+    AnalyticsService.refresh_rollups(pg_db)
+
+    assert rolled_up_documents(pg_db) == 2
+    assert pg_db.query(DepartmentUploadRollup).filter(DepartmentUploadRollup.day == stale.date()).count() == 0
+    assert AnalyticsService.refreshed_through(pg_db) > watermark
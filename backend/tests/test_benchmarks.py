@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import random
+import uuid
+
+import httpx
+from starlette.routing import Match
+
+from app.main import app
+from benchmarks.common import latency_summary, percentile, zipf_weights
+from benchmarks.load import SCENARIOS, LoadContext, parse_size, run_scenario
+
+
+def load_args(**overrides):
+    values = {"upload_sizes": "10KB,1MB", "duration": 0.05, "concurrency": 2}
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def load_context():
+    context = LoadContext(load_args(), random.Random(7))
+    context.tokens = ["token"]
+    context.tags = ["policy", "finance"]
+    context.uploader_ids = [str(uuid.uuid4())]
+    context.document_ids = [str(uuid.uuid4())]
+    return context
+
+
+def test_summary_helpers():
+    assert parse_size("10KB") == 10240
+    assert parse_size("1.5mb") == 1572864
+    assert parse_size("512") == 512
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile([], 0.5) is None
+    assert latency_summary([0.001, 0.002, 0.010]) == {
+        "count": 3, "p50_ms": 2.0, "p95_ms": 10.0, "p99_ms": 10.0, "max_ms": 10.0
+    }
+    assert latency_summary([])["count"] == 0
+
+    weights = zipf_weights(3, 1.0)
+    assert weights == sorted(weights)
+    assert weights[-1] == 1 + 1 / 2 + 1 / 3
+
+
+def test_scenarios_target_existing_routes():
+    context = load_context()
+
+    for name in SCENARIOS:
+        method, url, _ = getattr(context, f"{name}_request")()
+        scope = {"type": "http", "method": method, "path": url}
+        assert any(route.matches(scope)[0] == Match.FULL for route in app.routes), (name, method, url)
+
+
+def test_run_scenario_reports_statuses_and_latency():
+    context = load_context()
+    responses = iter([200, 503] * 1000)
+    transport = httpx.MockTransport(lambda request: httpx.Response(next(responses)))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_scenario(client, context, "search")
+
+    report = asyncio.run(run())
+
+    assert report["requests"] == sum(report["statuses"].values()) > 0
+    assert report["errors"] == report["statuses"].get("503", 0)
+    assert report["latency"]["count"] == report["requests"]
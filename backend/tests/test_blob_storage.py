@@ -0,0 +1,130 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import Department, Document, DocumentVersion, User
+from app.models.blob import Blob
+from app.services import blob_service
+from app.services.blob_service import BlobService
+from app.storage.local import LocalStorageBackend
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalStorageBackend(str(tmp_path / "storage"))
+    monkeypatch.setattr(blob_service, "get_storage", lambda: storage)
+    return storage
+
+
+def stage(tmp_path, content):
+    path = tmp_path / uuid.uuid4().hex
+    path.write_bytes(content)
+    return str(path), hashlib.sha256(content).hexdigest(), len(content)
+
+
+def test_identical_content_is_stored_once(db, storage, tmp_path):
+    first = stage(tmp_path, b"policy template")
+    second = stage(tmp_path, b"policy template")
+
+    keys = [BlobService.store(db, *staged) for staged in (first, second)]
+    db.commit()
+
+    assert keys[0] == keys[1] == BlobService.blob_key(first[1])
+    assert db.query(Blob).count() == 1
+    assert storage.exists(keys[0])
+    assert not any(os.path.exists(path) for path, _, _ in (first, second))
+
+
+def test_store_many_deduplicates_within_batch(db, storage, tmp_path):
+    staged = [stage(tmp_path, content) for content in (b"a", b"b", b"a")]
+
+    keys = BlobService.store_many(db, staged)
+    db.commit()
+
+    assert keys[0] == keys[2] != keys[1]
+    assert db.query(Blob).count() == 2
+    assert all(storage.exists(key) for key in keys)
+
+
+def test_rollback_removes_placed_objects(db, storage, tmp_path):
+    kept = BlobService.store(db, *stage(tmp_path, b"kept"))
+    db.commit()
+    discarded = BlobService.store(db, *stage(tmp_path, b"discarded"))
+    assert storage.exists(discarded)
+
+    db.rollback()
+
+    assert storage.exists(kept)
+    assert not storage.exists(discarded)
+    assert db.query(Blob.checksum).all() == [(hashlib.sha256(b"kept").hexdigest(),)]
+
+
+@pytest.fixture
+def uploader(pg_db):
+    department = Department(id=uuid.uuid4(), name="Blob Department")
+    user = User(
+        id=uuid.uuid4(), email="blobs@example.com", password_hash="x",
+        first_name="Blob", last_name="User", department_id=department.id
+    )
+    document = Document(id=uuid.uuid4(), title="Template", uploader_id=user.id, department_id=department.id)
+    pg_db.add_all([department, user, document])
+    pg_db.commit()
+    return user, document
+
+
+def add_version(db, uploader, storage_key, checksum, version_number):
+    user, document = uploader
+    version = DocumentVersion(
+        id=uuid.uuid4(), document_id=document.id, version_number=version_number, file_path=storage_key,
+        file_name="template.pdf", file_size=8, checksum=checksum, uploaded_by=user.id
+    )
+    db.add(version)
+    db.commit()
+    return version
+
+
+def ref_count(db, checksum):
+    db.expire_all()
+    return db.query(Blob.ref_count).filter(Blob.checksum == checksum).scalar()
+
+
+def test_ref_count_follows_versions_and_gc_removes_unreferenced(pg_db, storage, tmp_path, uploader):
+    staged = stage(tmp_path, b"template")
+    checksum = staged[1]
+    storage_key = BlobService.store(pg_db, *staged)
+    pg_db.commit()
+
+    versions = [add_version(pg_db, uploader, storage_key, checksum, number) for number in (1, 2)]
+    assert ref_count(pg_db, checksum) == 2
+
+    pg_db.delete(versions[0])
+    pg_db.commit()
+    assert ref_count(pg_db, checksum) == 1
+    assert BlobService.collect_garbage(pg_db, grace_seconds=0) == 0
+
+    pg_db.delete(versions[1])
+    pg_db.commit()
+    assert ref_count(pg_db, checksum) == 0
+    assert BlobService.collect_garbage(pg_db, grace_seconds=3600) == 0
+    assert BlobService.collect_garbage(pg_db, grace_seconds=0) == 1
+    assert not storage.exists(storage_key)
+
+
+def test_gc_skips_blobs_locked_by_another_transaction(pg_db, storage, tmp_path):
+    staged = stage(tmp_path, b"orphan")
+    checksum = staged[1]
+    BlobService.store(pg_db, *staged)
+    pg_db.commit()
+
+    other = Session(bind=pg_db.get_bind())
+    try:
+        other.query(Blob).filter(Blob.checksum == checksum).with_for_update().one()
+        assert BlobService.collect_garbage(pg_db, grace_seconds=0) == 0
+    finally:
+        other.rollback()
+        other.close()
+
+    assert BlobService.collect_garbage(pg_db, grace_seconds=0) == 1
@@ -0,0 +1,108 @@
+import io
+import os
+import uuid
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.models import Department, Document, DocumentTag, DocumentVersion, Tag, User
+from app.models.blob import Blob
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentCreate
+from app.services import blob_service
+from app.services.blob_service import BlobService
+from app.services.document_service import DocumentService
+from app.storage.local import LocalStorageBackend
+
+
+@pytest.fixture
+def uploader(db, tmp_path, monkeypatch):
+    storage = LocalStorageBackend(str(tmp_path / "storage"))
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(blob_service, "get_storage", lambda: storage)
+
+    department = Department(id=uuid.uuid4(), name="Archive")
+    user = User(
+        id=uuid.uuid4(), email="archivist@example.com", password_hash="x",
+        first_name="Archi", last_name="Vist", department_id=department.id
+    )
+    db.add_all([department, user])
+    db.commit()
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=department.id, role_name="employee"
+    )
+    return principal, storage
+
+
+def upload(name, content):
+    return UploadFile(file=io.BytesIO(content), filename=name, headers=Headers({"content-type": "application/pdf"}))
+
+
+def stored_objects(storage):
+    return [os.path.join(root, name) for root, _, names in os.walk(storage.root) for name in names]
+
+
+def test_bulk_ingest_inserts_documents_versions_and_tags(db, uploader):
+    principal, storage = uploader
+    entries = [
+        DocumentCreate(title="Policy", tags=["HR", "policy"]),
+        DocumentCreate(title="Policy copy", tags=["hr"]),
+        DocumentCreate(title="Handbook", tags=[]),
+    ]
+    files = [upload("policy.pdf", b"policy"), upload("copy.pdf", b"policy"), upload("handbook.pdf", b"handbook")]
+
+    documents = DocumentService.create_documents(db, principal, entries, files)
+
+    assert [document.title for document in documents] == ["Policy", "Policy copy", "Handbook"]
+    assert db.query(DocumentVersion).count() == 3
+    assert sorted(name for name, in db.query(Tag.name)) == ["hr", "policy"]
+    assert db.query(DocumentTag).count() == 3
+    assert db.query(Blob).count() == 2
+    assert len(stored_objects(storage)) == 2
+    assert os.listdir(BlobService.temp_dir()) == []
+
+
+def test_invalid_entry_rejects_whole_batch_before_staging(db, uploader):
+    principal, storage = uploader
+    entries = [DocumentCreate(title="Fine"), DocumentCreate(title="Broken", permission_level="secret")]
+
+    with pytest.raises(HTTPException) as error:
+        DocumentService.create_documents(db, principal, entries, [upload("a.pdf", b"a"), upload("b.pdf", b"b")])
+
+    assert error.value.status_code == 400
+    assert error.value.detail.startswith("Entry 1: ")
+    assert stored_objects(storage) == []
+
+
+def test_oversized_file_fails_batch_without_leftovers(db, uploader, monkeypatch):
+    principal, storage = uploader
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 10)
+    entries = [DocumentCreate(title="Small"), DocumentCreate(title="Large")]
+
+    with pytest.raises(HTTPException) as error:
+        DocumentService.create_documents(db, principal, entries, [upload("a.pdf", b"small"), upload("b.pdf", b"x" * 11)])
+
+    assert error.value.status_code == 413
+    assert db.query(Document).count() == 0
+    assert stored_objects(storage) == []
+    assert os.listdir(BlobService.temp_dir()) == []
+
+
+def test_failed_insert_removes_placed_objects(db, uploader, monkeypatch):
+    principal, storage = uploader
+
+    def fail(db, tag_names):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(DocumentService, "get_or_create_tags", staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        DocumentService.create_documents(
+            db, principal, [DocumentCreate(title="Lost")], [upload("lost.pdf", b"lost")]
+        )
+    db.rollback()
+
+    assert db.query(Blob).count() == 0
+    assert stored_objects(storage) == []
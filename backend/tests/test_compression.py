@@ -0,0 +1,123 @@
+import gzip
+import random
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.file_response import file_download_response
+from app.storage import compression
+from app.storage.compression import CompressedStorage, compress_file, compression_ratio
+from app.storage.local import LocalStorageBackend
+
+CONTENT = b"".join(f"{index},value {index % 97},{'text ' * (index % 13)}\n".encode() for index in range(40000))
+KEY = "blobs/abc123"
+ETAG = '"abc123"'
+
+
+@pytest.fixture
+def backend(tmp_path):
+    storage = LocalStorageBackend(str(tmp_path / "storage"))
+    source = tmp_path / "source"
+    source.write_bytes(CONTENT)
+    compress_file(str(source), str(tmp_path / "source.gz"), "gzip", 6)
+    storage.put_file(KEY, str(tmp_path / "source.gz"))
+    return storage
+
+
+def compressed(backend, retain=False):
+    return CompressedStorage(backend, {KEY: ("gzip", len(CONTENT))}, retain=retain)
+
+
+def read(storage, start, end):
+    return b"".join(storage.open_range(KEY, start, end))
+
+
+def test_compress_file_round_trips(backend):
+    raw = b"".join(backend.open_range(KEY, 0, backend.size(KEY) - 1))
+    assert gzip.decompress(raw) == CONTENT
+    assert backend.size(KEY) < len(CONTENT)
+    assert compression_ratio(CONTENT[:65536], "gzip", 6) < 1.0
+    assert compression_ratio(b"", "gzip", 6) == 1.0
+
+
+@pytest.mark.parametrize("retain", [False, True])
+def test_range_reads_match_uncompressed_content(backend, retain):
+    storage = compressed(backend, retain)
+    rng = random.Random(1)
+    ranges = [(0, len(CONTENT) - 1), (len(CONTENT) - 1, len(CONTENT) - 1), (0, 0)]
+    ranges += [tuple(sorted((rng.randrange(len(CONTENT)), rng.randrange(len(CONTENT))))) for _ in range(30)]
+    ranges += sorted(ranges)
+
+    assert storage.size(KEY) == len(CONTENT)
+    assert storage.content_encoding(KEY) == "gzip"
+    for start, end in ranges:
+        assert read(storage, start, end) == CONTENT[start:end + 1]
+
+
+def test_retained_snapshot_spills_to_disk(backend, monkeypatch):
+    monkeypatch.setattr(compression, "RETAIN_MEMORY_LIMIT", 4096)
+    storage = compressed(backend, retain=True)
+
+    assert read(storage, len(CONTENT) - 100, len(CONTENT) - 1) == CONTENT[-100:]
+    cursor = storage.cursors[KEY]
+    assert cursor.retained._rolled
+    assert read(storage, 10, 5000) == CONTENT[10:5001]
+
+
+@pytest.fixture
+def client(backend):
+    storage = compressed(backend)
+    app = FastAPI()
+
+    @app.get("/download")
+    def download(request: Request):
+        return file_download_response(
+            request, storage, key=KEY, file_name="report.csv",
+            media_type="text/csv", etag=ETAG, immutable=True
+        )
+
+    return TestClient(app)
+
+
+def test_passthrough_when_client_accepts_encoding(client, backend):
+    response = client.get("/download", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc123-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.num_bytes_downloaded == backend.size(KEY)
+    assert response.content == CONTENT
+
+
+def test_decoded_when_client_does_not_accept_encoding(client):
+    response = client.get("/download", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.content == CONTENT
+
+
+def test_range_request_is_served_decoded(client):
+    response = client.get("/download", headers={"Accept-Encoding": "gzip", "Range": "bytes=1000-1999"})
+
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(CONTENT)}"
+    assert response.content == CONTENT[1000:2000]
+
+
+def test_not_modified_uses_encoding_specific_etag(client):
+    response = client.get("/download", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc123-gzip"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc123-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get("/download", headers={"Accept-Encoding": "identity", "If-None-Match": '"abc123-gzip"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+
+from app.core.config import settings
+from app.db import database
+from app.db.pool import InstrumentedQueuePool
+
+
+@pytest.fixture
+def pool():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    yield pool
+    pool.dispose()
+
+
+def test_engine_pool_uses_settings():
+    pool = database.engine.pool
+
+    assert isinstance(pool, InstrumentedQueuePool)
+    assert pool.size() == settings.DATABASE_POOL_SIZE
+    assert pool._max_overflow == settings.DATABASE_MAX_OVERFLOW
+    assert pool._timeout == settings.DATABASE_POOL_TIMEOUT
+    assert pool._recycle == settings.DATABASE_POOL_RECYCLE
+    assert pool._pre_ping == settings.DATABASE_POOL_PRE_PING
+    assert set(database.pool_status()) == {"sync"} | ({"async"} if database.async_engine is not None else set())
+
+
+def test_checkouts_are_counted(pool):
+    first = pool.connect()
+    assert pool.status_dict()["checked_out"] == 1
+    first.close()
+    pool.connect().close()
+
+    status = pool.status_dict()
+    assert status["checkouts"] == 2
+    assert status["timeouts"] == 0
+    assert status["checked_out"] == 0
+    assert status["checked_in"] == 1
+    assert status["overflow"] == 0
+
+
+def test_checkout_timeouts_are_counted(pool):
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    held.close()
+
+    status = pool.status_dict()
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import random
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.models.blob import Blob
+from app.services import blob_service
+from app.services.blob_service import BlobService
+from app.storage.delta import COPY, LITERAL, DeltaVersionStorage, chunk_ends, encode_delta, iter_chunks, read_delta_ops
+from app.storage.local import LocalStorageBackend
+
+
+def text_version(rng, lines):
+    return "".join(f"{index},{rng.random():.6f},{'x' * (index % 40)}\n" for index in lines).encode()
+
+
+def edit(rng, content):
+    lines = content.split(b"\n")
+    for _ in range(3):
+        lines[rng.randrange(len(lines))] = f"edited {rng.random()}".encode()
+    lines.insert(rng.randrange(len(lines)), b"inserted line")
+    return b"\n".join(lines)
+
+
+def read_all(storage, key):
+    size = storage.size(key)
+    return b"".join(storage.open_range(key, 0, size - 1)) if size else b""
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorageBackend(str(tmp_path / "storage"))
+
+
+def put(storage, tmp_path, key, content):
+    staged = tmp_path / f"{hashlib.sha256(key.encode()).hexdigest()}.staged"
+    staged.write_bytes(content)
+    storage.put_file(key, str(staged))
+
+
+def build_chain(storage, tmp_path, contents):
+    put(storage, tmp_path, "v0", contents[0])
+    versions = [DeltaVersionStorage(storage, "v0", "v0", len(contents[0]), [])]
+    for index, content in enumerate(contents[1:], start=1):
+        previous = versions[-1]
+        delta_path = str(tmp_path / f"v{index}.delta")
+        encode_delta([read_all(previous, previous.key)], [content], delta_path)
+        storage.put_file(f"v{index}", delta_path)
+        versions.append(DeltaVersionStorage(
+            storage, f"v{index}", "v0", len(contents[0]), [f"v{step}" for step in range(1, index + 1)]
+        ))
+    return versions
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 4096, 1 << 20])
+def test_streamed_chunks_match_whole_buffer_boundaries(block_size):
+    rng = random.Random(block_size)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as members:
+        for index in range(4):
+            members.writestr(f"member{index}.xml", text_version(rng, range(index * 500, index * 500 + 800)))
+
+    for data in (text_version(rng, range(3000)), archive.getvalue(), b"y" * 200000):
+        blocks = [data[offset:offset + block_size] for offset in range(0, len(data), block_size)]
+        ends, position = [], 0
+        for chunk in iter_chunks(blocks):
+            position += len(chunk)
+            ends.append(position)
+        assert ends == chunk_ends(data)
+
+
+def test_round_trip_mixes_copy_and_literal_ops(storage, tmp_path):
+    rng = random.Random(1)
+    base = text_version(rng, range(2000))
+    target = b"prepended\n" + edit(rng, base) + b"appended"
+
+    versions = build_chain(storage, tmp_path, [base, target])
+
+    _, target_size, ops = read_delta_ops(storage, "v1")
+    kinds = [kind for kind, _, _ in ops]
+    assert target_size == len(target)
+    assert COPY in kinds and LITERAL in kinds
+    assert all(left != right for left, right in zip(kinds, kinds[1:]) if left == LITERAL)
+    assert sum(length for _, _, length in ops) == len(target)
+    assert storage.size("v1") < len(target) * settings.DELTA_MAX_SIZE_RATIO
+    assert read_all(versions[1], "v1") == target
+
+
+def test_round_trip_zip_members(storage, tmp_path):
+    rng = random.Random(2)
+
+    def archive(members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as container:
+            for name, content in members.items():
+                container.writestr(name, content)
+        return buffer.getvalue()
+
+    members = {f"sheet{index}.xml": text_version(rng, range(index * 300, index * 300 + 600)) for index in range(5)}
+    base = archive(members)
+    members["sheet1.xml"] = edit(rng, members["sheet1.xml"])
+    target = archive(members)
+
+    versions = build_chain(storage, tmp_path, [base, target])
+
+    _, _, ops = read_delta_ops(storage, "v1")
+    assert COPY in [kind for kind, _, _ in ops]
+    assert read_all(versions[1], "v1") == target
+
+
+def test_empty_base_stores_target_as_literal(storage, tmp_path):
+    target = text_version(random.Random(3), range(100))
+
+    versions = build_chain(storage, tmp_path, [b"", target])
+
+    _, _, ops = read_delta_ops(storage, "v1")
+    assert ops == [(LITERAL, 0, len(target))]
+    assert read_all(versions[1], "v1") == target
+
+
+def test_empty_target_has_no_ops(storage, tmp_path):
+    base = text_version(random.Random(4), range(100))
+
+    versions = build_chain(storage, tmp_path, [base, b""])
+
+    _, target_size, ops = read_delta_ops(storage, "v1")
+    assert (target_size, ops) == (0, [])
+    assert versions[1].size("v1") == 0
+    assert b"".join(versions[1].open_range("v1", 0, -1)) == b""
+
+
+def test_chain_flattens_to_snapshot_and_literal_reads(storage, tmp_path):
+    rng = random.Random(5)
+    contents = [text_version(rng, range(1500))]
+    for _ in range(settings.DELTA_MAX_CHAIN_LENGTH):
+        contents.append(edit(rng, contents[-1]))
+
+    versions = build_chain(storage, tmp_path, contents)
+
+    for version, content in zip(versions, contents):
+        assert read_all(version, version.key) == content
+
+    last = versions[-1]
+    last.resolve()
+    assert len(last.delta_keys) == settings.DELTA_MAX_CHAIN_LENGTH
+    for segment_key, segment_offset, _ in last.segments:
+        if segment_key != "v0":
+            data_offset, _, _ = read_delta_ops(storage, segment_key)
+            assert segment_offset >= data_offset
+
+
+def test_range_reads_span_ops(storage, tmp_path):
+    rng = random.Random(6)
+    contents = [text_version(rng, range(1500))]
+    for _ in range(3):
+        contents.append(edit(rng, contents[-1]))
+    versions = build_chain(storage, tmp_path, contents)
+    version, content = versions[-1], contents[-1]
+
+    version.resolve()
+    boundaries = version.starts[1:]
+    ranges = [(boundary - 5, boundary + 5) for boundary in boundaries[:20]]
+    ranges += [(0, len(content) - 1), (len(content) - 1, len(content) - 1)]
+    ranges += sorted((rng.randrange(len(content)), rng.randrange(len(content))) for _ in range(50))
+    for start, end in ranges:
+        start, end = min(start, end), max(start, end)
+        assert b"".join(version.open_range(version.key, start, end)) == content[start:end + 1]
+
+
+def test_store_delta_respects_chain_length(db, storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_service, "get_storage", lambda: storage)
+    rng = random.Random(7)
+    base = text_version(rng, range(1500))
+    target = edit(rng, base)
+    base_checksum = hashlib.sha256(base).hexdigest()
+    target_checksum = hashlib.sha256(target).hexdigest()
+
+    put(storage, tmp_path, BlobService.blob_key(base_checksum), base)
+    db.add(Blob(
+        checksum=base_checksum, storage_path=BlobService.blob_key(base_checksum), file_size=len(base),
+        chain_length=settings.DELTA_MAX_CHAIN_LENGTH
+    ))
+    db.commit()
+
+    staged = tmp_path / "target"
+    staged.write_bytes(target)
+    assert BlobService.store_delta(db, str(staged), target_checksum, len(target), base_checksum) is None
+
+    db.query(Blob).filter(Blob.checksum == base_checksum).update({"chain_length": 0})
+    storage_key = BlobService.store_delta(db, str(staged), target_checksum, len(target), base_checksum)
+    db.commit()
+
+    assert storage_key == BlobService.delta_key(target_checksum)
+    assert not staged.exists()
+    reader = BlobService.version_storage(db, storage_key, target_checksum)
+    assert read_all(reader, storage_key) == target
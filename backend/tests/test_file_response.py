@@ -0,0 +1,114 @@
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.file_response import MAX_RANGES, file_download_response, parse_range_header
+from app.storage.local import LocalStorageBackend
+
+CONTENT = bytes(range(256)) * 4
+ETAG = '"abc123"'
+
+
+@pytest.fixture
+def client(tmp_path):
+    storage = LocalStorageBackend(str(tmp_path))
+    source = tmp_path / "source"
+    source.write_bytes(CONTENT)
+    storage.put_file("blobs/abc123", str(source))
+
+    app = FastAPI()
+
+    @app.get("/download")
+    def download(request: Request):
+        return file_download_response(
+            request, storage, key="blobs/abc123", file_name="report.bin",
+            media_type="application/octet-stream", etag=ETAG, immutable=True
+        )
+
+    return TestClient(app)
+
+
+def test_parse_range_header_suffix():
+    assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+    assert parse_range_header("bytes=-5000", 1000) == [(0, 999)]
+
+
+def test_parse_range_header_open_ended_and_clamped():
+    assert parse_range_header("bytes=500-", 1000) == [(500, 999)]
+    assert parse_range_header("bytes=900-5000", 1000) == [(900, 999)]
+
+
+def test_parse_range_header_merges_overlapping_and_adjacent():
+    assert parse_range_header("bytes=0-99,50-149,150-199,400-499", 1000) == [(0, 199), (400, 499)]
+
+
+def test_parse_range_header_unsatisfiable():
+    with pytest.raises(HTTPException) as error:
+        parse_range_header("bytes=1000-1100", 1000)
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == "bytes */1000"
+
+
+def test_parse_range_header_ignores_invalid_specs():
+    assert parse_range_header("items=0-10", 1000) is None
+    assert parse_range_header("bytes=10-5", 1000) is None
+    assert parse_range_header("bytes=abc", 1000) is None
+
+
+def test_parse_range_header_too_many_parts():
+    spec = ",".join(f"{index * 10}-{index * 10 + 1}" for index in range(MAX_RANGES + 1))
+    assert parse_range_header(f"bytes={spec}", 1000) is None
+
+    spec = ",".join(f"{index * 10}-{index * 10 + 1}" for index in range(MAX_RANGES))
+    assert len(parse_range_header(f"bytes={spec}", 1000)) == MAX_RANGES
+
+
+def test_full_download(client):
+    response = client.get("/download")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+
+def test_single_range(client):
+    response = client.get("/download", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+
+
+def test_multiple_ranges(client):
+    response = client.get("/download", headers={"Range": "bytes=0-1,-2"})
+    assert response.status_code == 206
+    assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert f"Content-Range: bytes 0-1/{len(CONTENT)}".encode() in response.content
+    assert f"Content-Range: bytes {len(CONTENT) - 2}-{len(CONTENT) - 1}/{len(CONTENT)}".encode() in response.content
+
+
+def test_unsatisfiable_range(client):
+    response = client.get("/download", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_if_none_match(client):
+    for header in (ETAG, f"W/{ETAG}", '"other", ' + ETAG, "*"):
+        response = client.get("/download", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == ETAG
+
+    response = client.get("/download", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_if_range(client):
+    response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": ETAG})
+    assert response.status_code == 206
+    assert response.content == CONTENT[:10]
+
+    response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
@@ -0,0 +1,59 @@
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import Department, Document, DocumentTag, Tag, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.document_service import DocumentService
+
+
+def tsquery_arguments(text):
+    return list(DocumentService.build_search_query(text).compile(dialect=postgresql.dialect()).params.values())
+
+
+def test_search_query_matches_every_term_by_prefix():
+    assert tsquery_arguments("Quarterly  budget-report") == ["english", "quarterly:* & budget:* & report:*"]
+
+
+def test_search_query_drops_tsquery_operators():
+    assert tsquery_arguments("a|b & !c:*") == ["english", "a:* & b:* & c:*"]
+    assert DocumentService.build_search_query("!& _:*") is None
+
+
+def test_relevance_ranks_title_over_description_over_tags(pg_db):
+    department = Department(id=uuid.uuid4(), name="Search Department")
+    user = User(
+        id=uuid.uuid4(), email="searcher@example.com", password_hash="x",
+        first_name="Search", last_name="User", department_id=department.id
+    )
+    tag = Tag(id=uuid.uuid4(), name="budgeting-search")
+    pg_db.add_all([department, user, tag])
+
+    def document(title, description=None):
+        document = Document(
+            id=uuid.uuid4(), title=title, description=description, uploader_id=user.id,
+            department_id=department.id, permission_level=PermissionLevel.PUBLIC
+        )
+        pg_db.add(document)
+        return document
+
+    by_title = document("Budget forecast")
+    by_description = document("Forecast", "Notes on the budget")
+    by_tag = document("Spreadsheet")
+    document("Unrelated", "Nothing to see")
+    pg_db.flush()
+    pg_db.add(DocumentTag(id=uuid.uuid4(), document_id=by_tag.id, tag_id=tag.id))
+    pg_db.commit()
+
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=department.id, role_name="employee"
+    )
+    result = DocumentService.search_documents(pg_db, principal, DocumentSearchParams(
+        query="budg", sort_by="relevance", page_size=10
+    ))
+
+    assert [item["id"] for item in result["items"]] == [str(by_title.id), str(by_description.id), str(by_tag.id)]
+    assert result["total"] == 3
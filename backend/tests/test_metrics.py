@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import request_queries, start_request_tracking
+from app.main import app
+from app.services import cache_service
+from app.services.cache_service import CacheService
+
+
+class FakeRedis:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint_reports_routes_and_pool():
+    client = TestClient(app)
+    before = sample("http_request_duration_seconds_count", method="GET", route="/health", status="200")
+
+    assert client.get("/health").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert sample("http_request_duration_seconds_count", method="GET", route="/health", status="200") == before + 1
+    assert 'db_pool_size{engine="sync"}' in response.text
+    assert "password_hash_queue_depth" in response.text
+
+
+def test_unmatched_routes_share_one_label():
+    client = TestClient(app)
+    before = sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") == before + 2
+
+
+def test_queries_are_counted_per_request():
+    engine = create_engine("sqlite://")
+    stats = start_request_tracking()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        request_queries.set(None)
+        engine.dispose()
+
+    assert stats["queries"] == 2
+    assert stats["seconds"] > 0
+
+
+def test_cache_hits_and_misses_are_counted(monkeypatch):
+    monkeypatch.setattr(cache_service, "redis_client", FakeRedis({"present": "1"}))
+    hits = sample("cache_operations_total", operation="get", result="hit")
+    misses = sample("cache_operations_total", operation="get", result="miss")
+
+    assert CacheService.get("present") == 1
+    assert CacheService.get("absent") is None
+
+    assert sample("cache_operations_total", operation="get", result="hit") == hits + 1
+    assert sample("cache_operations_total", operation="get", result="miss") == misses + 1
+
@@ -0,0 +1,105 @@
+import base64
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models import Department, Document, DocumentVersion, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.document_service import DocumentService
+
+
+@pytest.fixture
+def document(db):
+    department = Department(id=uuid.uuid4(), name="Engineering")
+    user = User(
+        id=uuid.uuid4(), email="pager@example.com", password_hash="x",
+        first_name="Page", last_name="User", department_id=department.id
+    )
+    db.add_all([department, user])
+    documents = []
+    for index in range(5):
+        documents.append(Document(
+            id=uuid.uuid4(), title=f"Document {index}", uploader_id=user.id, department_id=department.id,
+            permission_level=PermissionLevel.DEPARTMENT, current_version=5,
+            created_at=datetime(2024, 1, 1) + timedelta(hours=index)
+        ))
+    db.add_all(documents)
+    for version_number in range(1, 6):
+        db.add(DocumentVersion(
+            id=uuid.uuid4(), document_id=documents[0].id, version_number=version_number,
+            file_path=f"blobs/{version_number}", file_name="document.txt", file_size=1, uploaded_by=user.id
+        ))
+    db.commit()
+
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=department.id, role_name="employee"
+    )
+    return principal, documents[0]
+
+
+def raw_cursor(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def assert_invalid(call):
+    with pytest.raises(HTTPException) as error:
+        call()
+    assert error.value.status_code == 400
+
+
+def test_cursor_round_trips_without_padding():
+    data = {"sort_by": "created_at", "key": "2024-01-01T00:00:00", "id": str(uuid.uuid4())}
+    cursor = encode_cursor(data)
+
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor, "sort_by", "key", "id") == data
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", raw_cursor(b"not json"), raw_cursor(b"[1, 2]"), encode_cursor({"key": 1})])
+def test_decode_rejects_tampered_cursors(cursor):
+    assert_invalid(lambda: decode_cursor(cursor, "key", "id"))
+
+
+def test_search_cursor_continues_without_total(db, document):
+    principal, _ = document
+    first = DocumentService.search_documents(db, principal, DocumentSearchParams(page_size=2))
+    second = DocumentService.search_documents(db, principal, DocumentSearchParams(page_size=2, cursor=first["next_cursor"]))
+
+    assert first["total"] == 5
+    assert second["total"] is None
+    assert [item["title"] for item in first["items"] + second["items"]] == [f"Document {index}" for index in (4, 3, 2, 1)]
+
+
+def test_search_rejects_cursor_for_another_sort_or_tampered_key(db, document):
+    principal, _ = document
+    cursor = DocumentService.search_documents(db, principal, DocumentSearchParams(page_size=2))["next_cursor"]
+    fields = decode_cursor(cursor)
+
+    assert_invalid(lambda: DocumentService.search_documents(
+        db, principal, DocumentSearchParams(page_size=2, sort_order="asc", cursor=cursor)
+    ))
+    for tampered in ({**fields, "key": "yesterday"}, {**fields, "id": "not-a-uuid"}):
+        assert_invalid(lambda: DocumentService.search_documents(
+            db, principal, DocumentSearchParams(page_size=2, cursor=encode_cursor(tampered))
+        ))
+
+
+def test_version_cursor_pages_newest_first(db, document):
+    principal, first_document = document
+    pages, cursor = [], None
+    while True:
+        versions, cursor = DocumentService.get_document_versions(db, principal, first_document.id, 2, cursor)
+        pages.append([version.version_number for version in versions])
+        if not cursor:
+            break
+
+    assert pages == [[5, 4], [3, 2], [1]]
+    assert_invalid(lambda: DocumentService.get_document_versions(
+        db, principal, first_document.id, 2, encode_cursor({"version_number": "3"})
+    ))
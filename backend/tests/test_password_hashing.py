@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+
+
+@pytest.fixture
+def thread_executor(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(security, "password_hash_executor", executor)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    yield executor
+    executor.shutdown()
+
+
+def test_hashing_round_trips_through_worker_processes(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+
+    async def hash_and_verify():
+        hashed = await security.get_password_hash_async("correct horse")
+        return (
+            await security.verify_password_async("correct horse", hashed),
+            await security.verify_password_async("wrong horse", hashed)
+        )
+
+    try:
+        assert asyncio.run(hash_and_verify()) == (True, False)
+    finally:
+        security.shutdown_password_hash_executor()
+    assert security.password_hash_queue_depth() == 0
+
+
+def test_requests_beyond_pending_limit_get_503(thread_executor):
+    release = threading.Event()
+
+    async def saturate():
+        blocked = [asyncio.create_task(security.run_password_hash_job(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert security.password_hash_queue_depth() == 2
+
+        with pytest.raises(HTTPException) as error:
+            await security.run_password_hash_job(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+        return error.value
+
+    error = asyncio.run(saturate())
+
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert security.password_hash_queue_depth() == 0
+
+
+def test_broken_pool_is_replaced(thread_executor):
+    def crash():
+        raise BrokenProcessPool("worker died")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(security.run_password_hash_job(crash))
+
+    assert error.value.status_code == 503
+    assert security.password_hash_executor is None
+    assert security.password_hash_queue_depth() == 0
@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+
+from app.models import Role, User
+from app.services.cache_service import CacheService
+from app.services.principal_service import PrincipalService, principals
+
+
+@pytest.fixture
+def redis_store(monkeypatch):
+    store = {}
+
+    def get_generations(scopes):
+        return [store.get(f"gen:{scope}", 0) for scope in scopes]
+
+    def bump_generations(scopes):
+        for scope in scopes:
+            store[f"gen:{scope}"] = store.get(f"gen:{scope}", 0) + 1
+        return True
+
+    def set_value(key, value, ttl=300):
+        store[key] = value
+        return True
+
+    monkeypatch.setattr(CacheService, "get_generations", staticmethod(get_generations))
+    monkeypatch.setattr(CacheService, "bump_generations", staticmethod(bump_generations))
+    monkeypatch.setattr(CacheService, "get", staticmethod(store.get))
+    monkeypatch.setattr(CacheService, "set", staticmethod(set_value))
+    principals.clear()
+    yield store
+    principals.clear()
+
+
+@pytest.fixture
+def user(db):
+    employee = Role(id=uuid.uuid4(), name="employee")
+    manager = Role(id=uuid.uuid4(), name="manager")
+    user = User(
+        id=uuid.uuid4(), email="cached@example.com", password_hash="x",
+        first_name="Cached", last_name="User", role_id=employee.id
+    )
+    db.add_all([employee, manager, user])
+    db.commit()
+    return user, manager
+
+
+def current_principal(db, user_id):
+    return PrincipalService.get_cached(user_id) or PrincipalService.load(db, user_id)
+
+
+def test_deactivation_is_visible_on_next_request(db, redis_store, user):
+    user, _ = user
+    assert current_principal(db, user.id).is_active
+
+    user.is_active = False
+    db.commit()
+
+    assert not current_principal(db, user.id).is_active
+
+
+def test_role_change_is_visible_on_next_request(db, redis_store, user):
+    user, manager = user
+    assert current_principal(db, user.id).role_name == "employee"
+
+    user.role_id = manager.id
+    db.commit()
+
+    assert current_principal(db, user.id).role_name == "manager"
+
+
+def test_load_racing_an_update_does_not_cache_stale_principal(db, redis_store, user, monkeypatch):
+    user, _ = user
+    from_user = PrincipalService.from_user
+
+    def from_user_then_deactivate(loaded):
+        principal = from_user(loaded)
+        monkeypatch.setattr(PrincipalService, "from_user", staticmethod(from_user))
+        loaded.is_active = False
+        db.commit()
+        return principal
+
+    monkeypatch.setattr(PrincipalService, "from_user", staticmethod(from_user_then_deactivate))
+    assert PrincipalService.load(db, user.id).is_active
+
+    assert not current_principal(db, user.id).is_active
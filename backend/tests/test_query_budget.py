@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.profiling import QueryBudgetExceeded, query_budget
+from app.models import Department, Document, DocumentTag, DocumentVersion, Tag, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.document_service import DocumentService
+
+
+@pytest.fixture
+def corpus(db):
+    department = Department(id=uuid.uuid4(), name="Engineering")
+    uploaders = [
+        User(
+            id=uuid.uuid4(), email=f"user{index}@example.com", password_hash="x",
+            first_name="User", last_name=str(index), department_id=department.id
+        )
+        for index in range(3)
+    ]
+    tags = [Tag(id=uuid.uuid4(), name=f"tag{index}") for index in range(4)]
+    db.add_all([department, *uploaders, *tags])
+
+    created_at = datetime(2024, 1, 1)
+    documents = []
+    for index in range(12):
+        document = Document(
+            id=uuid.uuid4(),
+            title=f"Document {index}",
+            uploader_id=uploaders[index % len(uploaders)].id,
+            department_id=department.id,
+            permission_level=PermissionLevel.RESTRICTED if index % 4 == 0 else PermissionLevel.DEPARTMENT,
+            current_version=2,
+            created_at=created_at + timedelta(hours=index),
+            updated_at=created_at + timedelta(hours=index)
+        )
+        documents.append(document)
+        db.add(document)
+        db.add_all([
+            DocumentTag(id=uuid.uuid4(), document_id=document.id, tag_id=tags[index % len(tags)].id),
+            DocumentTag(id=uuid.uuid4(), document_id=document.id, tag_id=tags[(index + 1) % len(tags)].id)
+        ])
+        for version_number in (1, 2):
+            db.add(DocumentVersion(
+                id=uuid.uuid4(), document_id=document.id, version_number=version_number,
+                file_path=f"blobs/{index}-{version_number}", file_name=f"document-{index}.txt",
+                file_size=10, uploaded_by=uploaders[version_number % len(uploaders)].id
+            ))
+    db.commit()
+
+    user = uploaders[0]
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=department.id, role_name="employee"
+    )
+    return principal, documents
+
+
+def test_search_stays_within_query_budget(db, corpus):
+    principal, _ = corpus
+
+    with query_budget(6):
+        result = DocumentService.search_documents(db, principal, DocumentSearchParams(page_size=10))
+
+    assert len(result["items"]) == 10
+    assert all(item["uploader_name"] and item["tags"] for item in result["items"])
+
+
+def test_document_detail_stays_within_query_budget(db, corpus):
+    principal, documents = corpus
+    document_id = documents[1].id
+
+    with query_budget(3):
+        detail = DocumentService.get_document_detail_response(db, principal, document_id)
+
+    assert detail["version_count"] == 2
+    assert len(detail["tags"]) == 2
+
+
+def test_version_list_stays_within_query_budget(db, corpus):
+    principal, documents = corpus
+    document_id = documents[1].id
+    db.expunge_all()
+
+    with query_budget(2):
+        versions, _ = DocumentService.get_document_versions_response(db, principal, document_id)
+
+    assert [version["version_number"] for version in versions] == [2, 1]
+    assert all(version["uploaded_by_name"] for version in versions)
+
+
+def test_query_budget_catches_lazy_loading(db, corpus):
+    _, documents = corpus
+    document_ids = [document.id for document in documents]
+    db.expunge_all()
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(50):
+            for document in db.query(Document).filter(Document.id.in_(document_ids)).all():
+                [document_tag.tag.name for document_tag in document.document_tags]
@@ -0,0 +1,105 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import hash_token
+from app.models import User
+from app.services.auth_service import AuthService
+from app.services.cache_service import CacheService
+from app.services.principal_service import principals
+
+
+@pytest.fixture
+def redis_store(monkeypatch):
+    store = {}
+    failing_keys = set()
+
+    def set_value(key, value, ttl=300):
+        if key in failing_keys:
+            return False
+        store[key] = value
+        return True
+
+    def set_many(items):
+        for key, value, ttl in items:
+            store[key] = value
+        return True
+
+    def get_generations(scopes):
+        return [store.get(CacheService.generation_key(scope), 0) for scope in scopes]
+
+    def bump_generations(scopes):
+        for scope in scopes:
+            key = CacheService.generation_key(scope)
+            store[key] = store.get(key, 0) + 1
+        return True
+
+    monkeypatch.setattr(CacheService, "get", staticmethod(store.get))
+    monkeypatch.setattr(CacheService, "get_many", staticmethod(lambda keys: [store.get(key) for key in keys]))
+    monkeypatch.setattr(CacheService, "set", staticmethod(set_value))
+    monkeypatch.setattr(CacheService, "set_many", staticmethod(set_many))
+    monkeypatch.setattr(CacheService, "get_generations", staticmethod(get_generations))
+    monkeypatch.setattr(CacheService, "bump_generations", staticmethod(bump_generations))
+    principals.clear()
+    yield store, failing_keys
+    principals.clear()
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(
+            id=uuid.uuid4(), email=f"user{index}@example.com", password_hash="x",
+            first_name="User", last_name=str(index)
+        )
+        for index in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def refresh_rejected(db, refresh_token):
+    with pytest.raises(HTTPException) as error:
+        AuthService.refresh_access_token(db, refresh_token)
+    return error.value.status_code == 401
+
+
+def test_refresh_after_logout_is_rejected(db, redis_store, users):
+    refresh_token = AuthService.create_tokens(db, users[0])["refresh_token"]
+    assert AuthService.sync_revoked_refresh_tokens(db)
+    assert AuthService.revocation_status(hash_token(refresh_token)) is False
+    assert AuthService.refresh_access_token(db, refresh_token)["access_token"]
+
+    assert AuthService.revoke_refresh_token(db, refresh_token)
+
+    assert AuthService.revocation_status(hash_token(refresh_token)) is True
+    assert refresh_rejected(db, refresh_token)
+
+
+def test_failed_revocation_write_during_sync_is_rejected(db, redis_store, users, monkeypatch):
+    _, failing_keys = redis_store
+    earlier_token = AuthService.create_tokens(db, users[0])["refresh_token"]
+    AuthService.revoke_refresh_token(db, earlier_token)
+    refresh_token = AuthService.create_tokens(db, users[1])["refresh_token"]
+    failing_keys.add(AuthService.revocation_key(hash_token(refresh_token)))
+
+    # The logout commits after the sync read the revoked tokens and before it
+    # writes the synced marker, and its own cache write fails.
+    set_many = CacheService.set_many
+
+    def set_many_racing_logout(items):
+        AuthService.revoke_refresh_token(db, refresh_token)
+        return set_many(items)
+
+    monkeypatch.setattr(CacheService, "set_many", staticmethod(set_many_racing_logout))
+    assert AuthService.sync_revoked_refresh_tokens(db)
+
+    assert AuthService.revocation_status(hash_token(refresh_token)) is None
+    assert refresh_rejected(db, refresh_token)
+
+    monkeypatch.setattr(CacheService, "set_many", staticmethod(set_many))
+    assert AuthService.sync_revoked_refresh_tokens(db)
+    assert AuthService.revocation_status(hash_token(refresh_token)) is True
+    assert refresh_rejected(db, refresh_token)
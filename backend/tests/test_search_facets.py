@@ -0,0 +1,112 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_current_user
+from app.db.database import get_session_runner
+from app.main import app
+from app.models import Department, Document, DocumentTag, Tag, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.document_service import DocumentService
+
+
+def seed_corpus(db):
+    engineering = Department(id=uuid.uuid4(), name="Engineering")
+    finance = Department(id=uuid.uuid4(), name="Finance")
+    alice = User(
+        id=uuid.uuid4(), email="alice@example.com", password_hash="x",
+        first_name="Alice", last_name="Admin", department_id=engineering.id
+    )
+    bob = User(
+        id=uuid.uuid4(), email="bob@example.com", password_hash="x",
+        first_name="Bob", last_name="Budget", department_id=finance.id
+    )
+    policy = Tag(id=uuid.uuid4(), name="policy")
+    db.add_all([engineering, finance, alice, bob, policy])
+    db.flush()
+
+    for title, uploader, level, tagged in [
+        ("Design review", alice, PermissionLevel.PUBLIC, True),
+        ("Release plan", alice, PermissionLevel.DEPARTMENT, False),
+        ("Budget forecast", bob, PermissionLevel.PUBLIC, True),
+        ("Payroll", bob, PermissionLevel.RESTRICTED, False),
+    ]:
+        document = Document(
+            id=uuid.uuid4(), title=title, uploader_id=uploader.id, department_id=uploader.department_id,
+            permission_level=level, current_version=1
+        )
+        db.add(document)
+        db.flush()
+        if tagged:
+            db.add(DocumentTag(id=uuid.uuid4(), document_id=document.id, tag_id=policy.id))
+    db.commit()
+
+    admin = Principal(
+        id=alice.id, email=alice.email, first_name=alice.first_name, last_name=alice.last_name,
+        department_id=engineering.id, role_name="admin"
+    )
+    return admin, alice, bob
+
+
+class RecordingRunner:
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, fn, *args):
+        self.calls.append((fn, *args))
+        return {"items": [], "total": 0, "page": 1, "page_size": 10}
+
+
+@pytest.fixture
+def runner(db):
+    admin, _, _ = seed_corpus(db)
+    runner = RecordingRunner()
+
+    async def session_runner():
+        yield runner
+
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_session_runner] = session_runner
+    try:
+        yield runner
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", ["/api/documents/search", "/api/documents/facets"])
+def test_unknown_permission_level_is_rejected(runner, path):
+    response = TestClient(app).get(path, params={"permission_level": "secret"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "permission_level"]
+    assert runner.calls == []
+
+
+def test_permission_level_reaches_search_as_value(runner, db):
+    response = TestClient(app).get("/api/documents/search", params={"permission_level": "public"})
+    _, principal, params = runner.calls[0]
+
+    assert response.status_code == 200
+    assert params.permission_level == "public"
+    results = DocumentService.search_documents(db, principal, params)
+    assert sorted(item["title"] for item in results["items"]) == ["Budget forecast", "Design review"]
+
+
+def counts(entries):
+    return {entry["label"]: entry["count"] for entry in entries}
+
+
+def test_facets_skip_their_own_filter(pg_db):
+    admin, _, bob = seed_corpus(pg_db)
+    params = DocumentSearchParams(tags=["policy"], uploader_id=bob.id, permission_level="public")
+
+    facets = DocumentService.get_search_facets(pg_db, admin, params)
+
+    assert facets["total"] == 1
+    assert counts(facets["tags"]) == {"policy": 1}
+    assert counts(facets["uploaders"]) == {"Alice Admin": 1, "Bob Budget": 1}
+    assert counts(facets["departments"]) == {"Finance": 1}
+    assert counts(facets["permission_levels"]) == {"public": 1}
@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+
+from app.core.profiling import query_budget
+from app.models import Department, Document, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.cache_service import CacheService
+from app.services.document_service import DocumentService
+
+
+@pytest.fixture
+def redis_store(db, monkeypatch):
+    store = {}
+
+    def get_generations(scopes):
+        return [store.get(CacheService.generation_key(scope), 0) for scope in scopes]
+
+    def bump_generations(scopes):
+        for scope in scopes:
+            key = CacheService.generation_key(scope)
+            store[key] = store.get(key, 0) + 1
+        return True
+
+    def set_value(key, value, ttl=300):
+        store[key] = value
+        return True
+
+    monkeypatch.setattr(CacheService, "get_generations", staticmethod(get_generations))
+    monkeypatch.setattr(CacheService, "bump_generations", staticmethod(bump_generations))
+    monkeypatch.setattr(CacheService, "get", staticmethod(store.get))
+    monkeypatch.setattr(CacheService, "set", staticmethod(set_value))
+    return store
+
+
+def principal(user, role_name="employee"):
+    return Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=user.department_id, role_name=role_name
+    )
+
+
+@pytest.fixture
+def corpus(db):
+    departments = [Department(id=uuid.uuid4(), name=name) for name in ("Engineering", "Finance")]
+    users = [
+        User(
+            id=uuid.uuid4(), email=f"{department.name.lower()}@example.com", password_hash="x",
+            first_name=department.name, last_name="User", department_id=department.id
+        )
+        for department in departments
+    ]
+    db.add_all(departments + users)
+    documents = [
+        Document(
+            id=uuid.uuid4(), title=f"{user.first_name} plan", uploader_id=user.id, department_id=user.department_id,
+            permission_level=PermissionLevel.DEPARTMENT, current_version=1
+        )
+        for user in users
+    ]
+    db.add_all(documents)
+    db.commit()
+    return [principal(user) for user in users], documents
+
+
+def titles(db, user):
+    return [item["title"] for item in DocumentService.search_documents(db, user, DocumentSearchParams())["items"]]
+
+
+def test_document_scopes_follow_visibility():
+    uploader_id, department_id = uuid.uuid4(), uuid.uuid4()
+
+    def scopes(level):
+        return DocumentService.document_cache_scopes(Document(
+            uploader_id=uploader_id, department_id=department_id, permission_level=level
+        ))
+
+    assert scopes(PermissionLevel.PUBLIC) == ["search:all", f"search:user:{uploader_id}", "search:public"]
+    assert scopes(PermissionLevel.DEPARTMENT) == [
+        "search:all", f"search:user:{uploader_id}", f"search:department:{department_id}"
+    ]
+    assert scopes(PermissionLevel.RESTRICTED) == ["search:all", f"search:user:{uploader_id}"]
+
+
+def test_commit_bumps_only_affected_scopes(db, redis_store, corpus):
+    (engineer, accountant), (engineering_plan, _) = corpus
+    assert titles(db, engineer) == ["Engineering plan"]
+    assert titles(db, accountant) == ["Finance plan"]
+
+    DocumentService.delete_document(db, engineer, engineering_plan.id)
+
+    assert redis_store[CacheService.generation_key(f"search:department:{engineer.department_id}")] == 1
+    assert CacheService.generation_key(f"search:department:{accountant.department_id}") not in redis_store
+    assert titles(db, engineer) == []
+    with query_budget(0):
+        assert titles(db, accountant) == ["Finance plan"]
+
+
+def test_failed_commit_does_not_bump(db, redis_store, corpus, monkeypatch):
+    (engineer, _), (engineering_plan, _) = corpus
+
+    def fail():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db, "commit", fail)
+    with pytest.raises(RuntimeError):
+        DocumentService.delete_document(db, engineer, engineering_plan.id)
+
+    assert not any(key.startswith("gen:") for key in redis_store)
@@ -0,0 +1,111 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import and_, asc, desc, or_
+
+from app.models import Department, Document, User
+from app.models.document import PermissionLevel
+from app.schemas.auth import Principal
+from app.schemas.document import DocumentSearchParams
+from app.services.document_service import SORT_COLUMNS, DocumentService
+
+TITLES = ["apple", "Apple", "Banana", "banana", "Zebra", "zebra", "éclair", "Eclair", "_draft", "10 reports", "9 reports"]
+
+
+@pytest.fixture
+def corpus(db):
+    rng = random.Random(3)
+    own_department = Department(id=uuid.uuid4(), name="Engineering")
+    other_department = Department(id=uuid.uuid4(), name="Sales")
+    user, colleague, outsider = [
+        User(
+            id=uuid.uuid4(), email=f"{name}@example.com", password_hash="x",
+            first_name=name.title(), last_name="User", department_id=department.id
+        )
+        for name, department in (
+            ("user", own_department), ("colleague", own_department), ("outsider", other_department)
+        )
+    ]
+    db.add_all([own_department, other_department, user, colleague, outsider])
+
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=hour) for hour in range(6)]
+    for index in range(40):
+        uploader = rng.choice([user, user, colleague, outsider])
+        db.add(Document(
+            id=uuid.uuid4(),
+            title=rng.choice(TITLES),
+            uploader_id=uploader.id,
+            department_id=rng.choice([uploader.department_id, other_department.id]),
+            permission_level=rng.choice(list(PermissionLevel)),
+            current_version=1,
+            created_at=rng.choice(timestamps),
+            updated_at=rng.choice(timestamps)
+        ))
+    db.commit()
+
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=own_department.id, role_name="employee"
+    )
+    return principal
+
+
+def expected_ids(db, principal, sort_by, sort_order):
+    visible = or_(
+        Document.permission_level == PermissionLevel.PUBLIC,
+        and_(Document.permission_level == PermissionLevel.DEPARTMENT, Document.department_id == principal.department_id),
+        Document.uploader_id == principal.id
+    )
+    direction = asc if sort_order == "asc" else desc
+    rows = db.query(Document.id).filter(Document.is_deleted == False, visible).order_by(
+        direction(SORT_COLUMNS[sort_by]), direction(Document.id)
+    ).all()
+    return [str(document_id) for document_id, in rows]
+
+
+def search(db, principal, **params):
+    result = DocumentService.search_documents(db, principal, DocumentSearchParams(**params))
+    return [str(item["id"]) for item in result["items"]], result
+
+
+SORTS = [(sort_by, sort_order) for sort_by in ("created_at", "updated_at", "title") for sort_order in ("asc", "desc")]
+
+
+@pytest.mark.parametrize("sort_by,sort_order", SORTS)
+@pytest.mark.parametrize("page_size", [1, 3, 7])
+def test_offset_pages_match_single_query(db, corpus, sort_by, sort_order, page_size):
+    expected = expected_ids(db, corpus, sort_by, sort_order)
+    personal = {str(document_id) for document_id, in db.query(Document.id).filter(Document.uploader_id == corpus.id)}
+    assert personal & set(expected) and set(expected) - personal
+
+    for page in range(1, len(expected) // page_size + 3):
+        ids, result = search(db, corpus, sort_by=sort_by, sort_order=sort_order, page=page, page_size=page_size)
+        assert ids == expected[(page - 1) * page_size:page * page_size]
+        assert result["total"] == len(expected)
+
+
+@pytest.mark.parametrize("sort_by,sort_order", SORTS)
+@pytest.mark.parametrize("page_size", [1, 4])
+def test_cursor_pages_match_single_query(db, corpus, sort_by, sort_order, page_size):
+    expected = expected_ids(db, corpus, sort_by, sort_order)
+
+    ids, result = search(db, corpus, sort_by=sort_by, sort_order=sort_order, page_size=page_size)
+    collected = list(ids)
+    while result["next_cursor"]:
+        ids, result = search(
+            db, corpus, sort_by=sort_by, sort_order=sort_order, page_size=page_size, cursor=result["next_cursor"]
+        )
+        assert ids
+        collected += ids
+
+    assert collected == expected
+
+
+def test_title_order_is_bytewise(db, corpus):
+    _, result = search(db, corpus, sort_by="title", sort_order="asc", page_size=100)
+    titles = [item["title"] for item in result["items"]]
+
+    assert titles == sorted(titles)
+    assert titles != sorted(titles, key=str.casefold)
@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+
+from app.models import Department, User
+from app.services.cache_service import CacheService
+
+
+@pytest.fixture
+def bumps(db, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(CacheService, "bump_generations", staticmethod(lambda scopes: recorded.extend(scopes) or True))
+    return recorded
+
+
+@pytest.fixture
+def user(db):
+    department = Department(id=uuid.uuid4(), name="Finance")
+    user = User(
+        id=uuid.uuid4(), email="render@example.com", password_hash="x",
+        first_name="Ada", last_name="Lovelace", department_id=department.id
+    )
+    db.add_all([department, user])
+    db.commit()
+    return user
+
+
+def test_login_side_columns_keep_rendered_pages(db, user, bumps):
+    user.password_hash = "rehashed"
+    user.is_active = False
+    db.commit()
+
+    assert "search:render" not in bumps
+
+
+def test_rendered_user_columns_invalidate_pages(db, user, bumps):
+    user.last_name = "Byron"
+    db.commit()
+
+    assert bumps.count("search:render") == 1
+
+
+def test_department_rename_invalidates_pages(db, user, bumps):
+    department = db.get(Department, user.department_id)
+    department.description = "Accounts"
+    db.commit()
+    assert "search:render" not in bumps
+
+    department.name = "Accounting"
+    db.commit()
+    assert bumps.count("search:render") == 1
+
+
+def test_rolled_back_changes_do_not_invalidate(db, user, bumps):
+    user.first_name = "Augusta"
+    db.flush()
+    db.rollback()
+    db.commit()
+
+    assert "search:render" not in bumps
@@ -0,0 +1,87 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.storage.local import LocalStorageBackend
+from app.storage.s3 import S3StorageBackend
+
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorageBackend(str(tmp_path / "storage"))
+
+
+def put(storage, tmp_path, key, content):
+    source = tmp_path / "source"
+    source.write_bytes(content)
+    storage.put_file(key, str(source))
+    assert not source.exists()
+
+
+def test_keys_fan_out_into_hashed_directories(local):
+    digest = hashlib.sha256(b"blobs/abc").hexdigest()
+
+    assert local.path_for("blobs/abc") == os.path.join(local.root, digest[:2], digest[2:4], "blobs/abc")
+
+
+def test_legacy_paths_pass_through(local, tmp_path):
+    legacy = tmp_path / "legacy.pdf"
+    legacy.write_bytes(b"legacy content")
+
+    assert local.path_for(str(legacy)) == str(legacy)
+    assert local.path_for("./uploads/report_v1.pdf") == "./uploads/report_v1.pdf"
+    assert local.path_for("../uploads/report_v1.pdf") == "../uploads/report_v1.pdf"
+    assert b"".join(local.open_range(str(legacy), 7, 13)) == b"content"
+
+
+def test_local_backend_round_trip(local, tmp_path):
+    put(local, tmp_path, "blobs/abc", b"0123456789")
+
+    assert local.exists("blobs/abc")
+    assert local.size("blobs/abc") == 10
+    assert local.local_path("blobs/abc") == local.path_for("blobs/abc")
+    assert b"".join(local.open_range("blobs/abc", 2, 5)) == b"2345"
+    assert b"".join(local.open_range("blobs/abc", 8, 20)) == b"89"
+
+    local.delete("blobs/abc")
+    local.delete("blobs/abc")
+    assert not local.exists("blobs/abc")
+
+
+@pytest.fixture
+def s3():
+    pytest.importorskip("boto3")
+    from botocore.stub import Stubber
+
+    storage = S3StorageBackend(
+        bucket="documents", prefix="/tenant/", region_name="us-east-1",
+        access_key_id="test", secret_access_key="test"
+    )
+    with Stubber(storage.client) as stubber:
+        yield storage, stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_s3_keys_are_prefixed(s3):
+    storage, stubber = s3
+    stubber.add_response("head_object", {"ContentLength": 10}, {"Bucket": "documents", "Key": "tenant/blobs/abc"})
+    stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+
+    assert storage.exists("blobs/abc")
+    assert not storage.exists("blobs/missing")
+
+
+def test_s3_range_reads(s3):
+    from botocore.response import StreamingBody
+
+    storage, stubber = s3
+    stubber.add_response(
+        "get_object",
+        {"Body": StreamingBody(io.BytesIO(b"2345"), 4)},
+        {"Bucket": "documents", "Key": "tenant/blobs/abc", "Range": "bytes=2-5"}
+    )
+
+    assert b"".join(storage.open_range("blobs/abc", 2, 5)) == b"2345"
+    assert b"".join(storage.open_range("blobs/empty", 0, -1)) == b""
@@ -0,0 +1,52 @@
+import uuid
+
+from sqlalchemy import insert
+
+from app.core.profiling import query_budget
+from app.models import Tag
+from app.services.document_service import DocumentService
+
+
+def tag_names(db, tag_ids):
+    names = dict(db.query(Tag.id, Tag.name).filter(Tag.id.in_(tag_ids.values())).all())
+    return {tag_name: names[tag_id] for tag_name, tag_id in tag_ids.items()}
+
+
+def test_tags_resolve_in_constant_queries(db):
+    db.add(Tag(id=uuid.uuid4(), name="HR"))
+    db.commit()
+    requested = ["hr", " Finance ", "LEGAL", "finance"] + [f"tag{index}" for index in range(20)]
+
+    with query_budget(2):
+        tag_ids = DocumentService.get_or_create_tags(db, requested)
+    db.commit()
+
+    assert sorted(tag_ids) == sorted({"hr", "finance", "legal"} | {f"tag{index}" for index in range(20)})
+    assert tag_names(db, tag_ids)["hr"] == "HR"
+    assert db.query(Tag).count() == 23
+
+    # Tags are only cached once a lookup has seen them committed.
+    with query_budget(1):
+        assert DocumentService.get_or_create_tags(db, requested) == tag_ids
+    with query_budget(0):
+        assert DocumentService.get_or_create_tags(db, requested) == tag_ids
+
+
+def test_tag_created_concurrently_is_resolved(db, monkeypatch):
+    execute = db.execute
+    raced = {}
+
+    def execute_with_concurrent_insert(statement, *args, **kwargs):
+        result = execute(statement, *args, **kwargs)
+        if not raced:
+            # Another upload commits the same new tag after the lookup missed it.
+            raced["id"] = uuid.uuid4()
+            execute(insert(Tag).values(id=raced["id"], name="contract"))
+        return result
+
+    monkeypatch.setattr(db, "execute", execute_with_concurrent_insert)
+    tag_ids = DocumentService.get_or_create_tags(db, ["contract", "invoice"])
+    db.commit()
+
+    assert tag_ids["contract"] == raced["id"]
+    assert db.query(Tag).count() == 2
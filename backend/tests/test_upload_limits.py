@@ -0,0 +1,75 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.middleware import RequestSizeLimitMiddleware
+from app.services.blob_service import BlobService
+from app.services.document_service import DocumentService
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 100)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 16)
+    return tmp_path
+
+
+def test_stage_uploaded_file_hashes_in_chunks(upload_dir):
+    content = os.urandom(100)
+
+    file_path, checksum, file_size = DocumentService.stage_uploaded_file(io.BytesIO(content))
+
+    assert (checksum, file_size) == (hashlib.sha256(content).hexdigest(), 100)
+    with open(file_path, "rb") as staged:
+        assert staged.read() == content
+
+
+def test_stage_uploaded_file_stops_at_size_limit(upload_dir):
+    with pytest.raises(HTTPException) as error:
+        DocumentService.stage_uploaded_file(io.BytesIO(os.urandom(101)))
+
+    assert error.value.status_code == 413
+    assert os.listdir(BlobService.temp_dir()) == []
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.post("/upload")
+    @app.post("/bulk")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    app.add_middleware(RequestSizeLimitMiddleware, max_body_size=100, path_limits={"/bulk": 1000})
+    return TestClient(app)
+
+
+def chunked(size):
+    for _ in range(size // 10):
+        yield b"x" * 10
+
+
+def test_declared_length_over_limit_is_rejected(client):
+    response = client.post("/upload", content=b"x" * 101)
+    assert response.status_code == 413
+
+    assert client.post("/upload", content=b"x" * 100).json() == {"size": 100}
+
+
+def test_streamed_body_over_limit_is_rejected(client):
+    response = client.post("/upload", content=chunked(200))
+    assert response.status_code == 413
+
+    assert client.post("/upload", content=chunked(100)).json() == {"size": 100}
+
+
+def test_path_limits_override_default(client):
+    assert client.post("/bulk", content=chunked(500)).json() == {"size": 500}
+    assert client.post("/bulk", content=chunked(1010)).status_code == 413
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models import Department, User
+from app.models.upload_session import UploadSession
+from app.schemas.auth import Principal
+from app.schemas.upload import UploadSessionCreate
+from app.services import blob_service
+from app.services.document_service import DocumentService
+from app.services.upload_session_service import UploadSessionService, hash_states
+from app.storage.local import LocalStorageBackend
+
+CONTENT = b"0123456789abcdefghij"
+
+
+@pytest.fixture
+def uploads(db, tmp_path, monkeypatch):
+    storage = LocalStorageBackend(str(tmp_path / "storage"))
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_CHUNK_SIZE", 8)
+    monkeypatch.setattr(blob_service, "get_storage", lambda: storage)
+
+    department = Department(id=uuid.uuid4(), name="Engineering")
+    user = User(
+        id=uuid.uuid4(), email="uploader@example.com", password_hash="x",
+        first_name="Up", last_name="Loader", department_id=department.id
+    )
+    db.add_all([department, user])
+    db.commit()
+
+    principal = Principal(
+        id=user.id, email=user.email, first_name=user.first_name, last_name=user.last_name,
+        department_id=department.id, role_name="employee"
+    )
+    session = UploadSessionService.create_session(db, principal, UploadSessionCreate(
+        file_name="report.pdf", total_size=len(CONTENT), title="Report"
+    ))
+    return principal, session.id, storage
+
+
+def write_chunks(db, principal, session_id, order):
+    for index in order:
+        UploadSessionService.write_chunk(db, principal, session_id, index, CONTENT[index * 8:(index + 1) * 8])
+
+
+def stored_bytes(storage, version):
+    with open(storage.path_for(version.file_path), "rb") as buffer:
+        return buffer.read()
+
+
+def test_out_of_order_chunks_hash_the_whole_file(db, uploads):
+    principal, session_id, storage = uploads
+
+    write_chunks(db, principal, session_id, [2, 0, 1])
+    version = UploadSessionService.complete_session(db, principal, session_id)
+
+    assert version.checksum == hashlib.sha256(CONTENT).hexdigest()
+    assert stored_bytes(storage, version) == CONTENT
+    assert not os.path.exists(UploadSessionService.session_path(session_id))
+    assert session_id not in hash_states
+
+
+def test_complete_can_be_retried_after_rollback(db, uploads, monkeypatch):
+    principal, session_id, storage = uploads
+    write_chunks(db, principal, session_id, [0, 1, 2])
+
+    create_document_from_file = DocumentService.create_document_from_file
+
+    def fail_insert(*args, **kwargs):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(DocumentService, "create_document_from_file", staticmethod(fail_insert))
+    with pytest.raises(RuntimeError):
+        UploadSessionService.complete_session(db, principal, session_id)
+    db.rollback()
+
+    assert os.path.exists(UploadSessionService.session_path(session_id))
+    assert db.get(UploadSession, session_id) is not None
+
+    monkeypatch.setattr(DocumentService, "create_document_from_file", staticmethod(create_document_from_file))
+    version = UploadSessionService.complete_session(db, principal, session_id)
+
+    assert stored_bytes(storage, version) == CONTENT
+    assert not os.path.exists(UploadSessionService.session_path(session_id))
+
+
+def test_abort_removes_session_file_after_commit(db, uploads):
+    principal, session_id, _ = uploads
+    write_chunks(db, principal, session_id, [0])
+
+    UploadSessionService.abort_session(db, principal, session_id)
+
+    assert not os.path.exists(UploadSessionService.session_path(session_id))
+    assert session_id not in hash_states
+    with pytest.raises(HTTPException) as error:
+        write_chunks(db, principal, session_id, [1])
+    assert error.value.status_code == 404
+
+
+def test_missing_session_file_is_not_found(db, uploads):
+    principal, session_id, _ = uploads
+    os.remove(UploadSessionService.session_path(session_id))
+
+    with pytest.raises(HTTPException) as error:
+        write_chunks(db, principal, session_id, [0])
+    assert error.value.status_code == 404
@@ -32,16 +32,9 @@ import {
 } from '@mui/icons-material';
 import { useAuth } from '../contexts/AuthContext';
 import { documentService } from '../services/api';
-import { Document, PaginatedDocuments } from '../types';
+import { Document, FacetCount, PaginatedDocuments } from '../types';
 import toast from 'react-hot-toast';
 
-interface Uploader {
-  id: string;
-  first_name: string;
-  last_name: string;
-  email: string;
-}
-
 export const Dashboard: React.FC = () => {
   const [documents, setDocuments] = useState<Document[]>([]);
   const [total, setTotal] = useState(0);
@@ -49,8 +42,8 @@ export const Dashboard: React.FC = () => {
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedTags, setSelectedTags] = useState<string[]>([]);
   const [selectedUploader, setSelectedUploader] = useState('');
-  const [availableTags, setAvailableTags] = useState<string[]>([]);
-  const [availableUploaders, setAvailableUploaders] = useState<Uploader[]>([]);
+  const [availableTags, setAvailableTags] = useState<FacetCount[]>([]);
+  const [availableUploaders, setAvailableUploaders] = useState<FacetCount[]>([]);
   const [loading, setLoading] = useState(false);
   const [anchorEl, setAnchorEl] = useState<null | HTMLElement>(null);
 
@@ -66,9 +59,14 @@ export const Dashboard: React.FC = () => {
         uploader_id: selectedUploader || undefined,
         page,
         page_size: 12,
+        include_facets: true,
       });
       setDocuments(response.items);
-      setTotal(response.total_pages);
+      setTotal(response.total_pages ?? 0);
+      if (response.facets) {
+        setAvailableTags(response.facets.tags);
+        setAvailableUploaders(response.facets.uploaders);
+      }
     } catch (error: any) {
       toast.error('Failed to fetch documents');
       console.error(error);
@@ -77,22 +75,8 @@ export const Dashboard: React.FC = () => {
     }
   };
 
-  const fetchFilters = async () => {
-    try {
-      const [tagsData, uploadersData] = await Promise.all([
-        documentService.getAvailableTags(),
-        documentService.getAvailableUploaders()
-      ]);
-      setAvailableTags(tagsData.tags);
-      setAvailableUploaders(uploadersData.uploaders);
-    } catch (error) {
-      console.error('Failed to fetch filters:', error);
-    }
-  };
-
   useEffect(() => {
     fetchDocuments();
-    fetchFilters(); 
   }, [page, searchQuery, selectedTags, selectedUploader]);
 
   const handleSearch = (e: React.FormEvent) => {
@@ -188,8 +172,8 @@ export const Dashboard: React.FC = () => {
                     )}
                   >
                     {availableTags.map((tag) => (
-                      <MenuItem key={tag} value={tag}>
-                        {tag}
+                      <MenuItem key={tag.value} value={tag.value}>
+                        {tag.label} ({tag.count})
                       </MenuItem>
                     ))}
                   </Select>
@@ -203,8 +187,8 @@ export const Dashboard: React.FC = () => {
                   >
                     <MenuItem value="">All Users</MenuItem>
                     {availableUploaders.map((u) => (
-                      <MenuItem key={u.id} value={u.id}>
-                        {u.first_name} {u.last_name}
+                      <MenuItem key={u.value} value={u.value}>
+                        {u.label} ({u.count})
                       </MenuItem>
                     ))}
                   </Select>
@@ -67,12 +67,28 @@ export interface DocumentDetail extends Document {
   version_count: number;
 }
 
+export interface FacetCount {
+  value: string;
+  label: string;
+  count: number;
+}
+
+export interface DocumentFacets {
+  total: number;
+  tags: FacetCount[];
+  uploaders: FacetCount[];
+  departments: FacetCount[];
+  permission_levels: FacetCount[];
+}
+
 export interface PaginatedDocuments {
   items: Document[];
-  total: number;
+  total?: number | null;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages?: number | null;
+  next_cursor?: string | null;
+  facets?: DocumentFacets | null;
 }
 
 export interface SearchParams {
@@ -111,6 +111,24 @@ GROUP BY
 ORDER BY
     document_count DESC, dept.name;
 
+-- Same report read from department_upload_rollups, which AnalyticsService keeps
+-- up to date; no scan of documents or document_versions
+
+SELECT
+    dept.id AS department_id,
+    dept.name AS department_name,
+    COALESCE(SUM(r.document_count), 0) AS document_count,
+    COUNT(DISTINCT r.uploader_id) AS unique_uploaders,
+    COALESCE(SUM(r.storage_bytes), 0) AS total_storage_bytes
+FROM
+    departments dept
+    LEFT JOIN department_upload_rollups r ON dept.id = r.department_id
+        AND r.day > CURRENT_DATE - 30
+GROUP BY
+    dept.id, dept.name
+ORDER BY
+    document_count DESC, dept.name;
+
 
 -- Most popular tags
 SELECT
@@ -126,3 +144,16 @@ GROUP BY
     t.id, t.name
 ORDER BY
     document_count DESC;
+
+
+-- Most popular tags from the rollup table
+SELECT
+    t.name AS tag_name,
+    COALESCE(r.document_count, 0) AS document_count,
+    COALESCE(r.unique_uploaders, 0) AS unique_users,
+    r.last_used_at AS most_recent_use
+FROM
+    tags t
+    LEFT JOIN tag_usage_rollups r ON t.id = r.tag_id
+ORDER BY
+    document_count DESC;
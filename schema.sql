@@ -44,7 +44,8 @@ CREATE TABLE documents (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_deleted BOOLEAN DEFAULT FALSE,
-    current_version INTEGER DEFAULT 1
+    current_version INTEGER DEFAULT 1,
+    search_vector TSVECTOR
 );
 
 CREATE TABLE document_versions (
@@ -64,6 +65,42 @@ CREATE TABLE document_versions (
     UNIQUE(document_id, version_number)
 );
 
+CREATE TABLE blobs (
+    checksum VARCHAR(64) PRIMARY KEY,
+    storage_path VARCHAR(500) NOT NULL,
+    file_size BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    base_checksum VARCHAR(64) REFERENCES blobs(checksum),
+    chain_length INTEGER NOT NULL DEFAULT 0,
+    encoding VARCHAR(20),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_referenced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE upload_sessions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    document_id UUID REFERENCES documents(id) ON DELETE CASCADE,
+    file_name VARCHAR(255) NOT NULL,
+    mime_type VARCHAR(100),
+    total_size BIGINT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    document_metadata JSONB DEFAULT '{}',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    CONSTRAINT positive_total_size CHECK (total_size > 0),
+    CONSTRAINT positive_chunk_size CHECK (chunk_size > 0)
+);
+
+CREATE TABLE upload_session_chunks (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    session_id UUID NOT NULL REFERENCES upload_sessions(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(session_id, chunk_index)
+);
+
 CREATE TABLE tags (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     name VARCHAR(50) UNIQUE NOT NULL,
@@ -81,12 +118,34 @@ CREATE TABLE document_tags (
 CREATE TABLE refresh_tokens (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    token VARCHAR(500) UNIQUE NOT NULL,
+    token_hash BYTEA UNIQUE NOT NULL CHECK (octet_length(token_hash) = 32),
     expires_at TIMESTAMP NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     revoked BOOLEAN DEFAULT FALSE
 );
 
+CREATE TABLE department_upload_rollups (
+    department_id UUID NOT NULL REFERENCES departments(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    uploader_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    version_count INTEGER NOT NULL DEFAULT 0,
+    storage_bytes BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (department_id, day, uploader_id)
+);
+
+CREATE TABLE tag_usage_rollups (
+    tag_id UUID PRIMARY KEY REFERENCES tags(id) ON DELETE CASCADE,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    unique_uploaders INTEGER NOT NULL DEFAULT 0,
+    last_used_at TIMESTAMP
+);
+
+CREATE TABLE analytics_rollup_state (
+    name VARCHAR(50) PRIMARY KEY,
+    refreshed_through TIMESTAMP
+);
+
 
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_department ON users(department_id);
@@ -95,23 +154,36 @@ CREATE INDEX idx_users_role ON users(role_id);
 
 CREATE INDEX idx_documents_uploader ON documents(uploader_id);
 CREATE INDEX idx_documents_department ON documents(department_id);
-CREATE INDEX idx_documents_created ON documents(created_at DESC);
-CREATE INDEX idx_documents_title_search ON documents USING GIN(to_tsvector('english', title));
+CREATE INDEX idx_documents_created_keyset ON documents(created_at, id) WHERE is_deleted = false;
+CREATE INDEX idx_documents_updated_keyset ON documents(updated_at, id) WHERE is_deleted = false;
+CREATE INDEX idx_documents_title_keyset ON documents(title COLLATE "C", id) WHERE is_deleted = false;
+CREATE INDEX idx_documents_search_vector ON documents USING GIN(search_vector);
 CREATE INDEX idx_documents_deleted ON documents(is_deleted) WHERE is_deleted = false;
 CREATE INDEX idx_documents_permission ON documents(permission_level);
+CREATE INDEX idx_documents_updated_at ON documents(updated_at);
 
 CREATE INDEX idx_versions_document ON document_versions(document_id);
 CREATE INDEX idx_versions_upload_date ON document_versions(upload_date DESC);
 CREATE INDEX idx_versions_uploaded_by ON document_versions(uploaded_by);
 
+CREATE INDEX idx_versions_checksum ON document_versions(checksum);
+
+CREATE INDEX idx_blobs_unreferenced ON blobs(last_referenced_at) WHERE ref_count <= 0;
+CREATE INDEX idx_blobs_base ON blobs(base_checksum) WHERE base_checksum IS NOT NULL;
+
+CREATE INDEX idx_upload_sessions_user ON upload_sessions(user_id);
+CREATE INDEX idx_upload_sessions_expires ON upload_sessions(expires_at);
+
 CREATE INDEX idx_tags_name_search ON tags USING GIN(name gin_trgm_ops);
 
 CREATE INDEX idx_document_tags_document ON document_tags(document_id);
 CREATE INDEX idx_document_tags_tag ON document_tags(tag_id);
 
 CREATE INDEX idx_refresh_tokens_user ON refresh_tokens(user_id);
-CREATE INDEX idx_refresh_tokens_token ON refresh_tokens(token);
 CREATE INDEX idx_refresh_tokens_expires ON refresh_tokens(expires_at);
+CREATE INDEX idx_refresh_tokens_revoked ON refresh_tokens(expires_at) WHERE revoked = true;
+
+CREATE INDEX idx_department_upload_rollups_day ON department_upload_rollups(day);
 
 
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -132,6 +204,90 @@ CREATE TRIGGER update_departments_updated_at BEFORE UPDATE ON departments
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 
+-- Weighted full-text vector: title (A), description (B), tag names (C)
+CREATE OR REPLACE FUNCTION document_search_vector(doc_id UUID, doc_title TEXT, doc_description TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT
+        setweight(to_tsvector('english', COALESCE(doc_title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(doc_description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE((
+            SELECT STRING_AGG(t.name, ' ')
+            FROM document_tags dt
+            JOIN tags t ON t.id = dt.tag_id
+            WHERE dt.document_id = doc_id
+        ), '')), 'C');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION update_document_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector = document_search_vector(NEW.id, NEW.title, NEW.description);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION refresh_tagged_documents_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE documents d
+    SET search_vector = document_search_vector(d.id, d.title, d.description)
+    WHERE d.id IN (SELECT DISTINCT document_id FROM changed_rows);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_documents_search_vector BEFORE INSERT OR UPDATE OF title, description ON documents
+    FOR EACH ROW EXECUTE FUNCTION update_document_search_vector();
+
+CREATE TRIGGER refresh_search_vector_on_tag_insert AFTER INSERT ON document_tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION refresh_tagged_documents_search_vector();
+
+CREATE TRIGGER refresh_search_vector_on_tag_delete AFTER DELETE ON document_tags
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION refresh_tagged_documents_search_vector();
+
+
+-- Reference counts of content-addressed blobs follow the versions stored in them
+CREATE OR REPLACE FUNCTION update_blob_ref_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE blobs SET ref_count = ref_count + 1, last_referenced_at = CURRENT_TIMESTAMP
+        WHERE checksum = NEW.checksum AND storage_path = NEW.file_path;
+    ELSE
+        UPDATE blobs SET ref_count = ref_count - 1, last_referenced_at = CURRENT_TIMESTAMP
+        WHERE checksum = OLD.checksum AND storage_path = OLD.file_path;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_blob_ref_count_on_version AFTER INSERT OR DELETE ON document_versions
+    FOR EACH ROW EXECUTE FUNCTION update_blob_ref_count();
+
+-- Delta-encoded blobs hold a reference on the blob they were encoded against
+CREATE OR REPLACE FUNCTION update_delta_base_ref_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE blobs SET ref_count = ref_count + 1, last_referenced_at = CURRENT_TIMESTAMP
+        WHERE checksum = NEW.base_checksum;
+    ELSE
+        UPDATE blobs SET ref_count = ref_count - 1, last_referenced_at = CURRENT_TIMESTAMP
+        WHERE checksum = OLD.base_checksum;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_delta_base_ref_count_on_insert AFTER INSERT ON blobs
+    FOR EACH ROW WHEN (NEW.base_checksum IS NOT NULL) EXECUTE FUNCTION update_delta_base_ref_count();
+
+CREATE TRIGGER update_delta_base_ref_count_on_delete AFTER DELETE ON blobs
+    FOR EACH ROW WHEN (OLD.base_checksum IS NOT NULL) EXECUTE FUNCTION update_delta_base_ref_count();
+
+
 INSERT INTO departments (name, description) VALUES
     ('Engineering', 'Engineering and Development'),
     ('Finance', 'Finance and Accounting'),